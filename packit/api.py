@@ -10,15 +10,20 @@ import asyncio
 import contextlib
 import copy
 import logging
-import os
+import multiprocessing
 import re
+import shutil
 import tempfile
-from collections.abc import Iterable, Sequence
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from distutils.dir_util import copy_tree
 from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import (
+    Any,
     Callable,
     Literal,
     Optional,
@@ -57,6 +62,8 @@ from packit.constants import (
     FROM_SOURCE_GIT_TOKEN,
     RELEASE_MONITORING_PROJECT_URL,
     REPO_NOT_PRISTINE_HINT,
+    STATUS_SOURCE_TIMEOUT,
+    STATUS_SOURCES,
     SYNC_RELEASE_DEFAULT_COMMIT_DESCRIPTION,
     SYNC_RELEASE_PR_CHECKLIST,
     SYNC_RELEASE_PR_DESCRIPTION,
@@ -72,24 +79,27 @@ from packit.exceptions import (
     PackitCoprException,
     PackitException,
     PackitFailedToCreateRPMException,
+    PackitLookasideCacheException,
     PackitRPMException,
     PackitRPMNotFoundException,
     PackitSRPMException,
     PackitSRPMNotFoundException,
     ReleaseSkippedPackitException,
 )
-from packit.local_project import LocalProject
+from packit.local_project import LocalProject, LocalProjectBuilder
 from packit.patches import PatchGenerator
 from packit.source_git import SourceGitGenerator
 from packit.status import Status
 from packit.sync import SyncFilesItem, sync_files
 from packit.upstream import GitUpstream, NonGitUpstream, Upstream
 from packit.utils import commands, obs_helper
-from packit.utils.bodhi import get_bodhi_client
+from packit.utils.bodhi import BodhiPaginator, get_bodhi_client
 from packit.utils.changelog_helper import ChangelogHelper
 from packit.utils.extensions import assert_existence
 from packit.utils.local_test_utils import LocalTestUtils
+from packit.utils.lookaside import LookasideCache
 from packit.utils.repo import (
+    GitObjectReader,
     commit_exists,
     get_commit_diff,
     get_commit_hunks,
@@ -98,6 +108,7 @@ from packit.utils.repo import (
     get_next_commit,
     get_tag_link,
     git_remote_url_to_https_url,
+    git_worktree,
     is_the_repo_pristine,
     shorten_commit_hash,
 )
@@ -166,6 +177,105 @@ def checkout_package_workdir(
     return local_project
 
 
+def _group_branches_sharing_targets(
+    dist_git_branches: dict[str, Optional[set[str]]],
+) -> list[list[tuple[str, Optional[set[str]]]]]:
+    """Groups the branches that are (or are fast-forward-merged into)
+    the same dist-git branch, so they can't be synced concurrently."""
+    groups: list[tuple[set[str], list[tuple[str, Optional[set[str]]]]]] = []
+    for branch, ff_branches in dist_git_branches.items():
+        targets = {branch} | (ff_branches or set())
+        members = [(branch, ff_branches)]
+        for group in [g for g in groups if g[0] & targets]:
+            groups.remove(group)
+            targets |= group[0]
+            members = group[1] + members
+        groups.append((targets, members))
+    order = list(dist_git_branches)
+    return sorted(
+        (sorted(members, key=lambda m: order.index(m[0])) for _, members in groups),
+        key=lambda members: order.index(members[0][0]),
+    )
+
+
+@dataclass
+class SyncReleaseResult:
+    """
+    Result of syncing a release into a single dist-git branch.
+
+    Attributes:
+        branch: Dist-git branch.
+        status: One of `synced`, `skipped` and `failed`.
+        pr_url: URL of the created pull request, if any.
+        message: Reason why the syncing was skipped or failed.
+        ff_pr_urls: URLs of the pull requests created for the fast-forward
+            branches, keyed by the branch.
+    """
+
+    branch: str
+    status: str
+    pr_url: Optional[str] = None
+    message: str = ""
+    ff_pr_urls: dict[str, str] = field(default_factory=dict)
+
+
+# API the parallel syncing has been started from, the forked workers inherit it
+_parallel_sync_api: Optional["PackitAPI"] = None
+
+
+def _init_sync_release_worker() -> None:
+    """Initializes a worker process forked by `PackitAPI.sync_release_parallel()`."""
+    # the persistent git processes (cat-file) of the parent must not be shared
+    GitObjectReader.reset()
+    for local_project in (
+        _parallel_sync_api.dg.local_project,
+        _parallel_sync_api.up.local_project,
+    ):
+        if local_project and local_project.git_repo:
+            local_project.git_repo.git.clear_cache()
+
+
+def _sync_release_branch(
+    api: "PackitAPI",
+    branch: str,
+    ff_branches: Optional[set[str]],
+    sync_release_kwargs: dict,
+) -> SyncReleaseResult:
+    """Syncs a release into a single branch and records the outcome."""
+    try:
+        prs = api.sync_release(
+            dist_git_branch=branch,
+            fast_forward_merge_branches=ff_branches,
+            **sync_release_kwargs,
+        )
+    except ReleaseSkippedPackitException as ex:
+        return SyncReleaseResult(branch, "skipped", message=str(ex))
+    except Exception as ex:
+        logger.error(f"Failed to sync the release into {branch}: {ex!r}")
+        return SyncReleaseResult(branch, "failed", message=str(ex))
+    pr, ff_prs = prs or (None, {})
+    return SyncReleaseResult(
+        branch,
+        "synced",
+        pr_url=pr.url if pr else None,
+        ff_pr_urls={b: p.url for b, p in (ff_prs or {}).items()},
+    )
+
+
+def _sync_release_in_worktree(
+    group: list[tuple[str, Optional[set[str]]]],
+    config: Config,
+    sync_release_kwargs: dict,
+) -> list[SyncReleaseResult]:
+    """Syncs a group of branches one after another in a worktree,
+    runs in a worker process forked by `PackitAPI.sync_release_parallel()`."""
+    with _parallel_sync_api.worktree_api(config=config) as api:
+        return [
+            _sync_release_branch(api, branch, ff_branches, sync_release_kwargs)
+            for branch, ff_branches in group
+        ]
+
+
 class PackitAPI:
     def __init__(
         self,
@@ -191,6 +301,8 @@ class PackitAPI:
         self._dg: Optional[DistGit] = None
         self._copr_helper: Optional[CoprHelper] = None
         self._kerberos_initialized = False
+        self._dist_git_fetch_lock = threading.Lock()
+        self._dist_git_fetched = False
 
     def __repr__(self):
         return (
@@ -255,6 +367,7 @@ class PackitAPI:
         if self._copr_helper is None:
             self._copr_helper = CoprHelper(
                 upstream_local_project=self.upstream_local_project,
+                projects_cache=self.config.copr_projects_cache,
             )
         return self._copr_helper
 
@@ -1362,6 +1475,150 @@ The first dist-git commit to be synced is '{short_hash}'.
 
         return pr, ff_prs if create_pr else None
 
+    @contextlib.contextmanager
+    def worktree_api(self, config: Optional[Config] = None) -> Iterator["PackitAPI"]:
+        """
+        Provide an API working in temporary worktrees of the dist-git
+        and upstream repositories of this API, detached at their current HEADs.
+
+        Worktrees share objects and refs with the original repositories,
+        so they are cheap to create, but can be worked with independently,
+        e.g. to sync multiple dist-git branches at once. The dist-git remote
+        is not fetched in the worktree, fetch it in the original repository.
+
+        Args:
+            config: Config to be used instead of the config of this API.
+
+        Yields:
+            New PackitAPI instance.
+        """
+        builder = LocalProjectBuilder()
+        with contextlib.ExitStack() as stack:
+            dg_repo = stack.enter_context(
+                git_worktree(self.dg.local_project.git_repo),
+            )
+            downstream_local_project = builder.build(
+                local_project=self.dg.local_project,
+                git_repo=dg_repo,
+                working_dir=Path(dg_repo.working_tree_dir),
+                ref=dg_repo.head.commit.hexsha,
+            )
+            upstream_local_project = None
+            if not self.non_git_upstream and self.up.local_project:
+                up_repo = stack.enter_context(
+                    git_worktree(self.up.local_project.git_repo),
+                )
+                upstream_local_project = builder.build(
+                    local_project=self.up.local_project,
+                    git_repo=up_repo,
+                    working_dir=Path(up_repo.working_tree_dir),
+                    ref=up_repo.head.commit.hexsha,
+                )
+            api = PackitAPI(
+                config=config or self.config,
+                package_config=self.package_config,
+                upstream_local_project=upstream_local_project,
+                downstream_local_project=downstream_local_project,
+                stage=self.stage,
+                non_git_upstream=self.non_git_upstream,
+            )
+            api._kerberos_initialized = self._kerberos_initialized
+            # remote refs are shared with the original repository
+            api.dg.fetch_before_update = False
+            yield api
+
+    def sync_release_parallel(
+        self,
+        dist_git_branches: dict[str, Optional[set[str]]],
+        jobs: int,
+        create_pr: bool = True,
+        sync_acls: Optional[bool] = False,
+        **kwargs,
+    ) -> dict[str, SyncReleaseResult]:
+        """
+        Update given package in multiple dist-git branches concurrently.
+
+        Every branch is synced in its own worktree of the dist-git (and upstream)
+        repository in a separate process. Branches that share a fast-forward
+        target are synced one after another in the same worktree. Remote refs
+        are fetched once beforehand and the downloaded sources are shared
+        through the source cache (a temporary one if none is configured).
+
+        Args:
+            dist_git_branches: Dist-git branches to sync into, mapped to
+                the branches they should be fast-forward-merged into.
+            jobs: Maximum number of branches synced at once.
+            create_pr: Create a pull request if set to True.
+            sync_acls: Whether to sync the ACLs of original repo and
+                fork when creating a PR from fork.
+            kwargs: Other arguments of `sync_release`, `use_local_content`
+                is not supported.
+
+        Returns:
+            Results of the syncing, keyed by the dist-git branch.
+
+        Raises:
+            PackitException, if `use_local_content` is set.
+        """
+        global _parallel_sync_api
+
+        if kwargs.get("use_local_content"):
+            raise PackitException(
+                "Using the local content is not supported when syncing "
+                "the branches in parallel.",
+            )
+        # make sure the tickets are obtained, the remotes set up and fetched
+        # before forking, so the workers don't race on that
+        dg_repo = self.dg.local_project.git_repo
+        dg_repo.remote("origin").fetch()
+        if create_pr:
+            self.dg.ensure_fork_remote(sync_acls=sync_acls)
+
+        config = self.config
+        source_cache_dir = None
+        if not config.source_cache:
+            source_cache_dir = tempfile.mkdtemp(prefix="packit-sources-")
+            config = copy.copy(config)
+            config.source_cache = source_cache_dir
+
+        # a branch checked out in one worktree can't be checked out in another
+        original_head = (
+            dg_repo.head.commit.hexsha
+            if dg_repo.head.is_detached
+            else dg_repo.active_branch.name
+        )
+        dg_repo.git.checkout("--detach")
+
+        groups = _group_branches_sharing_targets(dist_git_branches)
+        sync_release_kwargs = dict(kwargs, create_pr=create_pr, sync_acls=sync_acls)
+        results: dict[str, SyncReleaseResult] = {}
+        _parallel_sync_api = self
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max(1, min(jobs, len(groups))),
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_sync_release_worker,
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _sync_release_in_worktree,
+                        group,
+                        config,
+                        sync_release_kwargs,
+                    )
+                    for group in groups
+                ]
+                for future in futures:
+                    for result in future.result():
+                        results[result.branch] = result
+        finally:
+            _parallel_sync_api = None
+            dg_repo.git.checkout(original_head)
+            if source_cache_dir:
+                shutil.rmtree(source_cache_dir, ignore_errors=True)
+
+        return {branch: results[branch] for branch in dist_git_branches}
+
     def get_default_commit_description(
         self,
         upstream_tag: str,
@@ -1794,11 +2051,12 @@ The first dist-git commit to be synced is '{short_hash}'.
         upstream_archives = self.dg.download_upstream_archives()
 
         # Filter out git-tracked upstream archives
+        git_tracked_files = set(self.dg.git_tracked_files)
         untracked_upstream_archives = [
             archive
             for archive in upstream_archives
             if str(archive.relative_to(self.dg.absolute_source_dir))
-            not in self.dg.git_tracked_files
+            not in git_tracked_files
         ]
 
         self.up.actions_handler.run_action(
@@ -1839,27 +2097,26 @@ The first dist-git commit to be synced is '{short_hash}'.
         # Here, dist-git spec-file has already been updated from the upstream spec-file.
         # => Any update done to the Source tags in upstream
         # is already available in the dist-git spec-file.
-        sources_file = self.dg.local_project.working_dir / "sources"
-        for archive in archives:
-            archive_name = os.path.basename(archive)
-            archive_name_in_cache = self.dg.is_archive_in_lookaside_cache(
-                archive,
-            )
-            archive_name_in_sources_file = (
-                sources_file.is_file() and archive_name in sources_file.read_text()
+        try:
+            names_in_sources_file = LookasideCache.get_source_names(
+                self.dg.local_project.working_dir,
             )
-
-            if not archive_name_in_cache or not archive_name_in_sources_file:
-                return True
-
-        return False
+        except PackitLookasideCacheException as ex:
+            logger.debug(f"Unable to parse the sources file: {ex!r}")
+            return True
+        if any(archive.name not in names_in_sources_file for archive in archives):
+            return True
+        # all the archives are in the sources file, check the lookaside cache
+        in_cache = self.dg.are_archives_in_lookaside_cache(archives)
+        return not all(in_cache.values())
 
     def get_local_archives_to_upload(self) -> list[Path]:
         local_archives = self.dg.local_archive_names
+        git_tracked_files = set(self.dg.git_tracked_files)
         local_archives_to_upload = []
         for local_archive in local_archives:
             archive_path = self.dg.absolute_source_dir / local_archive
-            if not archive_path.exists() or local_archive in self.dg.git_tracked_files:
+            if not archive_path.exists() or local_archive in git_tracked_files:
                 logger.debug(
                     f"Local archive {archive_path} doesn't exist or is tracked by git. "
                     f"Skipping the handling of it.",
@@ -1878,6 +2135,7 @@ The first dist-git commit to be synced is '{short_hash}'.
         from_upstream: bool = False,
         release_suffix: Optional[str] = None,
         srpm_path: Optional[Path] = None,
+        in_worktree: bool = False,
     ):
         """
         Build component in Fedora infra (defaults to koji).
@@ -1894,6 +2152,9 @@ The first dist-git commit to be synced is '{short_hash}'.
             srpm_path: Specifies the path to the SRPM. If given, it is used for
                 the Koji build instead of the dist-git sources or upstream (if
                 `from_upstream` is set).
+            in_worktree: Build from a temporary worktree of dist-git detached
+                at the remote branch instead of checking the branch out,
+                so that builds of multiple branches can run at once.
 
         Returns:
             The 'stdout' of the build command.
@@ -1914,6 +2175,14 @@ The first dist-git commit to be synced is '{short_hash}'.
                 srpm_path=srpm_path,
             )
 
+        if in_worktree:
+            return self._build_in_worktree(
+                dist_git_branch,
+                scratch=scratch,
+                nowait=nowait,
+                koji_target=koji_target,
+            )
+
         self.dg.create_branch(
             dist_git_branch,
             base=f"remotes/origin/{dist_git_branch}",
@@ -1925,6 +2194,47 @@ The first dist-git commit to be synced is '{short_hash}'.
 
         return self.dg.build(scratch=scratch, nowait=nowait, koji_target=koji_target)
 
+    def _build_in_worktree(
+        self,
+        dist_git_branch: str,
+        scratch: bool = False,
+        nowait: bool = False,
+        koji_target: Optional[str] = None,
+    ):
+        """
+        Build the remote dist-git branch in Koji from a temporary worktree
+        with its own DistGit instance (and so its own command handler).
+
+        Origin is fetched only once, by the first of the concurrent callers,
+        since fetching into the same repository at once fails on ref locks.
+        """
+        dg_repo = self.dg.local_project.git_repo
+        with self._dist_git_fetch_lock:
+            if not self._dist_git_fetched:
+                dg_repo.remote("origin").fetch()
+                self._dist_git_fetched = True
+        if dist_git_branch not in dg_repo.remote("origin").refs:
+            raise PackitException(
+                f"Branch {dist_git_branch} does not exist in the origin remote.",
+            )
+
+        with git_worktree(dg_repo, ref=f"remotes/origin/{dist_git_branch}") as repo:
+            dg = DistGit(
+                config=self.config,
+                package_config=self.package_config,
+                local_project=LocalProjectBuilder().build(
+                    local_project=self.dg.local_project,
+                    git_repo=repo,
+                    working_dir=Path(repo.working_tree_dir),
+                    ref=repo.head.commit.hexsha,
+                ),
+            )
+            return dg.build(
+                scratch=scratch,
+                nowait=nowait,
+                koji_target=koji_target or DistGit.get_koji_target(dist_git_branch),
+            )
+
     def create_update(
         self,
         dist_git_branch: str,
@@ -2162,129 +2472,185 @@ The first dist-git commit to be synced is '{short_hash}'.
         return rpm_paths
 
     @staticmethod
-    async def status_get_downstream_prs(status) -> list[tuple[int, str, str]]:
-        try:
-            await asyncio.sleep(0)
-            return status.get_downstream_prs()
-        except Exception as exc:
-            # https://github.com/packit/ogr/issues/67 work-around
-            logger.debug(f"Failed when getting downstream PRs: {exc}")
-            return []
+    def _run_in_daemon_thread(func: Callable) -> asyncio.Future:
+        """
+        Run a blocking function in a daemon thread. Unlike with an executor,
+        a call that hangs doesn't keep the process from exiting.
 
-    @staticmethod
-    async def status_get_dg_versions(status) -> dict:
-        try:
-            await asyncio.sleep(0)
-            return status.get_dg_versions()
-        except Exception as exc:
-            logger.debug(f"Failed when getting Dist-git versions: {exc}")
-            return {}
+        Args:
+            func: Function to run.
 
-    @staticmethod
-    async def status_get_up_releases(status) -> list:
-        try:
-            await asyncio.sleep(0)
-            return status.get_up_releases()
-        except Exception as exc:
-            logger.debug(f"Failed when getting upstream releases: {exc}")
-            return []
+        Returns:
+            Future of the result of the function.
+        """
+        future: Future = Future()
 
-    @staticmethod
-    async def status_get_koji_builds(status) -> dict:
-        try:
-            await asyncio.sleep(0)
-            return status.get_koji_builds()
-        except Exception as exc:
-            logger.debug(f"Failed when getting Koji builds: {exc}")
-            return {}
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=run, name="packit-status", daemon=True).start()
+        return asyncio.wrap_future(future)
 
     @staticmethod
-    async def status_get_copr_builds(status) -> list:
+    async def _status_fetch(
+        getter: Callable,
+        default: Any,
+        description: str,
+        timeout: Optional[float] = STATUS_SOURCE_TIMEOUT,
+    ) -> Any:
+        """
+        Run a blocking status getter in its own thread so that the sources
+        are queried in parallel, each of them bounded by its own deadline.
+
+        Args:
+            getter: Blocking method of `Status` to call.
+            default: Value returned when the getter fails or times out.
+            description: Human-readable name of the data source used in logs.
+            timeout: Deadline for the source in seconds, `None` means no limit.
+
+        Returns:
+            Result of the getter or the default value.
+        """
         try:
-            await asyncio.sleep(0)
-            return status.get_copr_builds()
+            return await asyncio.wait_for(
+                PackitAPI._run_in_daemon_thread(getter),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out after {timeout}s when getting {description}.")
+            return default
         except Exception as exc:
-            logger.debug(f"Failed when getting Copr builds: {exc}")
-            return []
+            # https://github.com/packit/ogr/issues/67 work-around
+            logger.debug(f"Failed when getting {description}: {exc}")
+            return default
 
     @staticmethod
-    async def status_get_updates(status) -> list:
+    async def status_main(
+        status: Status,
+        timeout: Optional[float] = STATUS_SOURCE_TIMEOUT,
+        on_result: Optional[Callable[[str, Any], None]] = None,
+    ) -> list:
+        """
+        Schedule repository data retrieval calls concurrently.
+
+        Every data source runs in its own daemon thread, so the overall time
+        is the time of the slowest source, not the sum of all of them, and
+        a source that hangs past its deadline doesn't keep the process alive.
+
+        Args:
+            status: Status of the package.
+            timeout: Deadline for each of the sources in seconds.
+            on_result: Callback called with the name of the source and its result
+                as soon as the result is available.
+
+        Returns:
+            Results of the sources in the order of `STATUS_SOURCES`.
+        """
+        # the dist-git local project is created lazily by cloning the repository
+        # on the first access, don't let several sources clone it at once
         try:
-            await asyncio.sleep(0)
-            return status.get_updates()
+            status.dg.local_project  # noqa: B018
         except Exception as exc:
-            logger.debug(f"Failed when getting Bodhi updates: {exc}")
-            return []
+            logger.debug(f"Failed to initialize the dist-git local project: {exc}")
+
+        sources: dict[str, tuple[Callable[[], Any], Any, str]] = {
+            "downstream_prs": (status.get_downstream_prs, [], "downstream PRs"),
+            "dg_versions": (status.get_dg_versions, {}, "Dist-git versions"),
+            "up_releases": (status.get_up_releases, [], "upstream releases"),
+            "koji_builds": (status.get_koji_builds, {}, "Koji builds"),
+            "copr_builds": (status.get_copr_builds, [], "Copr builds"),
+            "updates": (status.get_updates, [], "Bodhi updates"),
+        }
+
+        async def fetch(name: str) -> Any:
+            getter, default, description = sources[name]
+            result = await PackitAPI._status_fetch(
+                getter,
+                default,
+                description,
+                timeout,
+            )
+            if on_result:
+                on_result(name, result)
+            return result
+
+        return await asyncio.gather(*(fetch(name) for name in STATUS_SOURCES))
 
     @staticmethod
-    async def status_main(status: Status) -> list:
+    def status_render(source: str, result: Any) -> None:
         """
-        Schedule repository data retrieval calls concurrently.
-        :param status: status of the package
-        :return: awaitable tasks
-        """
-        return await asyncio.gather(
-            PackitAPI.status_get_downstream_prs(status),
-            PackitAPI.status_get_dg_versions(status),
-            PackitAPI.status_get_up_releases(status),
-            PackitAPI.status_get_koji_builds(status),
-            PackitAPI.status_get_copr_builds(status),
-            PackitAPI.status_get_updates(status),
-        )
+        Print the result of a single status data source.
 
-    def status(self) -> None:
-        status = Status(self.config, self.package_config, self.up, self.dg)
-        (
-            ds_prs,
-            dg_versions,
-            up_releases,
-            koji_builds,
-            copr_builds,
-            updates,
-        ) = asyncio.run(self.status_main(status))
-
-        if ds_prs:
-            click.echo("\nDownstream PRs:")
-            click.echo(tabulate(ds_prs, headers=["ID", "Title", "URL"]))
-        else:
-            click.echo("\nNo downstream PRs found.")
+        Args:
+            source: Name of the data source, one of `STATUS_SOURCES`.
+            result: Data obtained from the source.
+        """
+        if source == "downstream_prs":
+            if result:
+                click.echo("\nDownstream PRs:")
+                click.echo(tabulate(result, headers=["ID", "Title", "URL"]))
+            else:
+                click.echo("\nNo downstream PRs found.")
 
-        if dg_versions:
-            click.echo("\nDist-git versions:")
-            for branch, dg_version in dg_versions.items():
-                click.echo(f"{branch: <10} {dg_version}")
-        else:
-            click.echo("\nNo Dist-git versions found.")
+        elif source == "dg_versions":
+            if result:
+                click.echo("\nDist-git versions:")
+                for branch, dg_version in result.items():
+                    click.echo(f"{branch: <10} {dg_version}")
+            else:
+                click.echo("\nNo Dist-git versions found.")
 
-        if up_releases:
-            click.echo("\nUpstream releases:")
-            upstream_releases_str = "\n".join(
-                f"{release.tag_name}" for release in up_releases
-            )
-            click.echo(upstream_releases_str)
-        else:
-            click.echo("\nNo upstream releases found.")
+        elif source == "up_releases":
+            if result:
+                click.echo("\nUpstream releases:")
+                upstream_releases_str = "\n".join(
+                    f"{release.tag_name}" for release in result
+                )
+                click.echo(upstream_releases_str)
+            else:
+                click.echo("\nNo upstream releases found.")
 
-        if updates:
-            click.echo("\nLatest Bodhi updates:")
-            click.echo(tabulate(updates, headers=["Update", "Karma", "status"]))
-        else:
-            click.echo("\nNo Bodhi updates found.")
+        elif source == "updates":
+            if result:
+                click.echo("\nLatest Bodhi updates:")
+                click.echo(tabulate(result, headers=["Update", "Karma", "status"]))
+            else:
+                click.echo("\nNo Bodhi updates found.")
 
-        if koji_builds:
-            click.echo("\nLatest Koji builds:")
-            for branch, branch_builds in koji_builds.items():
-                click.echo(f"{branch: <8} {branch_builds}")
-        else:
-            click.echo("\nNo Koji builds found.")
+        elif source == "koji_builds":
+            if result:
+                click.echo("\nLatest Koji builds:")
+                for branch, branch_builds in result.items():
+                    click.echo(f"{branch: <8} {branch_builds}")
+            else:
+                click.echo("\nNo Koji builds found.")
 
-        if copr_builds:
-            click.echo("\nLatest Copr builds:")
-            click.echo(
-                tabulate(copr_builds, headers=["Build ID", "Project name", "Status"]),
-            )
-        else:
-            click.echo("\nNo Copr builds found.")
+        elif source == "copr_builds":
+            if result:
+                click.echo("\nLatest Copr builds:")
+                click.echo(
+                    tabulate(result, headers=["Build ID", "Project name", "Status"]),
+                )
+            else:
+                click.echo("\nNo Copr builds found.")
+
+    def status(self, timeout: Optional[float] = STATUS_SOURCE_TIMEOUT) -> None:
+        """
+        Display status of the package, the data sources are queried concurrently
+        and each section is printed as soon as its data arrive.
+
+        Args:
+            timeout: Deadline for each of the data sources in seconds.
+        """
+        status = Status(self.config, self.package_config, self.up, self.dg)
+        asyncio.run(
+            self.status_main(status, timeout=timeout, on_result=self.status_render),
+        )
 
     def run_copr_build(
         self,
@@ -2395,6 +2761,19 @@ The first dist-git commit to be synced is '{short_hash}'.
             report_func=report_func,
         )
 
+    def watch_copr_builds(
+        self,
+        build_ids: Iterable[int],
+        timeout: int,
+        report_func: Optional[Callable] = None,
+    ) -> dict[int, str]:
+        """returns copr build states, watching all the builds at once"""
+        return self.copr_helper.watch_copr_builds(
+            build_ids=build_ids,
+            timeout=timeout,
+            report_func=report_func,
+        )
+
     def run_osh_build(
         self,
         chroot: Optional[str] = "fedora-rawhide-x86_64",
@@ -2526,19 +2905,12 @@ The first dist-git commit to be synced is '{short_hash}'.
             logger.error("Update was not found.")
 
     def get_testing_updates(self, update_alias: Optional[str]) -> list:
-        bodhi_client = get_bodhi_client()
-        updates = []
-        page = pages = 1
-        while page <= pages:
-            results = bodhi_client.query(
-                alias=update_alias,
-                packages=self.dg.package_config.downstream_package_name,
-                status="testing",
-                page=page,
-            )
-            updates.extend(results["updates"])
-            page += 1
-            pages = results["pages"]
+        updates = BodhiPaginator(
+            get_bodhi_client,
+            alias=update_alias,
+            packages=self.dg.package_config.downstream_package_name,
+            status="testing",
+        ).all()
         logger.debug("Bodhi updates with status 'testing' fetched.")
 
         return updates
@@ -1,8 +1,11 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import hashlib
 import os
+import re
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from importlib.metadata import version
 from logging import getLogger
 from pathlib import Path
@@ -11,9 +14,12 @@ from typing import Optional
 import git
 import requests
 import rpm
+import urllib3
+from cachetools import LRUCache
 from git import GitCommandError, PushInfo
 from ogr.abstract import AccessLevel, GitProject, PullRequest
 from ogr.services.pagure import PagureProject
+from requests.adapters import HTTPAdapter
 from specfile import Specfile
 from specfile.exceptions import (
     DuplicateSourceException,
@@ -27,17 +33,30 @@ from packit.actions_handler import ActionsHandler
 from packit.command_handler import RUN_COMMAND_HANDLER_MAPPING, CommandHandler
 from packit.config import Config, RunCommandType
 from packit.config.common_package_config import MultiplePackages
-from packit.constants import HTTP_REQUEST_TIMEOUT
+from packit.constants import (
+    DOWNLOAD_ATTEMPTS,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_WORKERS,
+    HTTP_REQUEST_TIMEOUT,
+    SPECFILE_CACHE_SIZE,
+)
 from packit.exceptions import PackitDownloadFailedException, PackitException
 from packit.local_project import LocalProject
 from packit.patches import PatchMetadata
 from packit.security import CommitVerifier
 from packit.utils.commands import cwd
+from packit.utils.file_cache import FileCache
 from packit.utils.lookaside import LookasideCache
 from packit.utils.repo import RepositoryCache, commit_message_file
 
 logger = getLogger(__name__)
 
+# %include and %{load:...} make the parsed spec file depend on other files
+INCLUDE_DIRECTIVE_REGEX = re.compile(r"%(include\b|\{?load\b)")
+
+# (spec file content digest, source dir, parse time macros) -> version
+_specfile_versions_cache: LRUCache = LRUCache(maxsize=1024)
+
 
 class PackitRepositoryBase:
     # mypy complains when this is a property
@@ -57,11 +76,15 @@ class PackitRepositoryBase:
         self.package_config = package_config
         self._specfile_path: Optional[Path] = None
         self._specfile: Optional[Specfile] = None
+        # (content digest, source dir, parse time macros) -> parsed spec file
+        self._specfiles: LRUCache = LRUCache(maxsize=SPECFILE_CACHE_SIZE)
         self.allowed_gpg_keys: Optional[list[str]] = None
 
         self._handler_kls = None
         self._command_handler: Optional[CommandHandler] = None
         self._actions_handler: Optional[ActionsHandler] = None
+        self._archive_cache: Optional[FileCache] = None
+        self._srpm_cache: Optional[FileCache] = None
 
     @property
     def handler_kls(self):
@@ -94,9 +117,40 @@ class PackitRepositoryBase:
             return RepositoryCache(
                 cache_path=self.config.repository_cache,
                 add_new=self.config.add_repositories_to_repository_cache,
+                refresh_interval=self.config.repository_cache_refresh_interval,
+                size_limit=self.config.repository_cache_size_limit,
             )
         return None
 
+    @property
+    def source_cache(self) -> Optional[FileCache]:
+        if self.config.source_cache:
+            return FileCache(
+                cache_path=self.config.source_cache,
+                size_limit=self.config.source_cache_size_limit,
+            )
+        return None
+
+    @property
+    def archive_cache(self) -> Optional[FileCache]:
+        # kept, so that the hits and misses are counted across archives
+        if self._archive_cache is None and self.config.archive_cache:
+            self._archive_cache = FileCache(
+                cache_path=self.config.archive_cache,
+                size_limit=self.config.archive_cache_size_limit,
+            )
+        return self._archive_cache
+
+    @property
+    def srpm_cache(self) -> Optional[FileCache]:
+        # kept, so that the hits and misses are counted across builds
+        if self._srpm_cache is None and self.config.srpm_cache:
+            self._srpm_cache = FileCache(
+                cache_path=self.config.srpm_cache,
+                size_limit=self.config.srpm_cache_size_limit,
+            )
+        return self._srpm_cache
+
     def is_command_handler_set(self) -> bool:
         """return True when command_handler is initialized"""
         return bool(self._command_handler)
@@ -127,36 +181,62 @@ class PackitRepositoryBase:
         return self._specfile_path
 
     @property
-    def specfile(self) -> Specfile:
-        if self._specfile is None:
-            # both keys (though unlikely) and values could have been interpreted
-            # as numbers by the YAML parser, convert them (back) to strings
-            def convert_to_str(k, v):
-                return str(k), v if v is None else str(v)
-
-            macros = [
-                convert_to_str(k, v)
-                for k, v in self.package_config.parse_time_macros.items()
-            ]
+    def parse_time_macros(self) -> list[tuple[str, Optional[str]]]:
+        """
+        Macros to be defined when parsing the spec file, the ones from package config
+        take precedence over the default ones from user config.
+        """
 
-            package_config_macro_keys = [
-                str(k) for k in self.package_config.parse_time_macros
-            ]
+        # both keys (though unlikely) and values could have been interpreted
+        # as numbers by the YAML parser, convert them (back) to strings
+        def convert_to_str(k, v):
+            return str(k), v if v is None else str(v)
 
-            # add default macros if they are not defined in the package config
-            macros += [
-                convert_to_str(k, v)
-                for k, v in self.config.default_parse_time_macros.items()
-                if str(k) not in package_config_macro_keys
-            ]
+        macros = [
+            convert_to_str(k, v)
+            for k, v in self.package_config.parse_time_macros.items()
+        ]
+
+        package_config_macro_keys = [
+            str(k) for k in self.package_config.parse_time_macros
+        ]
 
-            self._specfile = Specfile(
-                self.absolute_specfile_path,
-                sourcedir=self.absolute_source_dir,
-                macros=macros,
-                autosave=True,
-                sanitize=True,
+        # add default macros if they are not defined in the package config
+        macros += [
+            convert_to_str(k, v)
+            for k, v in self.config.default_parse_time_macros.items()
+            if str(k) not in package_config_macro_keys
+        ]
+        return macros
+
+    @property
+    def specfile(self) -> Specfile:
+        """
+        Parsed spec file. Spec files parsed before (e.g. on another branch) are
+        reused if neither their content nor the parse time macros have changed.
+        """
+        if self._specfile is None:
+            path = self.absolute_specfile_path
+            macros = self.parse_time_macros
+            key = (
+                hashlib.sha256(path.read_bytes()).hexdigest(),
+                str(self.absolute_source_dir),
+                tuple(macros),
             )
+            if (specfile := self._specfiles.get(key)) is not None:
+                logger.debug(f"Reusing the parsed spec file {path}.")
+                # the file could have been replaced, e.g. by switching branches
+                specfile.reload()
+            else:
+                specfile = Specfile(
+                    path,
+                    sourcedir=self.absolute_source_dir,
+                    macros=macros,
+                    autosave=True,
+                    sanitize=True,
+                )
+                self._specfiles[key] = specfile
+            self._specfile = specfile
         return self._specfile
 
     @property
@@ -172,7 +252,18 @@ class PackitRepositoryBase:
         # we need to get the version from rpm spec header
         # (as the version tag might not be present directly in the specfile,
         # but e.g. imported)
-        version = self.specfile.rpm_spec.sourceHeader[rpm.RPMTAG_VERSION]
+        content = str(self.specfile)
+        key = (
+            hashlib.sha256(content.encode(errors="surrogateescape")).hexdigest(),
+            str(self.specfile.sourcedir),
+            tuple(self.specfile.macros),
+        )
+        # spec files including other files can't be told apart by their content
+        cacheable = not INCLUDE_DIRECTIVE_REGEX.search(content)
+        if not cacheable or (version := _specfile_versions_cache.get(key)) is None:
+            version = self.specfile.rpm_spec.sourceHeader[rpm.RPMTAG_VERSION]
+            if cacheable:
+                _specfile_versions_cache[key] = version
         logger.info(f"Version in spec file is {version!r}.")
         return version
 
@@ -407,12 +498,17 @@ class PackitRepositoryBase:
             logger.debug("Allowed GPG keys are not set, skipping the verification.")
             return
 
-        ver = CommitVerifier()
+        ver = CommitVerifier(
+            keyring_cache=self.config.gpg_keyring_cache,
+            keyring_cache_refresh_interval=self.config.gpg_keyring_cache_refresh_interval,
+        )
         last_commit = self.local_project.git_repo.head.commit
-        valid = ver.check_signature_of_commit(
-            commit=last_commit,
+        valid = ver.check_signatures(
+            repo=self.local_project.git_repo,
             possible_key_fingerprints=self.allowed_gpg_keys,
-        )
+            revision_range=last_commit.hexsha,
+            max_count=1,
+        ).get(last_commit.hexsha, False)
         if not valid:
             msg = f"Last commit {last_commit.hexsha!r} not signed by the authorized gpg key."
             logger.warning(msg)
@@ -602,6 +698,8 @@ class PackitRepositoryBase:
         the configuration match to the URL basename from SourceX) or from the one
         from SourceX in specfile.
 
+        Sources are downloaded concurrently using a shared connection pool.
+
         Args:
             pkg_tool: Packaging tool associated with a lookaside cache instance
               to be used for downloading sources.
@@ -615,14 +713,20 @@ class PackitRepositoryBase:
         )
 
         # Fetch all sources defined in packit.yaml -> sources
-        sourcelist = [(s.url, s.path, False) for s in self.package_config.sources]
+        sourcelist: list[tuple[str, str, bool, Optional[tuple[str, str]]]] = [
+            (s.url, s.path, False, None) for s in self.package_config.sources
+        ]
         if pkg_tool:
             # Fetch sources defined in "sources" file from lookaside cache
             lookaside_sources = LookasideCache(pkg_tool).get_sources(
                 basepath=self.specfile.path.parent,
                 package=self.specfile.expanded_name,
+                with_digests=True,
+            )
+            sourcelist.extend(
+                (ls["url"], ls["path"], True, (ls["hashtype"], ls["hash"]))
+                for ls in lookaside_sources
             )
-            sourcelist.extend((ls["url"], ls["path"], True) for ls in lookaside_sources)
         # Fetch all remote sources defined in the spec file
         with self.specfile.sources() as sources, self.specfile.patches() as patches:
             sourcelist.extend(
@@ -630,44 +734,223 @@ class PackitRepositoryBase:
                     spec_source.expanded_location,
                     spec_source.expanded_filename,
                     False,
+                    None,
                 )
                 for spec_source in sources + patches
                 if spec_source.remote
                 and spec_source.valid  # skip invalid (excluded using conditions) sources
             )
-        logger.debug(f"List of sources to download (url, path, optional): {sourcelist}")
-        # Download all sources
-        for url, filename, optional in sourcelist:
+        logger.debug(
+            f"List of sources to download (url, path, optional, digest): {sourcelist}",
+        )
+        source_cache = self.source_cache
+        # Group the sources by their path, alternatives for the same path
+        # are tried in order, the same way as if they were downloaded serially
+        pending: dict[Path, list[tuple[str, bool, Optional[tuple[str, str]]]]] = {}
+        for url, filename, optional, digest in sourcelist:
             source_path = self.specfile.sourcedir.joinpath(filename)
             if source_path.is_file():
                 continue
+            pending.setdefault(source_path, []).append((url, optional, digest))
+        if not pending:
+            return
+
+        def download(source_path: Path, alternatives) -> None:
+            for url, optional, digest in alternatives:
+                try:
+                    self._download_source(
+                        session,
+                        url,
+                        source_path,
+                        digest=digest,
+                        source_cache=source_cache,
+                    )
+                    return
+                # the overhead is negligible compared to the download itself
+                except requests.exceptions.RequestException as e:  # noqa: PERF203
+                    msg = f"Failed to download source from {url}"
+                    if optional:
+                        logger.warning(f"{msg}: {e!r}")
+                        continue
+                    logger.error(f"{msg}: {e!r}")
+                    raise PackitDownloadFailedException(f"{msg}:\n{e}") from e
+
+        with requests.Session() as session:
+            session.headers.update(
+                {
+                    "User-Agent": user_agent,
+                    # Some misconfigured lookaside cache servers set 'Content-Encoding: gzip'
+                    # when serving *.tar.gz files even though the HTTP stream is not compressed
+                    # By accepting only raw streams and not decoding received data we can
+                    # handle such cases properly
+                    "Accept-Encoding": "identity",
+                },
+            )
+            workers = min(DOWNLOAD_WORKERS, len(pending))
+            # keep a connection per worker to each host
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            executor = ThreadPoolExecutor(max_workers=workers)
             try:
-                with requests.get(
+                futures = [
+                    executor.submit(download, source_path, alternatives)
+                    for source_path, alternatives in pending.items()
+                ]
+                # re-raise the first failure
+                for future in futures:
+                    future.result()
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        if source_cache:
+            logger.debug(
+                f"Source cache hits: {source_cache.hits}, misses: {source_cache.misses}",
+            )
+
+    @classmethod
+    def _download_source(
+        cls,
+        session: requests.Session,
+        url: str,
+        source_path: Path,
+        digest: Optional[tuple[str, str]] = None,
+        source_cache: Optional[FileCache] = None,
+    ) -> None:
+        """
+        Downloads a single source, using the source cache if provided.
+
+        Sources with a known digest (from lookaside cache) are cached under
+        that digest, other sources under their URL and ETag, if the server
+        provides one.
+
+        Args:
+            session: Session to be used for the requests.
+            url: URL of the source.
+            source_path: Where to store the source.
+            digest: Expected `(hashtype, hexdigest)` of the source, if known.
+            source_cache: Local cache of source archives.
+
+        Raises:
+            requests.exceptions.RequestException if download fails.
+        """
+
+        def url_key(etag: Optional[str]) -> Optional[str]:
+            if not etag:
+                return None
+            return hashlib.sha256(f"{url}\n{etag}".encode()).hexdigest()
+
+        key = None
+        if source_cache:
+            if digest:
+                key = digest[1]
+            else:
+                try:
+                    response = session.head(
+                        url,
+                        timeout=HTTP_REQUEST_TIMEOUT,
+                        allow_redirects=True,
+                    )
+                    if response.ok:
+                        key = url_key(response.headers.get("ETag"))
+                except requests.exceptions.RequestException as e:
+                    logger.debug(f"Failed to get ETag of {url}: {e!r}")
+        if not key:
+            etag = cls._fetch_source(session, url, source_path)
+            if source_cache and (key := url_key(etag)):
+                source_cache.put(key, source_path)
+            return
+
+        # make concurrent downloads of the same source wait for the first one
+        with source_cache.lock(key):
+            if source_cache.get(key, source_path):
+                logger.debug(f"Using cached {source_path.name} for {url}.")
+                return
+            cls._fetch_source(session, url, source_path)
+            source_cache.put(key, source_path, digest=digest)
+
+    @staticmethod
+    def _fetch_source(
+        session: requests.Session,
+        url: str,
+        source_path: Path,
+    ) -> Optional[str]:
+        """
+        Downloads a source into a `.part` file that is renamed once the download
+        is complete. Transfers interrupted during the download are resumed
+        using Range requests, as long as the server provides a validator
+        (a strong ETag or Last-Modified) confirming the source hasn't changed
+        in the meantime.
+
+        Args:
+            session: Session to be used for the requests.
+            url: URL of the source.
+            source_path: Where to store the source.
+
+        Returns:
+            ETag of the source, if provided by the server.
+
+        Raises:
+            requests.exceptions.RequestException if download fails.
+        """
+        part_path = source_path.with_name(f".{source_path.name}.part")
+        # a leftover of a previous run may be a part of a different file
+        part_path.unlink(missing_ok=True)
+        etag = validator = None
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            offset = part_path.stat().st_size if part_path.is_file() else 0
+            headers = None
+            if offset and validator:
+                # the server sends the whole file if it no longer matches the validator
+                headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+            try:
+                with session.get(
                     url,
-                    headers={
-                        "User-Agent": user_agent,
-                        # Some misconfigured lookaside cache servers set 'Content-Encoding: gzip'
-                        # when serving *.tar.gz files even though the HTTP stream is not compressed
-                        # By accepting only raw streams and not decoding received data we can
-                        # handle such cases properly
-                        "Accept-Encoding": "identity",
-                    },
+                    headers=headers,
                     timeout=HTTP_REQUEST_TIMEOUT,
                     stream=True,
                 ) as response:
+                    if headers and response.status_code == 416:
+                        # the partial file is not a prefix of the source, start over
+                        part_path.unlink()
+                        raise requests.exceptions.ConnectionError(
+                            f"Can't resume download of {url}",
+                        )
                     response.raise_for_status()
-                    with open(source_path, "wb") as f:
+                    # the server may ignore the Range header and send the whole file
+                    resumed = bool(headers) and response.status_code == 206
+                    if offset and not resumed:
+                        logger.debug(f"Unable to resume download of {url}.")
+                    etag = response.headers.get("ETag")
+                    if not resumed:
+                        # weak ETags can't be used in If-Range
+                        validator = (
+                            etag
+                            if etag and not etag.startswith("W/")
+                            else response.headers.get("Last-Modified")
+                        )
+                    with open(part_path, "ab" if resumed else "wb") as f:
                         # With 'identity' encoding we should be getting raw, uncompressed data
                         # so there is no need to decode them
-                        for chunk in response.raw.stream(8192, decode_content=False):
+                        for chunk in response.raw.stream(
+                            DOWNLOAD_CHUNK_SIZE,
+                            decode_content=False,
+                        ):
                             f.write(chunk)
-            except requests.exceptions.RequestException as e:
-                msg = f"Failed to download source from {url}"
-                if optional:
-                    logger.warning(f"{msg}: {e!r}")
-                    continue
-                logger.error(f"{msg}: {e!r}")
-                raise PackitDownloadFailedException(f"{msg}:\n{e}") from e
+                break
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                urllib3.exceptions.HTTPError,
+            ) as e:
+                if attempt == DOWNLOAD_ATTEMPTS:
+                    if isinstance(e, requests.exceptions.RequestException):
+                        raise
+                    raise requests.exceptions.ConnectionError(e) from e
+                logger.debug(
+                    f"Download of {url} interrupted (attempt {attempt}): {e!r}",
+                )
+        part_path.replace(source_path)
+        return etag
 
     def get_user(self) -> Optional[str]:
         if self.local_project.git_service:
@@ -139,6 +139,17 @@ def koji(
             "multiple values at the same time.",
         )
 
+    # obtain the ticket and create the SRPM once for all the builds
+    api.init_kerberos_ticket()
+    srpm_path = config.srpm_path
+    if from_upstream and not srpm_path:
+        srpm_path = api.create_srpm(
+            srpm_dir=api.up.local_project.working_dir,
+            release_suffix=release_suffix,
+        )
+    # concurrent builds from dist-git need their own worktrees
+    in_worktree = len(targets_to_build) * len(branches_to_build) > 1
+
     build_futures = {}
     with ThreadPoolExecutor() as executor:
         for target in targets_to_build:
@@ -155,7 +166,8 @@ def koji(
                         koji_target=target,
                         from_upstream=from_upstream,
                         release_suffix=release_suffix,
-                        srpm_path=config.srpm_path,
+                        srpm_path=srpm_path,
+                        in_worktree=in_worktree,
                     )
                 ] = (branch, target)
 
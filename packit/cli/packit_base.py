@@ -45,9 +45,25 @@ logger = logging.getLogger("packit")
     "package_config_path",
     help="Path to package configuration file (defaults to .packit.yaml or packit.yaml)",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    "package_jobs",
+    type=click.IntRange(min=1),
+    help="Number of packages of a monorepo to work on at once, "
+    "each of them in a separate process (defaults to 1).",
+)
 @click.version_option(version=version("packitos"), message="%(version)s")
 @click.pass_context
-def packit_base(ctx, debug, fas_user, keytab, remote, package_config_path):
+def packit_base(
+    ctx,
+    debug,
+    fas_user,
+    keytab,
+    remote,
+    package_config_path,
+    package_jobs,
+):
     """Integrate upstream open source projects into Fedora operating system."""
     if debug:
         # to be able to logger.debug() also in get_user_config()
@@ -59,6 +75,7 @@ def packit_base(ctx, debug, fas_user, keytab, remote, package_config_path):
     c.keytab_path = keytab or c.keytab_path
     c.upstream_git_remote = remote or c.upstream_git_remote
     c.package_config_path = package_config_path or c.package_config_path
+    c.package_jobs = package_jobs or c.package_jobs
     ctx.obj = c
 
     if ctx.obj.debug:
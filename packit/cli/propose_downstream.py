@@ -10,6 +10,7 @@ import logging
 import os
 
 import click
+from tabulate import tabulate
 
 from packit.cli.types import LocalProjectParameter
 from packit.cli.utils import cover_packit_exception, get_packit_api, iterate_packages
@@ -20,6 +21,7 @@ from packit.constants import (
     PACKAGE_OPTION_HELP,
     PACKAGE_SHORT_OPTION,
 )
+from packit.exceptions import PackitException
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +68,7 @@ def sync_release(
     package_config,
     resolve_bug,
     sync_acls,
+    branch_jobs=1,
     check_for_non_git_upstream=False,
 ):
     api = get_packit_api(
@@ -97,23 +100,51 @@ def sync_release(
         *dist_git_branches,
         default_dg_branch=default_dg_branch,
     )
+    sync_release_kwargs = {
+        "versions": [version] if version else [],
+        "force_new_sources": force_new_sources,
+        "upstream_ref": upstream_ref,
+        "create_pr": pr,
+        "force": force,
+        "use_downstream_specfile": use_downstream_specfile,
+        "resolved_bugs": resolve_bug,
+        "sync_acls": sync_acls,
+    }
+    fast_forward_merge_branches = {
+        branch: get_fast_forward_merge_branches_for(
+            dist_git_branches=dist_git_branches,
+            source_branch=branch,
+            default=default_dg_branch,
+        )
+        for branch in branches_to_update
+    }
+    if branch_jobs > 1 and len(branches_to_update) > 1 and not local_content:
+        results = api.sync_release_parallel(
+            dist_git_branches=fast_forward_merge_branches,
+            jobs=branch_jobs,
+            **sync_release_kwargs,
+        )
+        click.echo(
+            tabulate(
+                [
+                    (result.branch, result.status, result.pr_url or result.message)
+                    for result in results.values()
+                ],
+                headers=["Branch", "Status", "Pull request / Reason"],
+            ),
+        )
+        if failed := [r.branch for r in results.values() if r.status == "failed"]:
+            raise PackitException(
+                f"Failed to sync the release into: {', '.join(failed)}",
+            )
+        return
+
     for branch in branches_to_update:
         api.sync_release(
             dist_git_branch=branch,
             use_local_content=local_content,
-            versions=[version] if version else [],
-            force_new_sources=force_new_sources,
-            upstream_ref=upstream_ref,
-            create_pr=pr,
-            force=force,
-            use_downstream_specfile=use_downstream_specfile,
-            resolved_bugs=resolve_bug,
-            sync_acls=sync_acls,
-            fast_forward_merge_branches=get_fast_forward_merge_branches_for(
-                dist_git_branches=dist_git_branches,
-                source_branch=branch,
-                default=default_dg_branch,
-            ),
+            fast_forward_merge_branches=fast_forward_merge_branches[branch],
+            **sync_release_kwargs,
         )
 
 
@@ -163,6 +194,14 @@ def sync_release_common_options(func):
         is_flag=True,
         help="Sync ACLs between dist-git repo and the fork, is considered only with --pr option.",
     )
+    @click.option(
+        "--branch-jobs",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help="Number of dist-git branches to sync at once, "
+        "each of them in its own worktree of the repositories.",
+    )
     @click.option(
         PACKAGE_SHORT_OPTION,
         PACKAGE_LONG_OPTION,
@@ -214,6 +253,7 @@ def propose_downstream(
     force,
     sync_acls,
     resolve_bug,
+    branch_jobs,
     package_config,
 ):
     """
@@ -240,6 +280,7 @@ def propose_downstream(
         package_config=package_config,
         resolve_bug=resolve_bug,
         sync_acls=sync_acls,
+        branch_jobs=branch_jobs,
     )
 
 
@@ -259,6 +300,7 @@ def pull_from_upstream(
     force,
     sync_acls,
     resolve_bug,
+    branch_jobs,
     package_config,
 ):
     """
@@ -285,5 +327,6 @@ def pull_from_upstream(
         package_config=package_config,
         resolve_bug=resolve_bug,
         sync_acls=sync_acls,
+        branch_jobs=branch_jobs,
         check_for_non_git_upstream=True,
     )
@@ -17,6 +17,7 @@ from packit.constants import (
     PACKAGE_LONG_OPTION,
     PACKAGE_OPTION_HELP,
     PACKAGE_SHORT_OPTION,
+    STATUS_SOURCE_TIMEOUT,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,14 +30,24 @@ logger = logging.getLogger(__name__)
     multiple=True,
     help=PACKAGE_OPTION_HELP.format(action="update"),
 )
+@click.option(
+    "--timeout",
+    type=click.FLOAT,
+    default=STATUS_SOURCE_TIMEOUT,
+    show_default=True,
+    help="Time limit in seconds for each of the queried services.",
+)
 @click.argument("path_or_url", type=LocalProjectParameter(), default=os.path.curdir)
 @pass_config
 @cover_packit_exception
 @iterate_packages
-def status(config, path_or_url, package_config):
+def status(config, timeout, path_or_url, package_config):
     """
     Display status.
 
+    All the services are queried concurrently and the results are displayed
+    as soon as they are available.
+
     \b
     - latest downstream pull requests
     - versions from all downstream branches
@@ -51,4 +62,4 @@ def status(config, path_or_url, package_config):
         package_config=package_config,
         local_project=path_or_url,
     )
-    api.status()
+    api.status(timeout=timeout)
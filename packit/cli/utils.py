@@ -3,20 +3,26 @@
 
 import copy
 import functools
+import io
 import logging
+import multiprocessing
 import os
 import pathlib
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Optional, TextIO, Union, cast
 
 import click
 from github import GithubException
 from ogr.parsing import parse_git_repo
 from ogr.services.github import GithubService
+from tabulate import tabulate
 
 from packit.api import PackitAPI
 from packit.config import Config, JobType, get_local_package_config
+from packit.config.aliases import get_aliases
 from packit.config.common_package_config import MultiplePackages
 from packit.config.package_config import PackageConfig
 from packit.constants import (
@@ -31,6 +37,48 @@ from packit.local_project import LocalProject
 
 logger = logging.getLogger(__name__)
 
+# command the forked workers of _run_packages_in_parallel() run
+_parallel_func: Optional[Callable] = None
+# whether the forked workers log tracebacks of the exceptions
+_parallel_debug = False
+
+
+def _report_exception(exc: Exception, debug: bool = False) -> int:
+    """
+    Reports an exception raised by a command to the user.
+
+    Args:
+        exc: The exception.
+        debug: Whether to log the traceback.
+
+    Returns:
+        Exit code corresponding to the exception.
+    """
+    if debug:
+        logger.exception(exc)
+    elif isinstance(exc, GithubException):
+        click.echo(
+            "We've encountered an error while talking to GitHub API, please make sure"
+            " that you pass GitHub API token and it has correct permissions, \n"
+            f"precise error message: {exc} \n"
+            "https://github.com/packit/packit/tree/master/docs\n",
+        )
+    else:
+        logger.error(exc)
+        if not isinstance(exc, PackitException):
+            click.echo(
+                "Unexpected exception occurred,\n"
+                "please file an issue here:\n"
+                "https://github.com/packit/packit/issues",
+                err=True,
+            )
+
+    if isinstance(exc, PackitException):
+        return 2
+    if isinstance(exc, GithubException):
+        return 3
+    return 4
+
 
 def cover_packit_exception(_func=None, *, exit_code=None):
     """
@@ -58,41 +106,140 @@ def cover_packit_exception(_func=None, *, exit_code=None):
             except KeyboardInterrupt:
                 click.echo("Quitting on user request.")
                 sys.exit(1)
-            except PackitException as exc:
-                if config and config.debug:
-                    logger.exception(exc)
-                else:
-                    logger.error(exc)
-                sys.exit(exit_code or 2)
-            except GithubException as exc:
-                if config and config.debug:
-                    logger.exception(exc)
-                else:
-                    click.echo(
-                        "We've encountered an error while talking to GitHub API, please make sure"
-                        " that you pass GitHub API token and it has correct permissions, \n"
-                        f"precise error message: {exc} \n"
-                        "https://github.com/packit/packit/tree/master/docs\n",
-                    )
-                sys.exit(exit_code or 3)
             except Exception as exc:
-                if config and config.debug:
-                    logger.exception(exc)
-                else:
-                    logger.error(exc)
-                    click.echo(
-                        "Unexpected exception occurred,\n"
-                        "please file an issue here:\n"
-                        "https://github.com/packit/packit/issues",
-                        err=True,
-                    )
-                sys.exit(exit_code or 4)
+                sys.exit(
+                    exit_code or _report_exception(exc, bool(config and config.debug)),
+                )
 
         return covered_func
 
     return decorator_cover if _func is None else decorator_cover(_func)
 
 
+class PrefixedStream(io.TextIOBase):
+    """
+    Text stream prefixing every line written to the wrapped stream.
+
+    Complete lines are written at once, so lines of multiple processes
+    sharing the same underlying file are not mixed up.
+    """
+
+    def __init__(self, stream, prefix: str):
+        self.stream = stream
+        self.prefix = prefix
+        self._partial_line = ""
+
+    def write(self, text: str) -> int:
+        lines = (self._partial_line + text).splitlines(keepends=True)
+        self._partial_line = (
+            lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        )
+        if lines:
+            self.stream.write("".join(f"{self.prefix}{line}" for line in lines))
+            self.stream.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._partial_line:
+            self.stream.write(f"{self.prefix}{self._partial_line}")
+            self._partial_line = ""
+        self.stream.flush()
+
+
+def _run_package(package: str, args: tuple, kwargs: dict) -> tuple[int, str]:
+    """
+    Runs `_parallel_func` for a single package with its output prefixed
+    by the package name.
+
+    Returns:
+        Exit code (the same as the one of `cover_packit_exception`)
+        and an error message.
+    """
+    prefix = f"[{package}] "
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    # PrefixedStream implements the part of TextIO the streams are used for
+    streams = {
+        stream: cast(TextIO, PrefixedStream(stream, prefix))
+        for stream in (original_stdout, original_stderr)
+    }
+    handler_streams = {
+        handler: handler.stream
+        for handler in logging.getLogger("packit").handlers
+        if isinstance(handler, logging.StreamHandler) and handler.stream in streams
+    }
+    # the worker process can be reused for another package
+    sys.stdout, sys.stderr = streams[original_stdout], streams[original_stderr]
+    for handler, stream in handler_streams.items():
+        handler.setStream(streams[stream])
+    try:
+        _parallel_func(*args, **kwargs)
+    except click.ClickException as exc:
+        exc.show()
+        return exc.exit_code, exc.format_message()
+    except SystemExit as exc:
+        return exc.code if isinstance(exc.code, int) else 1, ""
+    except Exception as exc:
+        return _report_exception(exc, _parallel_debug), str(exc)
+    finally:
+        for handler, stream in handler_streams.items():
+            handler.setStream(stream)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout, sys.stderr = original_stdout, original_stderr
+    return 0, ""
+
+
+def _init_package_worker(debug: bool) -> None:
+    global _parallel_debug
+    _parallel_debug = debug
+
+
+def _run_packages_in_parallel(
+    func: Callable,
+    args: tuple,
+    packages_kwargs: dict[str, dict],
+    jobs: int,
+    debug: bool = False,
+) -> dict[str, tuple[int, str]]:
+    """
+    Runs the function for multiple packages at once, each of them
+    in a separate (forked) process, so the packages share everything
+    that has already been loaded (parsed config, cloned upstream repository,
+    distro aliases), but none of the mutable state.
+
+    Args:
+        func: Function to run.
+        args: Positional arguments of the function.
+        packages_kwargs: Keyword arguments of the function for each package.
+        jobs: Maximum number of packages processed at once.
+        debug: Whether to log tracebacks of the exceptions.
+
+    Returns:
+        Exit code and error message for each package.
+    """
+    global _parallel_func
+
+    # load the aliases before forking so that the workers inherit them
+    with suppress(PackitException):
+        get_aliases()
+
+    _parallel_func = func
+    try:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_package_worker,
+            initargs=(debug,),
+        ) as executor:
+            futures = {
+                package: executor.submit(_run_package, package, args, kwargs)
+                for package, kwargs in packages_kwargs.items()
+            }
+            return {package: future.result() for package, future in futures.items()}
+    finally:
+        _parallel_func = None
+
+
 def iterate_packages(func):
     """
     Decorator for dealing with sub-packages in a package (Monorepo) configuration
@@ -105,6 +252,10 @@ def iterate_packages(func):
     * if there is just one package in the configuration
       then call the decorated function just once
 
+    If `config.package_jobs` is bigger than 1, the decorated function is called
+    for multiple packages at once, each of them in a separate process,
+    and a summary of the results is printed at the end.
+
     This method (iterate_packages) **has not** `package_config` key
     in its kwargs, it has `packages`, but calls a method
     (func) who needs a `package_config` key and not `packages`!
@@ -114,43 +265,63 @@ def iterate_packages(func):
     def covered_func(*args, **kwargs):
         path_or_url = kwargs["path_or_url"]
         config = kwargs["config"]
-        decorated_func_kwargs = kwargs.copy()
-        del decorated_func_kwargs["package"]
         packages_config: MultiplePackages = get_local_package_config(
             path_or_url.working_dir,
             repo_name=path_or_url.repo_name,
             try_local_dir_last=True,
             package_config_path=config.package_config_path,
         )
-        packages_config_views_names = set(
-            packages_config.get_package_config_views().keys(),
-        )
+        packages_config_views = packages_config.get_package_config_views()
         if kwargs.get("package"):
             if not_defined_packages := set(kwargs["package"]).difference(
-                packages_config_views_names,
+                packages_config_views.keys(),
             ):
                 logger.error(
                     "Packages %s are not defined in packit configuration.",
                     not_defined_packages,
                 )
                 return
-            for package in kwargs["package"]:
-                decorated_func_kwargs["config"] = copy.deepcopy(
-                    config,
-                )  # reset working variables like srpm_path
-                decorated_func_kwargs["package_config"] = (
-                    packages_config.get_package_config_views()[package]
-                )
-                func(*args, **decorated_func_kwargs)
+            packages = list(kwargs["package"])
         elif hasattr(packages_config, "packages"):
-            for package_config in packages_config.get_package_config_views().values():
-                decorated_func_kwargs["config"] = copy.deepcopy(
-                    config,
-                )  # reset working variables like srpm_path
-                decorated_func_kwargs["package_config"] = package_config
-                func(*args, **decorated_func_kwargs)
+            packages = list(packages_config_views.keys())
         else:
             logger.error("Given packages_config has no packages attribute")
+            return
+
+        packages_kwargs = {}
+        for package in packages:
+            decorated_func_kwargs = kwargs.copy()
+            del decorated_func_kwargs["package"]
+            decorated_func_kwargs["config"] = copy.deepcopy(
+                config,
+            )  # reset working variables like srpm_path
+            decorated_func_kwargs["package_config"] = packages_config_views[package]
+            packages_kwargs[package] = decorated_func_kwargs
+
+        jobs = min(config.package_jobs, len(packages_kwargs))
+        if jobs <= 1:
+            for decorated_func_kwargs in packages_kwargs.values():
+                func(*args, **decorated_func_kwargs)
+            return
+
+        results = _run_packages_in_parallel(
+            func,
+            args,
+            packages_kwargs,
+            jobs,
+            debug=config.debug,
+        )
+        click.echo(
+            tabulate(
+                [
+                    (package, "ok" if exit_code == 0 else "failed", exit_code, message)
+                    for package, (exit_code, message) in results.items()
+                ],
+                headers=["Package", "Result", "Exit code", "Error"],
+            ),
+        )
+        if failed := [package for package, (code, _) in results.items() if code]:
+            raise PackitException(f"Failed packages: {', '.join(failed)}")
 
     return covered_func
 
@@ -53,7 +53,21 @@ class Config:
         package_config_path=None,
         repository_cache=None,
         add_repositories_to_repository_cache=True,
+        repository_cache_refresh_interval: Optional[int] = None,
+        repository_cache_size_limit: Optional[int] = None,
+        source_cache: Optional[str] = None,
+        source_cache_size_limit: Optional[int] = None,
+        gpg_keyring_cache: Optional[str] = None,
+        gpg_keyring_cache_refresh_interval: Optional[int] = None,
+        archive_cache: Optional[str] = None,
+        archive_cache_size_limit: Optional[int] = None,
+        archive_compression_threads: Optional[int] = None,
+        srpm_cache: Optional[str] = None,
+        srpm_cache_size_limit: Optional[int] = None,
+        copr_projects_cache: Optional[str] = None,
+        koji_metadata_cache: Optional[str] = None,
         default_parse_time_macros: Optional[dict] = None,
+        package_jobs: int = 1,
         **kwargs,
     ):
         self.debug: bool = debug
@@ -108,7 +122,35 @@ class Config:
         self.package_config_path = package_config_path
         self.repository_cache = repository_cache
         self.add_repositories_to_repository_cache = add_repositories_to_repository_cache
+        # fetch repositories in the repository cache older than this (in seconds)
+        self.repository_cache_refresh_interval = repository_cache_refresh_interval
+        # maximum size of the repository cache in bytes
+        self.repository_cache_size_limit = repository_cache_size_limit
+        # directory of a local cache of downloaded source archives
+        self.source_cache = source_cache
+        # maximum size of the source cache in bytes
+        self.source_cache_size_limit = source_cache_size_limit
+        # GnuPG home directory with keys downloaded from keyservers shared by workers
+        self.gpg_keyring_cache = gpg_keyring_cache
+        # download keys in the GPG keyring cache older than this (in seconds) again
+        self.gpg_keyring_cache_refresh_interval = gpg_keyring_cache_refresh_interval
+        # directory of a local cache of archives created from upstream repositories
+        self.archive_cache = archive_cache
+        # maximum size of the archive cache in bytes
+        self.archive_cache_size_limit = archive_cache_size_limit
+        # compress archives created using `git archive` by pigz with this many threads
+        self.archive_compression_threads = archive_compression_threads
+        # directory of a local cache of SRPMs keyed by the digest of their inputs
+        self.srpm_cache = srpm_cache
+        # maximum size of the SRPM cache in bytes
+        self.srpm_cache_size_limit = srpm_cache_size_limit
+        # JSON file the recent Copr projects of repositories are persisted in
+        self.copr_projects_cache = copr_projects_cache
+        # JSON file answers of Koji calls querying static metadata are persisted in
+        self.koji_metadata_cache = koji_metadata_cache
         self.default_parse_time_macros = default_parse_time_macros or {}
+        # number of packages of a monorepo the CLI works on at once
+        self.package_jobs = package_jobs
 
         # because of current load_authentication implementation it will generate false warnings
         # if kwargs:
@@ -133,7 +175,21 @@ class Config:
             f"command_handler_storage_class='{self.command_handler_storage_class}', "
             f"appcode='{self.appcode}', "
             f"repository_cache='{self.repository_cache}', "
-            f"default_parse_time_macros='{self.default_parse_time_macros}')"
+            f"repository_cache_refresh_interval='{self.repository_cache_refresh_interval}', "
+            f"repository_cache_size_limit='{self.repository_cache_size_limit}', "
+            f"source_cache='{self.source_cache}', "
+            f"source_cache_size_limit='{self.source_cache_size_limit}', "
+            f"gpg_keyring_cache='{self.gpg_keyring_cache}', "
+            f"gpg_keyring_cache_refresh_interval='{self.gpg_keyring_cache_refresh_interval}', "
+            f"archive_cache='{self.archive_cache}', "
+            f"archive_cache_size_limit='{self.archive_cache_size_limit}', "
+            f"archive_compression_threads='{self.archive_compression_threads}', "
+            f"srpm_cache='{self.srpm_cache}', "
+            f"srpm_cache_size_limit='{self.srpm_cache_size_limit}', "
+            f"copr_projects_cache='{self.copr_projects_cache}', "
+            f"koji_metadata_cache='{self.koji_metadata_cache}', "
+            f"default_parse_time_macros='{self.default_parse_time_macros}', "
+            f"package_jobs='{self.package_jobs}')"
         )
 
     @classmethod
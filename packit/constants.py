@@ -280,6 +280,50 @@ DOWNSTREAM_PACKAGE_CHECK_URL = "https://src.fedoraproject.org/rpms/{package_name
 # depending on the number of IP addresses for the target domain
 HTTP_REQUEST_TIMEOUT = (10, 30)
 
+# maximum number of sources downloaded concurrently
+DOWNLOAD_WORKERS = 8
+# size of chunks in which downloaded sources are written
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# how many times to try downloading a source when the transfer gets interrupted
+DOWNLOAD_ATTEMPTS = 3
+
+# connection timeout and read timeout (in seconds) of a single keyserver
+KEYSERVER_TIMEOUT = (5, 15)
+# how long (in seconds) keys downloaded to a GPG keyring cache are used
+# before they are downloaded again (to pick up revocations and expirations)
+GPG_KEYRING_CACHE_REFRESH_INTERVAL = 24 * 60 * 60
+
+# maximum number of concurrent requests to lookaside cache
+LOOKASIDE_WORKERS = 8
+
+# how many Bodhi updates are requested per page (Bodhi doesn't allow more than 100)
+# and maximum number of pages fetched concurrently
+BODHI_ROWS_PER_PAGE = 100
+BODHI_WORKERS = 8
+
+# total size (in bytes) of git objects cached per repository
+GIT_OBJECT_CACHE_SIZE = 64 * 1024 * 1024
+
+# how many parsed spec files (e.g. from different branches) a repository keeps
+SPECFILE_CACHE_SIZE = 8
+
+# how long (in seconds) static Koji metadata (build targets, tag inheritance
+# and configuration) is cached and how many answers are kept
+KOJI_METADATA_CACHE_TTL = 6 * 60 * 60
+KOJI_METADATA_CACHE_SIZE = 1024
+
 FAST_FORWARD_MERGE_INTO_KEY = "fast_forward_merge_into"
 
 PACKAGE_CONFIG_HEADERS = {"Accept": "application/yaml"}
+
+# data sources of `packit status` in the order they are returned
+STATUS_SOURCES = (
+    "downstream_prs",
+    "dg_versions",
+    "up_releases",
+    "koji_builds",
+    "copr_builds",
+    "updates",
+)
+# deadline in seconds for each of the data sources of `packit status`
+STATUS_SOURCE_TIMEOUT = 120
@@ -1,12 +1,21 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import json
 import logging
+import os
+import random
+import tempfile
+import threading
 import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Callable, Optional
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
 
 import backoff
+from cachetools import TTLCache
 from cachetools.func import ttl_cache
 from copr.v3 import Client as CoprClient
 from copr.v3.exceptions import (
@@ -28,6 +37,23 @@ logger = logging.getLogger(__name__)
 
 _MAX_PROJECT_EDIT_RETRIES = 3
 
+# bounds (in seconds) of the interval between queries when watching Copr builds
+_WATCH_INITIAL_INTERVAL = 10
+_WATCH_MAX_INTERVAL = 120
+
+# number of Copr projects requested at once when looking for projects of a repository
+_COPR_PROJECTS_PAGE_SIZE = 100
+# maximum number of pages of the newest projects of the owner looked through
+_COPR_PROJECTS_MAX_PAGES = 10
+_COPR_PROJECTS_CACHE_TTL = timedelta(minutes=10).seconds
+
+# (Copr URL, owner, project name prefix, number of projects) -> project names
+_copr_projects_cache: TTLCache = TTLCache(
+    maxsize=256,
+    ttl=_COPR_PROJECTS_CACHE_TTL,
+)
+_copr_projects_cache_lock = threading.Lock()
+
 
 def not_copr_race_condition(e):
     is_race_condition = "already exists" in str(e) and "400" in str(e)
@@ -37,8 +63,20 @@ def not_copr_race_condition(e):
 
 
 class CoprHelper:
-    def __init__(self, upstream_local_project: LocalProject) -> None:
+    def __init__(
+        self,
+        upstream_local_project: LocalProject,
+        projects_cache: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        Args:
+            upstream_local_project: Upstream project the Copr builds are done for.
+            projects_cache: Path to a JSON file the recent projects looked up
+                are persisted in, so that they can be shared by subsequent
+                processes.
+        """
         self.upstream_local_project = upstream_local_project
+        self.projects_cache = Path(projects_cache) if projects_cache else None
         self._copr_client = None
 
     def __repr__(self):
@@ -483,60 +521,168 @@ class CoprHelper:
         report_func: Optional[Callable] = None,
     ) -> str:
         """returns copr build state"""
-        watch_end = datetime.now() + timedelta(seconds=timeout)
-        logger.debug(f"Watching copr build {build_id}.")
-        state_reported = ""
-        while True:
-            build = self.copr_client.build_proxy.get(build_id)
-            if build.state == state_reported:
-                continue
-            state_reported = build.state
-            logger.debug(f"COPR build {build_id}, state = {state_reported}")
-            try:
-                gh_state, description = COPR2GITHUB_STATE[state_reported]
-            except KeyError as exc:
-                logger.error(f"COPR gave us an invalid state: {exc}")
-                gh_state, description = "error", "Something went wrong."
-            if report_func:
-                report_func(
-                    gh_state,
-                    description,
-                    build_id=build.id,
-                    url=self.copr_web_build_url(build),
-                )
-            if gh_state != "pending":
-                logger.debug(f"State is now {gh_state}, ending the watch.")
-                return state_reported
-            if datetime.now() > watch_end:
-                logger.error(f"The build did not finish in time ({timeout}s).")
-                report_func("error", "Build watch timeout")
-                return state_reported
-            time.sleep(10)
+        return self.watch_copr_builds(
+            build_ids=[build_id],
+            timeout=timeout,
+            report_func=report_func,
+        ).get(build_id, "")
+
+    def watch_copr_builds(
+        self,
+        build_ids: Iterable[int],
+        timeout: int,
+        report_func: Optional[Callable] = None,
+    ) -> dict[int, str]:
+        """
+        Watch multiple Copr builds at once.
+
+        Args:
+            build_ids: IDs of the Copr builds to watch.
+            timeout: Time limit of the watch in seconds.
+            report_func: Called with the GitHub-like state and description
+                (and `build_id` and `url` keyword arguments) whenever a build
+                transitions to a new state.
+
+        Returns:
+            Dictionary with the last known Copr state of each of the builds.
+        """
+        return CoprBuildWatcher(self).watch(
+            build_ids=build_ids,
+            timeout=timeout,
+            report_func=report_func,
+        )
+
+    def get_copr_projects(
+        self,
+        owner: str = "packit",
+        number_of_projects: int = 5,
+    ) -> list[str]:
+        """
+        Get names of the most recent Copr projects of this project done by packit.
+
+        Projects of the owner are listed from the newest, page by page, only until
+        enough matching projects are found or a bounded number of pages is looked
+        through. The result is cached for a while (and persisted in the projects
+        cache if set), because the newest projects change rarely compared to how
+        often it is requested.
+
+        Args:
+            owner: Owner of the Copr projects.
+            number_of_projects: Maximum number of projects to return.
+
+        Returns:
+            List of project names, the newest first.
+        """
+        prefix = (
+            f"{self.upstream_local_project.namespace}-"
+            f"{self.upstream_local_project.repo_name}-"
+        )
+        key = (
+            self.copr_client.config.get("copr_url"),
+            owner,
+            prefix,
+            number_of_projects,
+        )
+        with _copr_projects_cache_lock:
+            if (projects := _copr_projects_cache.get(key)) is not None:
+                return list(projects)
+            if (projects := self._load_persisted_projects(key)) is not None:
+                _copr_projects_cache[key] = list(projects)
+                return projects
+
+        projects = []
+        for page_number in range(_COPR_PROJECTS_MAX_PAGES):
+            page = self.copr_client.project_proxy.get_list(
+                ownername=owner,
+                pagination={
+                    "order": "id",
+                    "order_type": "DESC",
+                    "limit": _COPR_PROJECTS_PAGE_SIZE,
+                    "offset": page_number * _COPR_PROJECTS_PAGE_SIZE,
+                },
+            )
+            projects.extend(
+                project.name for project in page if project.name.startswith(prefix)
+            )
+            if (
+                len(projects) >= number_of_projects
+                or len(page) < _COPR_PROJECTS_PAGE_SIZE
+            ):
+                break
+        projects = projects[:number_of_projects]
+
+        with _copr_projects_cache_lock:
+            _copr_projects_cache[key] = list(projects)
+            self._persist_projects(key, projects)
+        return projects
+
+    def _load_persisted_projects(self, key: tuple) -> Optional[list[str]]:
+        if not self.projects_cache:
+            return None
+        try:
+            expires_at, projects = json.loads(self.projects_cache.read_text())[
+                json.dumps(key)
+            ]
+        except (KeyError, OSError, TypeError, ValueError):
+            return None
+        return projects if expires_at > time.time() else None
+
+    def _persist_projects(self, key: tuple, projects: list[str]) -> None:
+        if not self.projects_cache:
+            return
+        now = time.time()
+        try:
+            entries = json.loads(self.projects_cache.read_text())
+        except (OSError, ValueError):
+            entries = {}
+        entries = {k: v for k, v in entries.items() if v[0] > now}
+        entries[json.dumps(key)] = (now + _COPR_PROJECTS_CACHE_TTL, projects)
+        try:
+            self.projects_cache.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".{self.projects_cache.name}.",
+                dir=self.projects_cache.parent,
+            )
+        except OSError as ex:
+            logger.debug(f"Failed to save Copr projects cache: {ex!r}")
+            return
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.projects_cache)
+        except OSError as ex:
+            logger.debug(f"Failed to save Copr projects cache: {ex!r}")
+            Path(tmp).unlink(missing_ok=True)
 
     def get_copr_builds(self, number_of_builds: int = 5) -> list:
         """
         Get the copr builds of this project done by packit.
 
+        Builds of the most recent projects are listed concurrently and each listing
+        is limited to the requested number of builds.
+
         Returns:
             List of builds.
         """
-        client = CoprClient.create_from_config_file()
+        projects = self.get_copr_projects()
+        if not projects or number_of_builds <= 0:
+            return []
 
-        projects = [
-            project.name
-            for project in reversed(client.project_proxy.get_list(ownername="packit"))
-            if project.name.startswith(
-                f"{self.upstream_local_project.namespace}-{self.upstream_local_project.repo_name}-",
-            )
-        ][:5]
-
-        builds: list = []
-        for project in projects:
-            builds += client.build_proxy.get_list(
+        def get_builds(project: str) -> list:
+            return self.copr_client.build_proxy.get_list(
                 ownername="packit",
                 projectname=project,
+                pagination={"limit": number_of_builds},
             )
 
+        builds: list = []
+        with ThreadPoolExecutor(max_workers=len(projects)) as executor:
+            # keep the order of the projects
+            for project_builds in executor.map(get_builds, projects):
+                builds += project_builds
+                if len(builds) >= number_of_builds:
+                    break
+
         logger.debug("Copr builds fetched.")
         return [(build.id, build.projectname, build.state) for build in builds][
             :number_of_builds
@@ -560,7 +706,7 @@ class CoprHelper:
             ),
         )
 
-    def get_build(self, build_id: int) -> dict:
+    def get_build(self, build_id: int) -> Munch:
         """
         Get build details from Copr.
 
@@ -568,7 +714,7 @@ class CoprHelper:
             build_id: Copr build id.
 
         Returns:
-             Dict of build details.
+             Build details.
         """
         return self.copr_client.build_proxy.get(build_id)
 
@@ -628,3 +774,116 @@ class CoprHelper:
                 projectname=project,
             )
         return set(copr_project.chroot_repos.keys())
+
+
+class CoprBuildWatcher:
+    """
+    Watch multiple Copr builds using a single Copr client.
+
+    The builds which haven't finished yet are queried in rounds. The delay
+    between the rounds grows exponentially (with jitter) while none of the builds
+    changes its state and drops back to the initial interval on any transition.
+    """
+
+    def __init__(
+        self,
+        copr_helper: CoprHelper,
+        initial_interval: float = _WATCH_INITIAL_INTERVAL,
+        max_interval: float = _WATCH_MAX_INTERVAL,
+    ) -> None:
+        self.copr_helper = copr_helper
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Get the delay before the next round of queries.
+
+        Args:
+            attempt: Number of consecutive rounds without any state transition.
+
+        Returns:
+            Delay in seconds, randomized in the upper half of the backoff interval
+            so that many watchers don't query Copr in lockstep.
+        """
+        delay = min(self.max_interval, self.initial_interval * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def watch(
+        self,
+        build_ids: Iterable[int],
+        timeout: int,
+        report_func: Optional[Callable] = None,
+    ) -> dict[int, str]:
+        """
+        Watch the given builds until all of them finish or the timeout is reached.
+
+        Args:
+            build_ids: IDs of the Copr builds to watch.
+            timeout: Time limit of the watch in seconds.
+            report_func: Called only when a build transitions to a new state.
+
+        Returns:
+            Dictionary with the last known Copr state of each of the builds.
+        """
+        watch_end = datetime.now() + timedelta(seconds=timeout)
+        pending = set(build_ids)
+        logger.debug(f"Watching copr builds {sorted(pending)}.")
+        states: dict[int, str] = {}
+        attempt = 0
+        while pending:
+            changed = False
+            for build_id in sorted(pending):
+                try:
+                    build = self.copr_helper.get_build(build_id)
+                except CoprException as ex:
+                    logger.warning(f"Failed to get the state of build {build_id}: {ex}")
+                    continue
+                if build.state == states.get(build_id):
+                    continue
+
+                changed = True
+                states[build_id] = build.state
+                logger.debug(f"COPR build {build_id}, state = {build.state}")
+                try:
+                    gh_state, description = COPR2GITHUB_STATE[build.state]
+                except KeyError as exc:
+                    logger.error(f"COPR gave us an invalid state: {exc}")
+                    gh_state, description = "error", "Something went wrong."
+                if report_func:
+                    report_func(
+                        gh_state,
+                        description,
+                        build_id=build.id,
+                        url=self.copr_helper.copr_web_build_url(build),
+                    )
+                if gh_state != "pending":
+                    logger.debug(
+                        f"State of build {build_id} is now {gh_state}, "
+                        "ending the watch of the build.",
+                    )
+                    pending.discard(build_id)
+
+            if not pending:
+                break
+            remaining = (watch_end - datetime.now()).total_seconds()
+            if remaining <= 0:
+                logger.error(
+                    f"The builds {sorted(pending)} did not finish in time ({timeout}s).",
+                )
+                if report_func:
+                    for build_id in sorted(pending):
+                        report_func(
+                            "error",
+                            "Build watch timeout",
+                            build_id=build_id,
+                            url=self.copr_helper.copr_web_build_url(
+                                Munch(id=build_id),
+                            ),
+                        )
+                break
+
+            attempt = 0 if changed else attempt + 1
+            time.sleep(min(self.get_delay(attempt), remaining))
+
+        return states
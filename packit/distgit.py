@@ -5,6 +5,7 @@ import logging
 import re
 import tempfile
 from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from pathlib import Path
 from typing import Optional, Union
@@ -26,7 +27,11 @@ from packit.config import (
     PackageConfig,
     get_local_package_config,
 )
-from packit.constants import DEFAULT_BODHI_UPDATE_TYPE, EXISTING_BODHI_UPDATE_REGEX
+from packit.constants import (
+    DEFAULT_BODHI_UPDATE_TYPE,
+    EXISTING_BODHI_UPDATE_REGEX,
+    LOOKASIDE_WORKERS,
+)
 from packit.exceptions import (
     PackitBodhiException,
     PackitConfigException,
@@ -36,7 +41,7 @@ from packit.local_project import CALCULATE, LocalProject, LocalProjectBuilder
 from packit.pkgtool import PkgTool
 from packit.utils import commands
 from packit.utils.bodhi import get_bodhi_client
-from packit.utils.koji_helper import KojiHelper
+from packit.utils.koji_helper import KojiHelper, get_metadata_cache
 from packit.utils.lookaside import LookasideCache
 
 logger = logging.getLogger(__name__)
@@ -86,6 +91,10 @@ class DistGit(PackitRepositoryBase):
         self.fas_user = self.config.fas_user
         self._downstream_config: Optional[PackageConfig] = None
         self._clone_path: Optional[str] = clone_path
+        self._lookaside_cache: Optional[LookasideCache] = None
+        self._lookaside_cache_tool: Optional[str] = None
+        self._koji_helper: Optional[KojiHelper] = None
+        self.fetch_before_update = True
 
     def __repr__(self):
         return (
@@ -191,6 +200,23 @@ class DistGit(PackitRepositoryBase):
         """Returns the packaging tool. Prefers the package-level override."""
         return self.package_config.pkg_tool or self.config.pkg_tool
 
+    @property
+    def lookaside_cache(self) -> LookasideCache:
+        """Lookaside cache client for the packaging tool, reused across calls."""
+        if self._lookaside_cache is None or self._lookaside_cache_tool != self.pkg_tool:
+            self._lookaside_cache = LookasideCache(self.pkg_tool)
+            self._lookaside_cache_tool = self.pkg_tool
+        return self._lookaside_cache
+
+    @property
+    def koji_helper(self) -> KojiHelper:
+        """Koji helper using the configured metadata cache."""
+        if self._koji_helper is None:
+            self._koji_helper = KojiHelper(
+                metadata_cache=get_metadata_cache(self.config.koji_metadata_cache),
+            )
+        return self._koji_helper
+
     def clone_package(
         self,
         target_path: Union[Path, str],
@@ -254,7 +280,8 @@ class DistGit(PackitRepositoryBase):
         """
         logger.debug(f"About to update branch {branch_name!r}.")
         origin = self.local_project.git_repo.remote("origin")
-        origin.fetch()
+        if self.fetch_before_update:
+            origin.fetch()
         try:
             head = self.local_project.git_repo.heads[branch_name]
         except IndexError as e:
@@ -294,6 +321,30 @@ class DistGit(PackitRepositoryBase):
             f"About to {'force ' if force else ''}push changes to branch {branch_name!r} "
             f"of a fork {fork_remote_name!r} of the dist-git repo.",
         )
+        self.ensure_fork_remote(fork_remote_name=fork_remote_name, sync_acls=sync_acls)
+
+        try:
+            self.push(refspec=branch_name, remote_name=fork_remote_name, force=force)
+        except git.GitError as ex:
+            msg = (
+                f"Unable to push to remote fork {fork_remote_name!r} using branch {branch_name!r}, "
+                f"the error is:\n{ex}"
+            )
+            raise PackitException(msg) from ex
+
+    def ensure_fork_remote(
+        self,
+        fork_remote_name: str = "fork",
+        sync_acls: bool = False,
+    ) -> None:
+        """
+        Make sure there is a remote pointing to a fork of the dist-git repo,
+        create the fork if needed.
+
+        Args:
+            fork_remote_name: local name of the remote
+            sync_acls: whether to sync the ACLs of the original repo and the fork
+        """
         if fork_remote_name not in [
             remote.name for remote in self.local_project.git_repo.remotes
         ]:
@@ -315,15 +366,6 @@ class DistGit(PackitRepositoryBase):
                 url=fork_urls["ssh"],
             )
 
-        try:
-            self.push(refspec=branch_name, remote_name=fork_remote_name, force=force)
-        except git.GitError as ex:
-            msg = (
-                f"Unable to push to remote fork {fork_remote_name!r} using branch {branch_name!r}, "
-                f"the error is:\n{ex}"
-            )
-            raise PackitException(msg) from ex
-
     def create_pull(
         self,
         pr_title: str,
@@ -498,11 +540,38 @@ class DistGit(PackitRepositoryBase):
             `True`, if archive is present in the lookaside cache, `False`
             otherwise.
         """
-        return LookasideCache(self.pkg_tool).is_archive_uploaded(
+        return self.lookaside_cache.is_archive_uploaded(
             self.package_config.downstream_package_name,
             archive_path,
         )
 
+    def are_archives_in_lookaside_cache(
+        self,
+        archive_paths: list[Path],
+    ) -> dict[Path, bool]:
+        """
+        Check which of the archives are already uploaded to the lookaside cache.
+        The archives are checked concurrently.
+
+        Args:
+            archive_paths: Paths to the archives.
+
+        Returns:
+            Dict mapping archive paths to `True`, if the archive is present
+            in the lookaside cache, `False` otherwise.
+        """
+        if not archive_paths:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(LOOKASIDE_WORKERS, len(archive_paths)),
+        ) as executor:
+            return dict(
+                zip(
+                    archive_paths,
+                    executor.map(self.is_archive_in_lookaside_cache, archive_paths),
+                ),
+            )
+
     def purge_unused_git_branches(self):
         # TODO: remove branches from merged PRs
         raise NotImplementedError("not implemented yet")
@@ -528,13 +597,10 @@ class DistGit(PackitRepositoryBase):
             cmd.append("--scratch")
         if nowait:
             cmd.append("--nowait")
-        if koji_target:
-            cmd.append(koji_target)
-        else:
-            branch = self.local_project.git_repo.active_branch.name
-            cmd.append(
-                "rawhide" if branch in ("rawhide", "main") else f"{branch}-candidate",
-            )
+        cmd.append(
+            koji_target
+            or self.get_koji_target(self.local_project.git_repo.active_branch.name),
+        )
         url = self.local_project.git_project.get_git_urls()["git"]
         ref = next(self.local_project.git_repo.iter_commits()).hexsha
         cmd.append(f"git+{url}#{ref}")
@@ -546,12 +612,26 @@ class DistGit(PackitRepositoryBase):
         ).stdout
 
     @staticmethod
-    def get_latest_build_for_branch(downstream_package_name, dist_git_branch):
+    def get_koji_target(dist_git_branch: str) -> str:
+        """Returns the default Koji target for builds from a dist-git branch."""
+        return (
+            "rawhide"
+            if dist_git_branch in ("rawhide", "main")
+            else f"{dist_git_branch}-candidate"
+        )
+
+    @staticmethod
+    def get_latest_build_for_branch(
+        downstream_package_name,
+        dist_git_branch,
+        koji_helper: Optional[KojiHelper] = None,
+    ):
         """Queries Koji for the latest build of a package for a dist-git branch.
 
         Args:
             downstream_package_name: Downstream package name.
             dist_git_branch: Associated dist-git branch.
+            koji_helper: Koji helper to use, a new one by default.
 
         Returns:
             NVR of the latest build found.
@@ -565,7 +645,7 @@ class DistGit(PackitRepositoryBase):
             f"for dist-git-branch {dist_git_branch!r}",
         )
 
-        koji_helper = KojiHelper()
+        koji_helper = koji_helper or KojiHelper()
         if not (tag := koji_helper.get_candidate_tag(dist_git_branch)):
             raise PackitException(f"Failed to get candidate tag for {dist_git_branch}")
         build = koji_helper.get_latest_nvr_in_tag(downstream_package_name, tag)
@@ -586,6 +666,7 @@ class DistGit(PackitRepositoryBase):
     def get_changelog_since_latest_stable_build(
         package: str,
         nvr: str,
+        koji_helper: Optional[KojiHelper] = None,
     ) -> Optional[str]:
         """
         Retrieves changelog diff between the latest stable (tagged for a release)
@@ -594,30 +675,32 @@ class DistGit(PackitRepositoryBase):
         Args:
             package: Downstream package name.
             nvr: NVR of a build for which to get changelog diff.
+            koji_helper: Koji helper to use, a new one by default.
 
         Returns:
             Changelog diff as a string or None if it wasn't possible to retrieve it.
         """
-        koji_helper = KojiHelper()
+        koji_helper = koji_helper or KojiHelper()
         stable_tags = []
         for tag in koji_helper.get_build_tags(nvr):
             stable_tags = koji_helper.get_stable_tags(tag)
             if stable_tags:
                 break
-        latest_stable_nvr = None
-        for tag in stable_tags:
-            build = koji_helper.get_latest_nvr_in_tag(package, tag)
-            if build:
-                latest_stable_nvr = build
-                break
+        # query all the stable tags at once and pick the first one with a build
+        builds = koji_helper.get_latest_builds_in_tags(
+            (package, tag) for tag in stable_tags
+        )
+        latest_stable_nvr = next(
+            (b["nvr"] for tag in stable_tags if (b := builds[(package, tag)])),
+            None,
+        )
         if not latest_stable_nvr or latest_stable_nvr == nvr:
             return None
-        changelog = koji_helper.get_build_changelog(latest_stable_nvr)
-        if not changelog:
+        changelogs = koji_helper.get_builds_changelogs([latest_stable_nvr, nvr])
+        if not changelogs[latest_stable_nvr]:
             return None
-        since = changelog[0][0]
-        changelog = koji_helper.get_build_changelog(nvr)
-        return koji_helper.format_changelog(changelog, since)
+        since = changelogs[latest_stable_nvr][0][0]
+        return koji_helper.format_changelog(changelogs[nvr], since)
 
     def create_bodhi_update(
         self,
@@ -661,6 +744,7 @@ class DistGit(PackitRepositoryBase):
                 self.get_latest_build_for_branch(
                     self.package_config.downstream_package_name,
                     dist_git_branch=dist_git_branch,
+                    koji_helper=self.koji_helper,
                 ),
             ]
 
@@ -675,7 +759,11 @@ class DistGit(PackitRepositoryBase):
             rendered_note = f"Automatic update for {builds}."
             for nvr in koji_builds:
                 package = NEVR.from_string(nvr).name
-                changelog = self.get_changelog_since_latest_stable_build(package, nvr)
+                changelog = self.get_changelog_since_latest_stable_build(
+                    package,
+                    nvr,
+                    koji_helper=self.koji_helper,
+                )
                 if changelog:
                     rendered_note += (
                         f"\n\n##### **Changelog for {package}**\n\n```\n"
@@ -19,6 +19,7 @@ from ogr.parsing import parse_git_repo
 from packit.constants import LP_TEMP_PR_CHECKOUT_NAME
 from packit.exceptions import PackitException, PackitMergeException
 from packit.utils.repo import (
+    GitObjectReader,
     RepositoryCache,
     get_repo,
     is_git_repo,
@@ -165,6 +166,14 @@ class LocalProject:
         """
         return self._git_repo
 
+    @property
+    def git_objects(self) -> Optional[GitObjectReader]:
+        """
+        Reader of git objects (blobs, commits, refs) of the repository shared
+        by all its users, backed by a long-lived `git cat-file --batch` process.
+        """
+        return GitObjectReader.for_repo(self.git_repo) if self.git_repo else None
+
     @property
     def ref(self) -> Optional[str]:
         """
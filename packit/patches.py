@@ -8,7 +8,6 @@ import datetime
 import email
 import logging
 import re
-import tempfile
 from itertools import islice
 from pathlib import Path
 from typing import Optional
@@ -20,10 +19,20 @@ from packit.constants import DATETIME_FORMAT, PATCH_META_TRAILER_TOKENS
 from packit.exceptions import PackitException, PackitGitException
 from packit.local_project import LocalProject
 from packit.utils.commands import run_command
-from packit.utils.repo import get_metadata_from_message, git_patch_ish, is_a_git_ref
+from packit.utils.repo import (
+    GitObjectReader,
+    get_metadata_from_message,
+    git_patch_ids,
+    git_patch_ish,
+    is_a_git_ref,
+)
 
 logger = logging.getLogger(__name__)
 
+FORMAT_PATCH_HEADER_RE = re.compile(rb"From ([0-9a-f]{40}|[0-9a-f]{64}) ")
+# lines starting with these are always considered trailers by git
+GIT_GENERATED_TRAILER_PREFIXES = ("Signed-off-by: ", "(cherry picked from commit ")
+
 
 def git_format_patch(
     working_dir: Path,
@@ -63,20 +72,189 @@ def git_format_patch(
     ).stdout.strip()
 
 
-def git_interpret_trailers(patch: str) -> str:
-    """Run 'git interpret-trailers' on 'patch' and return the output.
+def get_commit_hexsha_from_patch(patch_content: bytes) -> Optional[str]:
+    """Get hexsha of the commit a patch was created from.
+
+    Patch files generated by 'git format-patch' start with the
+    'From <hexsha> Mon Sep 17 00:00:00 2001' header.
+
+    Args:
+        patch_content: Content of the patch file.
+
+    Returns:
+        The hexsha or None if the patch doesn't start with the header.
+    """
+    match = FORMAT_PATCH_HEADER_RE.match(patch_content)
+    return match.group(1).decode() if match else None
+
+
+def _find_trailer_separator(line: str) -> int:
+    """Find the position of the trailer separator the same way git does.
 
-    We don't use --parse/--unfold to unfold multiline values per RFC822
-    because we use YAML block scalars for multiline trailer values.
+    The token can consist of alphanumeric characters and hyphens only,
+    optionally followed by whitespace before the separator.
 
     Args:
-        patch: Path of the patch.
+        line: Line to look into.
+
+    Returns:
+        Position of the separator or -1 if the line is not a trailer.
+    """
+    whitespace_found = False
+    for i, char in enumerate(line):
+        if char == ":":
+            return i
+        if not whitespace_found and (
+            (char.isascii() and char.isalnum()) or char == "-"
+        ):
+            continue
+        if i != 0 and char in " \t":
+            whitespace_found = True
+            continue
+        break
+    return -1
+
+
+def _find_end_of_message(lines: list[str], divider: bool) -> int:
+    """Find the end of the commit message, excluding the patch (if any)
+    and trailing comments, blank lines and the old 'Conflicts:' block.
+    """
+    end = len(lines)
+    if divider:
+        for i, line in enumerate(lines):
+            if line.startswith("---") and line[3:4].isspace():
+                end = i
+                break
+
+    beginning_of_comments = None
+    in_conflicts_block = False
+    for i, line in enumerate(lines[:end]):
+        if line.startswith("#") or line in ("\n", ""):
+            if beginning_of_comments is None:
+                beginning_of_comments = i
+        elif line == "Conflicts:\n":
+            in_conflicts_block = True
+            if beginning_of_comments is None:
+                beginning_of_comments = i
+        elif in_conflicts_block and line.startswith("\t"):
+            # a path in the conflicts block
+            continue
+        else:
+            beginning_of_comments = None
+            in_conflicts_block = False
+    return end if beginning_of_comments is None else beginning_of_comments
+
+
+def _find_trailer_block_start(lines: list[str], end: int) -> int:
+    """Find where the trailer block starts, following the rules of git.
+
+    The trailer block is the last paragraph of the message (not the title),
+    consisting of trailers and their continuation lines only, or of at least
+    25% trailers if there is a git-generated one among them.
 
     Returns:
-        The output of the command.
+        Index of the first line of the trailer block or `end` if there is none.
     """
-    cmd = ["git", "interpret-trailers", "--only-input", "--only-trailers", patch]
-    return run_command(cmd=cmd, cwd=Path.cwd(), output=True).stdout
+    end_of_title = end
+    for i, line in enumerate(lines[:end]):
+        if line.startswith("#"):
+            continue
+        if not line.strip():
+            end_of_title = i
+            break
+
+    only_spaces = True
+    recognized_prefix = False
+    trailer_lines = non_trailer_lines = possible_continuation_lines = 0
+    for i in range(end - 1, end_of_title - 1, -1):
+        line = lines[i]
+        if line.startswith("#"):
+            non_trailer_lines += possible_continuation_lines
+            possible_continuation_lines = 0
+            continue
+        if not line.strip():
+            if only_spaces:
+                continue
+            non_trailer_lines += possible_continuation_lines
+            if (recognized_prefix and trailer_lines * 3 >= non_trailer_lines) or (
+                trailer_lines and not non_trailer_lines
+            ):
+                return i + 1
+            return end
+        only_spaces = False
+
+        if line.startswith(GIT_GENERATED_TRAILER_PREFIXES):
+            trailer_lines += 1
+            possible_continuation_lines = 0
+            recognized_prefix = True
+        elif _find_trailer_separator(line) >= 1 and not line[0].isspace():
+            trailer_lines += 1
+            possible_continuation_lines = 0
+        elif line[0].isspace():
+            possible_continuation_lines += 1
+        else:
+            non_trailer_lines += 1 + possible_continuation_lines
+            possible_continuation_lines = 0
+    return end
+
+
+def get_git_trailers(message: str, divider: bool = True) -> str:
+    """Get git trailers from a commit message or a patch, in-process.
+
+    Follows the rules of 'git interpret-trailers --only-input --only-trailers'
+    and produces the same output: each trailer is normalized to 'Token: value'
+    on its own line, continuation lines of multiline values are preserved as they
+    are (not unfolded), because we use YAML block scalars for multiline trailer
+    values.
+
+    Args:
+        message: Commit message or content of a patch file.
+        divider: Treat a line starting with '---' as the start of the patch,
+            the message ends there.
+
+    Returns:
+        The trailers, one per line.
+    """
+    lines = message.splitlines(keepends=True)
+    end = _find_end_of_message(lines, divider)
+    start = _find_trailer_block_start(lines, end)
+
+    # join continuation lines with the line they belong to
+    items: list[str] = []
+    last: Optional[int] = None
+    for line in lines[start:end]:
+        if last is not None and line[0].isspace():
+            items[last] += line
+            continue
+        items.append(line)
+        last = len(items) - 1 if _find_trailer_separator(line) >= 1 else None
+
+    trailers = ""
+    for item in items:
+        separator = _find_trailer_separator(item)
+        if separator < 1:
+            continue
+        trailers += f"{item[:separator].strip()}: {item[separator + 1 :].strip()}\n"
+    return trailers
+
+
+def git_log_trailers(repo: git.Repo, revision_range: str) -> dict[str, str]:
+    """Get git trailers of all commits in a revision range with a single git call.
+
+    Args:
+        repo: Git repository.
+        revision_range: Commits to read the trailers of, see `man git-log`.
+
+    Returns:
+        Dictionary: commit hexsha -> trailers, in the same format as returned
+        by get_git_trailers().
+    """
+    output = repo.git.log("--format=%x00%H%n%(trailers:only)", revision_range)
+    trailers = {}
+    for entry in output.split("\0")[1:]:
+        hexsha, _, commit_trailers = entry.partition("\n")
+        trailers[hexsha] = commit_trailers.strip()
+    return trailers
 
 
 def remove_prefixes(patch: Path):
@@ -119,7 +297,29 @@ def commit_message(
     Returns:
         The commit message: subject and body, separated by an empty line.
     """
-    message = email.message_from_bytes(patch.read_bytes())
+    return commit_message_from_bytes(
+        patch.read_bytes(),
+        strip_subject_prefix=strip_subject_prefix,
+        strip_trailers=strip_trailers,
+    )
+
+
+def commit_message_from_bytes(
+    content: bytes,
+    strip_subject_prefix: Optional[str] = None,
+    strip_trailers: Optional[str] = None,
+) -> str:
+    """Read the commit message from the content of a file, see commit_message().
+
+    Args:
+        content: Content of a commit message file or of a patch file.
+        strip_subject_prefix: Strip this prefix from subject lines.
+        strip_trailers: Strip these trailer lines from the end of the commit message.
+
+    Returns:
+        The commit message: subject and body, separated by an empty line.
+    """
+    message = email.message_from_bytes(content)
     subject = message["Subject"]
     payload = message.get_payload()
 
@@ -289,31 +489,72 @@ class PatchMetadata:
         )
 
     @staticmethod
-    def from_git_trailers(commit: git.Commit) -> "PatchMetadata":
+    def from_git_trailers(
+        commit: git.Commit,
+        trailers: Optional[str] = None,
+    ) -> "PatchMetadata":
         """Read patch metadata from a commit's git trailers
 
         Args:
             commit: Commit object to read patch metadata from.
+            trailers: Git trailers of the commit, if already known
+                (see git_log_trailers()), parsed from the commit message otherwise.
 
         Returns:
             Patch metadata read.
         """
-        with tempfile.NamedTemporaryFile(mode="w+t") as fp:
-            fp.write(commit.message)
-            fp.flush()
-            return PatchMetadata.from_patch(fp.name)
+        message = commit.message
+        if isinstance(message, bytes):
+            # GitPython keeps the message undecoded if it's not valid in its encoding
+            message = message.decode(errors="surrogateescape")
+        if trailers is None:
+            trailers = get_git_trailers(message)
+        return PatchMetadata._from_trailers(
+            content=message.encode(errors="surrogateescape"),
+            trailers=trailers,
+        )
 
     @staticmethod
-    def from_patch(patch: str) -> "PatchMetadata":
+    def from_patch(patch: str, trailers: Optional[str] = None) -> "PatchMetadata":
         """Read patch metadata by parsing Git trailers from a patch file.
 
         Args:
             patch: Path of a patch file.
+            trailers: Git trailers of the commit the patch was created from,
+                if already known (see git_log_trailers()), parsed from
+                the patch file otherwise.
+
+        Returns:
+            A PatchMetadata object.
+        """
+        patch_path = Path(patch)
+        content = patch_path.read_bytes()
+        if trailers is None:
+            trailers = get_git_trailers(content.decode(errors="surrogateescape"))
+        return PatchMetadata._from_trailers(
+            content=content,
+            trailers=trailers,
+            patch_path=patch_path,
+        )
+
+    @staticmethod
+    def _from_trailers(
+        content: bytes,
+        trailers: str,
+        patch_path: Optional[Path] = None,
+    ) -> "PatchMetadata":
+        """Create PatchMetadata from git trailers.
+
+        Args:
+            content: Content of the commit message or of the patch file,
+                used to get the description if not defined by the trailers.
+            trailers: Git trailers, one per line.
+            patch_path: Path of the patch file, if any.
 
         Returns:
             A PatchMetadata object.
         """
-        trailers = git_interpret_trailers(patch).strip()
+        trailers = trailers.strip()
         trailer = ""
         metadata = {}
         for line in trailers.splitlines():
@@ -329,14 +570,14 @@ class PatchMetadata:
                 trailer += line + "\n"
         metadata.update(yaml.safe_load(trailer) or {})
 
-        patch_path = Path(patch)
-        description = metadata.get("Patch-status") or commit_message(
-            patch_path,
+        description = metadata.get("Patch-status") or commit_message_from_bytes(
+            content,
             strip_subject_prefix="PATCH",
             strip_trailers=trailers,
         )
         return PatchMetadata(
-            name=metadata.get("Patch-name") or patch_path.name,
+            name=metadata.get("Patch-name")
+            or (patch_path.name if patch_path else None),
             path=patch_path,
             description=description.strip(),
             present_in_specfile=metadata.get("Patch-present-in-specfile", False),
@@ -488,20 +729,27 @@ class PatchGenerator:
         """
         Pair commits (in a source-git repo) with a list patches generated with git-format-patch.
 
-        Pairing is done using commit.hexsha (which is always present in the patch file).
+        Pairing is done using commit.hexsha (which is always present
+        in the 'From <hexsha>' header of the patch file).
 
         patch_list (provided List) is then mutated by appending PatchMetadata using
         the paired information: commit and a path to the patch file.
 
-        :param patches: Dict: commit hexsha -> patch content
+        :param patches: Dict: patch file name -> patch content
         :param commits: list of commits we created the patches from
         :param destination: place the patch files here
         :param files_to_ignore: list of files to ignore when creating patches
         """
+        patch_names_by_commit: dict[str, str] = {}
+        for patch_name, patch_content in patches.items():
+            hexsha = get_commit_hexsha_from_patch(patch_content)
+            if hexsha:
+                patch_names_by_commit.setdefault(hexsha, patch_name)
+        empty_commits = self.get_empty_commits(commits)
+
         patch_list: list[PatchMetadata] = []
         for commit in commits:
-            # commit.size doesn't work since even an empty commit is size > 0 (287)
-            if not commit.stats.files:
+            if commit.hexsha in empty_commits:
                 # this patch is empty - rpmbuild is okay with empty patches (!)
                 logger.debug(f"commit {commit} is empty")
                 patch = PatchMetadata.from_commit(commit=commit)
@@ -521,64 +769,108 @@ class PatchGenerator:
                 Path(destination).joinpath(patch.name).write_text("")
                 logger.info(f"created empty patch {patch.path}")
                 continue
-            for patch_name, patch_content in patches.items():
+
+            patch_name = patch_names_by_commit.get(commit.hexsha)
+            if not patch_name:
                 # `git format-patch` usually creates one patch for a merge commit,
                 # so some commits won't be covered by a dedicated patch file
-                if commit.hexsha.encode() in patch_content:
-                    path = Path(patch_name)
-                    patch_metadata = PatchMetadata.from_commit(
-                        commit=commit,
-                        patch_path=path,
-                    )
+                continue
+            path = Path(patch_name)
+            patch_metadata = PatchMetadata.from_commit(
+                commit=commit,
+                patch_path=path,
+            )
 
-                    if patch_metadata.ignore:
-                        logger.debug(
-                            f"[IGNORED: {patch_metadata.name}] {commit.summary}",
-                        )
-                    else:
-                        logger.debug(f"[{patch_metadata.name}] {commit.summary}")
-                        if patch_metadata.no_prefix:
-                            # Sadly, we have work to do, the original patch is no good:
-                            # 'format-patch' by default generates patches with prefixes a/ and b/.
-                            # 'no-prefix' means we don't want those: we need to delete and re-create
-                            # the patch without the prefixes.
-                            # https://github.com/packit/dist-git-to-source-git/issues/85#issuecomment-698827925
-                            path.unlink()
-                            git_f_p_out = git_format_patch(
-                                self.lp.working_dir,
-                                destination,
-                                files_to_ignore,
-                                f"{commit}^..{commit}",
-                                no_prefix=True,
-                            )
-                            patch_list.append(
-                                PatchMetadata.from_commit(
-                                    commit=commit,
-                                    patch_path=Path(git_f_p_out),
-                                ),
-                            )
-                        else:
-                            patch_list.append(patch_metadata)
-                    break
+            if patch_metadata.ignore:
+                logger.debug(
+                    f"[IGNORED: {patch_metadata.name}] {commit.summary}",
+                )
+            else:
+                logger.debug(f"[{patch_metadata.name}] {commit.summary}")
+                if patch_metadata.no_prefix:
+                    # Sadly, we have work to do, the original patch is no good:
+                    # 'format-patch' by default generates patches with prefixes a/ and b/.
+                    # 'no-prefix' means we don't want those: we need to delete and re-create
+                    # the patch without the prefixes.
+                    # https://github.com/packit/dist-git-to-source-git/issues/85#issuecomment-698827925
+                    path.unlink()
+                    git_f_p_out = git_format_patch(
+                        self.lp.working_dir,
+                        destination,
+                        files_to_ignore,
+                        f"{commit}^..{commit}",
+                        no_prefix=True,
+                    )
+                    patch_list.append(
+                        PatchMetadata.from_commit(
+                            commit=commit,
+                            patch_path=Path(git_f_p_out),
+                        ),
+                    )
+                else:
+                    patch_list.append(patch_metadata)
         return patch_list
 
+    def get_empty_commits(self, commits: list[git.Commit]) -> set[str]:
+        """
+        Find commits which don't change any file, using a single git call.
+
+        commit.size doesn't work since even an empty commit is size > 0 (287)
+        and commit.stats runs a separate git diff for every commit.
+
+        Args:
+            commits: Commits to check.
+
+        Returns:
+            Set of hexshas of the empty commits.
+        """
+        if not commits:
+            return set()
+        # each commit starts with a NUL byte followed by its hexsha,
+        # numstat lines of the changed files (if any) follow
+        output = self.lp.git_repo.git.log(
+            "--no-walk=unsorted",
+            "--format=%x00%H",
+            "--numstat",
+            "--no-renames",
+            # compare merge commits with their first parent, the same as commit.stats
+            "-m",
+            "--first-parent",
+            *(commit.hexsha for commit in commits),
+        )
+        empty_commits = set()
+        for entry in output.split("\0")[1:]:
+            hexsha, _, numstat = entry.partition("\n")
+            if not numstat.strip():
+                empty_commits.add(hexsha.strip())
+        return empty_commits
+
     def process_patches_with_trailers(
         self,
         patches: list[str],
+        trailers: Optional[dict[str, str]] = None,
     ) -> tuple[list[PatchMetadata], bool]:
         """Collect and return patch metadata stored in Git trailers.
 
         Args:
             patches: List of patch paths as produced by 'git format-patch'
                 with the '--output-directory' option.
+            trailers: Git trailers of the commits the patches were created from
+                (commit hexsha -> trailers) as returned by git_log_trailers().
+                Trailers of patches not found there are parsed from the patch files.
 
         Returns:
             A list of PatchMetadata objects and a flag to indicate whether any metadata
             stored in Git trailers was found or not.
         """
-        patch_list: list[PatchMetadata] = [
-            PatchMetadata.from_patch(patch) for patch in patches
-        ]
+        trailers = trailers or {}
+        patch_list: list[PatchMetadata] = []
+        for patch in patches:
+            with open(patch, "rb") as fp:
+                hexsha = get_commit_hexsha_from_patch(fp.readline())
+            patch_list.append(
+                PatchMetadata.from_patch(patch, trailers=trailers.get(hexsha)),
+            )
         used_git_trailers = any(patch.metadata_defined for patch in patch_list)
         if used_git_trailers:
             patch_list = [patch for patch in patch_list if not patch.ignore]
@@ -761,38 +1053,49 @@ class PatchGenerator:
         :param repo: Git repo to work in.
         :return: A filtered list of patches, with identical patches removed.
         """
-        ret: list[PatchMetadata] = []
+        untracked_files = set(repo.untracked_files)
+        # previous versions are read through a persistent 'git cat-file --batch'
+        git_objects = GitObjectReader.for_repo(repo)
+        to_compare: list[tuple[PatchMetadata, Path]] = []
+        # previous and current versions of the patches, alternating
+        patches: list[bytes] = []
         for patch in patch_list:
             relative_patch_path = patch.path.relative_to(repo.working_dir)
             logger.debug(f"Processing {relative_patch_path} ...")
-            new_patch = str(relative_patch_path) in repo.untracked_files
-            if new_patch:
+            if (
+                str(relative_patch_path) in untracked_files
+                or (prev_patch := git_objects.read_blob(f"HEAD:{relative_patch_path}"))
+                is None
+            ):
                 logger.debug(f"{relative_patch_path} is a new patch")
-                ret.append(patch)
                 continue
-
-            # patch-id before the change
-            prev_patch = repo.git.show(f"HEAD:{relative_patch_path}")
-            prev_patch = git_patch_ish(prev_patch)
+            to_compare.append((patch, relative_patch_path))
             # We can't know the encoding of the patch.
             # https://docs.python.org/3/howto/unicode.html#files-in-an-unknown-encoding
-            with tempfile.TemporaryFile(mode="w+", errors="surrogateescape") as fp:
-                fp.write(prev_patch)
-                fp.seek(0)
-                prev_patch_id = repo.git.patch_id("--stable", istream=fp).split()[0]
-                logger.debug(f"Previous patch-id: {prev_patch_id}")
-
-            # current patch-id
-            with open(patch.path) as fp:
-                current_patch_id = repo.git.patch_id("--stable", istream=fp).split()[0]
-                logger.debug(f"Current patch-id: {current_patch_id}")
-
-            if current_patch_id != prev_patch_id:
-                ret.append(patch)
-            else:
-                # this looks the same, don't change it
-                repo.git.checkout("--", relative_patch_path)
-        return ret
+            prev_patch = git_patch_ish(
+                prev_patch.decode(errors="surrogateescape"),
+            ).encode(errors="surrogateescape")
+            patches += [prev_patch, patch.path.read_bytes()]
+        patch_ids = git_patch_ids(repo, patches)
+
+        identical: list[Path] = []
+        for index, (_patch, relative_patch_path) in enumerate(to_compare):
+            prev_patch_id, current_patch_id = patch_ids[2 * index : 2 * index + 2]
+            logger.debug(
+                f"{relative_patch_path}: previous patch-id: {prev_patch_id}, "
+                f"current patch-id: {current_patch_id}",
+            )
+            if current_patch_id and current_patch_id == prev_patch_id:
+                identical.append(relative_patch_path)
+
+        if identical:
+            # these look the same, don't change them
+            repo.git.checkout("--", *identical)
+        return [
+            patch
+            for patch in patch_list
+            if patch.path.relative_to(repo.working_dir) not in identical
+        ]
 
     def create_patches(
         self,
@@ -834,6 +1137,7 @@ class PatchGenerator:
             commits = self.get_commits_in_range(patches_revision_range)
             patch_list, used_git_trailers = self.process_patches_with_trailers(
                 list(patches),
+                trailers=git_log_trailers(self.lp.git_repo, patches_revision_range),
             )
             if not used_git_trailers:
                 patch_list = self.process_patches(
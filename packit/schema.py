@@ -981,7 +981,21 @@ class UserConfigSchema(Schema):
     pkg_tool = fields.String()
     repository_cache = fields.String(dump_default=None)
     add_repositories_to_repository_cache = fields.Bool(dump_default=True)
+    repository_cache_refresh_interval = fields.Integer(load_default=None)
+    repository_cache_size_limit = fields.Integer(load_default=None)
+    source_cache = fields.String(dump_default=None)
+    source_cache_size_limit = fields.Integer(load_default=None)
+    gpg_keyring_cache = fields.String(dump_default=None)
+    gpg_keyring_cache_refresh_interval = fields.Integer(load_default=None)
+    archive_cache = fields.String(dump_default=None)
+    archive_cache_size_limit = fields.Integer(load_default=None)
+    archive_compression_threads = fields.Integer(load_default=None)
+    srpm_cache = fields.String(dump_default=None)
+    srpm_cache_size_limit = fields.Integer(load_default=None)
+    copr_projects_cache = fields.String(dump_default=None)
+    koji_metadata_cache = fields.String(dump_default=None)
     default_parse_time_macros = fields.Dict(load_default=None)
+    package_jobs = fields.Integer(load_default=1)
 
     @post_load
     def make_instance(self, data, **kwargs):
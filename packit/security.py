@@ -5,13 +5,21 @@
 This module contains code related to security, signing and verification.
 """
 
+import json
 import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
-from typing import Optional
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
 
 import git
+import requests
 from gnupg import GPG, ListKeys
 
+from packit.constants import GPG_KEYRING_CACHE_REFRESH_INTERVAL, KEYSERVER_TIMEOUT
 from packit.exceptions import PackitException
 
 logger = logging.getLogger(__name__)
@@ -22,11 +30,25 @@ class CommitVerifier:
     Class used for verifying git commits. Uses python-gnupg for accessing the GPG binary.
     """
 
-    def __init__(self, key_server: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        key_server: Optional[str] = None,
+        keyring_cache: Optional[Union[str, Path]] = None,
+        keyring_cache_refresh_interval: Optional[int] = None,
+    ) -> None:
         """
         :param key_server: GPG key server to be used
+        :param keyring_cache: GnuPG home directory shared by workers where downloaded
+            keys are kept, the default keyring is used if not set
+        :param keyring_cache_refresh_interval: download keys kept in the keyring cache
+            for longer than this (in seconds) again
         """
         self._gpg: Optional[GPG] = None
+        self._fingerprints: Optional[set[str]] = None
+        self.keyring_cache = Path(keyring_cache) if keyring_cache else None
+        self.keyring_cache_refresh_interval = (
+            keyring_cache_refresh_interval or GPG_KEYRING_CACHE_REFRESH_INTERVAL
+        )
         if key_server:
             self.key_servers = [key_server]
         else:
@@ -43,7 +65,11 @@ class CommitVerifier:
         gnupg.GPG instance from python-gnupg
         """
         if not self._gpg:
-            self._gpg = GPG()
+            if self.keyring_cache:
+                self.keyring_cache.mkdir(mode=0o700, parents=True, exist_ok=True)
+                self._gpg = GPG(gnupghome=str(self.keyring_cache))
+            else:
+                self._gpg = GPG()
         return self._gpg
 
     @property
@@ -56,32 +82,164 @@ class CommitVerifier:
         return self.gpg.list_keys()
 
     @property
-    def _gpg_fingerprints(self) -> list[str]:
-        """List of fingerprints of the saved keys"""
-        return self._gpg_keys.fingerprints
+    def _gpg_fingerprints(self) -> set[str]:
+        """
+        Fingerprints of the saved keys
+
+        The keyring is listed only once per verifier, keys downloaded
+        by the verifier are added afterwards.
+        """
+        if self._fingerprints is None:
+            self._fingerprints = set(self._gpg_keys.fingerprints)
+        return self._fingerprints
+
+    @property
+    def _downloaded_keys_path(self) -> Optional[Path]:
+        """File recording when the keys in the keyring cache were downloaded"""
+        if not self.keyring_cache:
+            return None
+        return self.keyring_cache / "packit-downloaded-keys.json"
+
+    def _get_downloaded_keys(self) -> dict[str, float]:
+        try:
+            return json.loads(self._downloaded_keys_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _record_downloaded_key(self, key_fingerprint: str) -> None:
+        if not self.keyring_cache:
+            return
+        downloaded_keys = self._get_downloaded_keys()
+        downloaded_keys[key_fingerprint] = time.time()
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.keyring_cache, prefix=".downloaded-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(downloaded_keys, f)
+            os.replace(tmp, self._downloaded_keys_path)
+        except OSError as ex:
+            logger.debug(f"Failed to record download of {key_fingerprint!r}: {ex!r}")
+
+    def _needs_refresh(self, key_fingerprint: str) -> bool:
+        """Whether a key from the keyring cache should be downloaded again"""
+        if not self.keyring_cache:
+            return False
+        downloaded_at = self._get_downloaded_keys().get(key_fingerprint)
+        return (
+            downloaded_at is not None
+            and time.time() - downloaded_at > self.keyring_cache_refresh_interval
+        )
 
     def download_gpg_key_if_needed(self, key_fingerprint: str) -> str:
         """
-        Download the gpg key from the self.key_servers if it is not present.
+        Download the gpg key from the self.key_servers if it is not present
+        or, in case of the keyring cache, if it was downloaded too long ago.
 
         :param key_fingerprint: fingerprint of the gpg key
         """
-        if key_fingerprint in self._gpg_fingerprints:
+        present = key_fingerprint in self._gpg_fingerprints
+        if present and not self._needs_refresh(key_fingerprint):
             return key_fingerprint
 
         try:
-            for keyserver in self.key_servers:
-                logger.debug(f"Downloading {key_fingerprint!r} from {keyserver!r}.")
-                result = self.gpg.recv_keys(keyserver, key_fingerprint)
-                if result.fingerprints:
-                    return result.fingerprints[0]
+            fingerprints = self.receive_key(key_fingerprint)
         except Exception as ex:
             raise PackitException(
                 f"Cannot receive a gpg key: {key_fingerprint}",
             ) from ex
 
+        if fingerprints:
+            self._gpg_fingerprints.update(fingerprints)
+            self._record_downloaded_key(key_fingerprint)
+            return fingerprints[0]
+        if present:
+            logger.warning(
+                f"Cannot refresh a gpg key {key_fingerprint}, using the old one.",
+            )
+            return key_fingerprint
+
         raise PackitException(f"Cannot receive a gpg key: {key_fingerprint}")
 
+    def receive_key(self, key_fingerprint: str) -> list[str]:
+        """
+        Download the gpg key from all self.key_servers in parallel
+        and import the first one received. Key blocks containing any other
+        key are not imported.
+
+        :param key_fingerprint: fingerprint of the gpg key
+        :return: fingerprints of the imported keys, empty if no key server has the key
+        """
+        executor = ThreadPoolExecutor(max_workers=len(self.key_servers))
+        futures = {
+            executor.submit(self._fetch_key, keyserver, key_fingerprint): keyserver
+            for keyserver in self.key_servers
+        }
+        try:
+            for future in as_completed(futures):
+                keyserver = futures[future]
+                try:
+                    key = future.result()
+                except Exception as ex:
+                    logger.debug(
+                        f"Failed to download {key_fingerprint!r} from {keyserver!r}: "
+                        f"{ex!r}",
+                    )
+                    continue
+                if not key:
+                    logger.debug(f"{key_fingerprint!r} not found on {keyserver!r}.")
+                    continue
+                if not self._is_only_key(key, key_fingerprint):
+                    logger.warning(
+                        f"{keyserver!r} returned other keys than {key_fingerprint!r}, "
+                        "ignoring them.",
+                    )
+                    continue
+                result = self.gpg.import_keys(key)
+                if result.fingerprints:
+                    logger.debug(f"Downloaded {key_fingerprint!r} from {keyserver!r}.")
+                    return result.fingerprints
+        finally:
+            # don't wait for slower key servers
+            executor.shutdown(wait=False, cancel_futures=True)
+        return []
+
+    def _is_only_key(self, key: str, key_fingerprint: str) -> bool:
+        """
+        Check, without importing it, that the armored key block contains
+        just the requested key, the same way `gpg --recv-keys` filters
+        what it imports from a key server.
+
+        :param key: armored key block
+        :param key_fingerprint: fingerprint (or key ID) of the requested key
+            or of its subkey
+        """
+        scanned = self.gpg.scan_keys_mem(key)
+        # key IDs are suffixes of the fingerprints
+        return len(scanned) == 1 and any(
+            fingerprint.endswith(key_fingerprint.upper())
+            for fingerprint in scanned.key_map
+        )
+
+    @staticmethod
+    def _fetch_key(keyserver: str, key_fingerprint: str) -> Optional[str]:
+        """
+        Download an armored gpg key from the key server using the HKP protocol.
+
+        :return: the key or None if the key server doesn't have it
+        """
+        url = keyserver if "://" in keyserver else f"https://{keyserver}"
+        url = url.replace("hkps://", "https://", 1).replace("hkp://", "http://", 1)
+        response = requests.get(
+            f"{url.rstrip('/')}/pks/lookup",
+            params={"op": "get", "options": "mr", "search": f"0x{key_fingerprint}"},
+            timeout=KEYSERVER_TIMEOUT,
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        if "BEGIN PGP PUBLIC KEY BLOCK" not in response.text:
+            return None
+        return response.text
+
     def check_signature_of_commit(
         self,
         commit: git.Commit,
@@ -117,6 +275,95 @@ class CommitVerifier:
             logger.warning(f"Commit {commit.hexsha!r} signature is not valid.")
         return is_valid
 
+    def check_signatures(
+        self,
+        repo: git.Repo,
+        possible_key_fingerprints: list[str],
+        revision_range: str = "HEAD",
+        max_count: Optional[int] = None,
+    ) -> dict[str, bool]:
+        """
+        Check the validity of signatures of all commits in the revision range
+        and test if the signers are present in the provided list.
+        (Commits without signature are not valid.)
+
+        Signatures of the whole range are verified at once, if any of them
+        can't be checked, the provided keys are downloaded and the range
+        is verified once more.
+
+        :param repo: git repository
+        :param possible_key_fingerprints: fingerprints of the authorized keys
+        :param revision_range: revision range as accepted by `git log`
+        :param max_count: maximum number of commits to check
+        :return: Dict {"commit hash": whether the commit is validly signed}
+        """
+        signatures = self.get_commit_signatures(repo, revision_range, max_count)
+        if any(
+            s.status == CommitSignatureStatus.cannot_be_checked
+            for s in signatures.values()
+        ):
+            # We need to download keys before getting the signers
+            for key in possible_key_fingerprints:
+                self.download_gpg_key_if_needed(key_fingerprint=key)
+            signatures = self.get_commit_signatures(repo, revision_range, max_count)
+
+        result = {}
+        for hexsha, signature in signatures.items():
+            if signature.status == CommitSignatureStatus.no_signature:
+                logger.debug(f"Commit {hexsha!r} not signed.")
+                result[hexsha] = False
+            elif not signature.fingerprint:
+                logger.debug(f"Cannot get a signer of the commit {hexsha!r}.")
+                result[hexsha] = False
+            elif signature.fingerprint not in possible_key_fingerprints:
+                logger.warning(f"Commit {hexsha!r} signature author not authorized.")
+                result[hexsha] = False
+            elif signature.status not in VALID_SIGNATURE_STATUSES:
+                logger.warning(f"Commit {hexsha!r} signature is not valid.")
+                result[hexsha] = False
+            else:
+                logger.debug(f"Commit {hexsha!r} signature is valid.")
+                result[hexsha] = True
+        return result
+
+    def get_commit_signatures(
+        self,
+        repo: git.Repo,
+        revision_range: str = "HEAD",
+        max_count: Optional[int] = None,
+    ) -> dict[str, "CommitSignature"]:
+        """
+        Get signature statuses and signer fingerprints of all commits
+        in the revision range using a single `git log` call.
+
+        In case of the keyring cache, git verifies the signatures
+        against the keys in it.
+
+        :param repo: git repository
+        :param revision_range: revision range as accepted by `git log`
+        :param max_count: maximum number of commits to check
+        :return: Dict {"commit hash": signature}
+        """
+        kwargs: dict[str, Any] = (
+            {"max_count": max_count} if max_count is not None else {}
+        )
+        if self.keyring_cache:
+            kwargs["env"] = {"GNUPGHOME": str(self.keyring_cache)}
+        try:
+            output = repo.git.log(revision_range, format="%H %G? %GF", **kwargs)
+        except git.GitCommandError as error:
+            raise PackitException(
+                f"Cannot get commits {revision_range!r} to check their signatures.",
+            ) from error
+        signatures = {}
+        for line in output.splitlines():
+            hexsha, mark, fingerprint = f"{line}  ".split(" ", 2)
+            signatures[hexsha] = CommitSignature(
+                CommitSignatureStatus(mark),
+                fingerprint.strip(),
+            )
+        return signatures
+
     def is_commit_signature_valid(self, commit: git.Commit) -> bool:
         """
         Check the validity of the commit signature.
@@ -167,6 +414,11 @@ class CommitSignatureStatus(Enum):
     cannot_be_checked = "E"
 
 
+class CommitSignature(NamedTuple):
+    status: CommitSignatureStatus
+    fingerprint: str
+
+
 VALID_SIGNATURE_STATUSES = [
     CommitSignatureStatus.good_valid,
     CommitSignatureStatus.good_unknown_validity,
@@ -24,7 +24,7 @@ from packit.constants import (
     SRC_GIT_CONFIG,
 )
 from packit.exceptions import PackitException
-from packit.patches import PatchMetadata
+from packit.patches import PatchMetadata, git_log_trailers
 from packit.pkgtool import PkgTool
 from packit.utils import (
     commit_message_file,
@@ -204,6 +204,8 @@ class SourceGitGenerator:
         # -2 - drop first commit which represents tarball unpacking
         # -1 - reverse order, HEAD is last in the sequence
         patch_commits = list(prep_repo.iter_commits(from_branch))[-2::-1]
+        # read trailers of all the commits at once
+        patch_trailers = git_log_trailers(prep_repo, from_branch)
 
         for commit in patch_commits:
             self.source_git.git.cherry_pick(
@@ -215,7 +217,10 @@ class SourceGitGenerator:
 
             # Annotate commits in the source-git repo with patch_id. This info is not provided
             # during the rpm patching process so we need to do it here.
-            metadata = PatchMetadata.from_git_trailers(commit)
+            metadata = PatchMetadata.from_git_trailers(
+                commit,
+                trailers=patch_trailers.get(commit.hexsha),
+            )
             trailers = [("Patch-id", patch_ids[metadata.name])]
             patch_status = ""
             for line in patch_comments.get(metadata.name, []):
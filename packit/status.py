@@ -2,9 +2,15 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
 
+from cachetools import LRUCache
 from ogr.abstract import Release
+from specfile import Specfile
 
 from packit.config import Config
 from packit.config.common_package_config import MultiplePackages
@@ -12,11 +18,42 @@ from packit.copr_helper import CoprHelper
 from packit.distgit import DistGit
 from packit.exceptions import PackitException
 from packit.upstream import Upstream
-from packit.utils.bodhi import get_bodhi_client
-from packit.utils.koji_helper import KojiHelper
+from packit.utils.bodhi import BodhiPaginator, get_bodhi_client
+from packit.utils.koji_helper import KojiHelper, get_metadata_cache
 
 logger = logging.getLogger(__name__)
 
+# (spec file blob SHA, parse time macros) -> expanded version
+_dg_versions_cache: LRUCache = LRUCache(maxsize=1024)
+
+
+def get_expanded_version(
+    content: str,
+    sourcedir: str,
+    macros: tuple[tuple[str, Optional[str]], ...],
+) -> Optional[str]:
+    """
+    Parse the given spec file content and return its expanded version.
+
+    Args:
+        content: Content of the spec file.
+        sourcedir: Directory with sources referenced by the spec file.
+        macros: Macros to define before parsing.
+
+    Returns:
+        Expanded version or `None` if it can't be determined.
+    """
+    try:
+        return Specfile(
+            content=content,
+            sourcedir=sourcedir,
+            macros=list(macros),
+            sanitize=True,
+        ).expanded_version
+    except Exception as ex:
+        logger.debug(f"Failed to parse the spec file: {ex!r}")
+        return None
+
 
 class Status:
     """
@@ -53,9 +90,85 @@ class Status:
             table = [(pr.id, pr.title, pr.url) for pr in pr_list]
         return table
 
-    def get_dg_versions(self) -> dict:
+    def get_dg_versions(self, checkout: bool = False) -> dict:
         """
         Get versions from all branches in Dist-git
+
+        By default, the spec file is read directly from the `origin/<branch>`
+        git objects through `LocalProject.git_objects`, without touching
+        the working tree, and the branches are parsed in parallel.
+
+        :param checkout: check out every branch and reload the spec file
+            in the working tree instead of reading the git objects
+        :return: Dict {"branch": "version"}
+        """
+        if checkout:
+            return self._get_dg_versions_with_checkout()
+
+        branches = self.dg.local_project.git_project.get_branches()
+        logger.debug("Dist-git branches fetched.")
+
+        git_objects = self.dg.local_project.git_objects
+        specfile_path = (
+            self.dg.get_absolute_specfile_path()
+            .relative_to(self.dg.local_project.working_dir)
+            .as_posix()
+        )
+        macros = tuple(self.dg.parse_time_macros)
+
+        blobs = {}
+        for branch in branches:
+            if not (obj := git_objects.resolve(f"origin/{branch}:{specfile_path}")):
+                logger.debug(f"Branch {branch!r} is not present.")
+                continue
+            blobs[branch] = obj[0]
+
+        # the same spec file content is usually shared by multiple branches
+        to_parse = {
+            sha: git_objects.read_blob(sha).decode()
+            for sha in set(blobs.values())
+            if (sha, macros) not in _dg_versions_cache
+        }
+        sourcedir = str(self.dg.absolute_source_dir)
+        if len(to_parse) > 1:
+            logger.debug(f"Parsing {len(to_parse)} distinct spec files in parallel.")
+            with ProcessPoolExecutor(
+                max_workers=min(len(to_parse), os.cpu_count() or 1),
+                # rpm keeps global state, let each worker start cleanly
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = {
+                    sha: executor.submit(
+                        get_expanded_version,
+                        content,
+                        sourcedir,
+                        macros,
+                    )
+                    for sha, content in to_parse.items()
+                }
+                for sha, future in futures.items():
+                    _dg_versions_cache[(sha, macros)] = future.result()
+        else:
+            for sha, content in to_parse.items():
+                _dg_versions_cache[(sha, macros)] = get_expanded_version(
+                    content,
+                    sourcedir,
+                    macros,
+                )
+
+        dg_versions = {}
+        for branch, sha in blobs.items():
+            version = _dg_versions_cache.get((sha, macros))
+            if version is None:
+                logger.debug(f"Can't figure out the version of branch: {branch}.")
+                continue
+            dg_versions[branch] = version
+
+        return dg_versions
+
+    def _get_dg_versions_with_checkout(self) -> dict:
+        """
+        Get versions from all branches in Dist-git by checking out each of them.
         :return: Dict {"branch": "version"}
         """
         dg_versions = {}
@@ -106,7 +219,10 @@ class Status:
         # so we don't need to get whole build history from Koji,
         # get just recent year to speed things up.
         since = datetime.now() - timedelta(days=365)
-        builds = KojiHelper().get_nvrs(
+        koji_helper = KojiHelper(
+            metadata_cache=get_metadata_cache(self.config.koji_metadata_cache),
+        )
+        builds = koji_helper.get_nvrs(
             self.dg.package_config.downstream_package_name,
             since,
         )
@@ -122,45 +238,28 @@ class Status:
         :param number_of_updates: int
         :return: None
         """
-        bodhi_client = get_bodhi_client()
-        updates = []
-        page = pages = 1
-        while page <= pages:
-            results = bodhi_client.query(
-                packages=self.dg.package_config.downstream_package_name,
-                page=page,
-            )
-            updates.extend(results["updates"])
-            page += 1
-            pages = results["pages"]
-        logger.debug("Bodhi updates fetched.")
-
         stable_branches: set[str] = set()
-        all_updates = [
-            [
-                update["title"],
-                update["karma"],
-                update["status"],
-                update["release"]["branch"],
-            ]
-            for update in updates
-        ]
-        updates = []
-        for [update, karma, status, branch] in all_updates:
+        updates: list = []
+        # pages are fetched lazily, stop as soon as there are enough updates
+        for update in BodhiPaginator(
+            get_bodhi_client,
+            packages=self.dg.package_config.downstream_package_name,
+        ):
+            status, branch = update["status"], update["release"]["branch"]
             # Don't return more than one stable update per branch
             if branch not in stable_branches or status != "stable":
-                updates.append([update, karma, status])
+                updates.append([update["title"], update["karma"], status])
                 if status == "stable":
                     stable_branches.add(branch)
             if len(updates) == number_of_updates:
                 break
+        logger.debug("Bodhi updates fetched.")
         return updates
 
     def get_copr_builds(self, number_of_builds: int = 5) -> list:
-        return (
-            CoprHelper(upstream_local_project=self.up.local_project).get_copr_builds(
-                number_of_builds=number_of_builds,
-            )
-            if self.up.local_project
-            else []
-        )
+        if not self.up.local_project:
+            return []
+        return CoprHelper(
+            upstream_local_project=self.up.local_project,
+            projects_cache=self.config.copr_projects_cache,
+        ).get_copr_builds(number_of_builds=number_of_builds)
@@ -2,12 +2,12 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
+import hashlib
 import logging
 import os
 import re
 import shlex
 import shutil
-import tarfile
 import tempfile
 from functools import partial
 from pathlib import Path
@@ -43,8 +43,10 @@ from packit.local_project import LocalProject
 from packit.patches import PatchGenerator, PatchMetadata
 from packit.sync import iter_srcs
 from packit.utils import commands, sanitize_version
+from packit.utils.archive import get_archive_top_level
 from packit.utils.changelog_helper import ChangelogHelper
 from packit.utils.commands import run_command
+from packit.utils.file_cache import hash_file
 from packit.utils.repo import get_current_version_command, git_remote_url_to_https_url
 from packit.utils.upstream_version import get_upstream_version
 from packit.utils.versions import compare_versions
@@ -1452,7 +1454,104 @@ class SRPMBuilder:
             return self.upstream.local_project.working_dir / built_srpm_path
         return Path(built_srpm_path)
 
+    def get_inputs_digest(self) -> Optional[str]:
+        """
+        Computes digest of everything the SRPM is built from: the spec file,
+        the sources and patches it references and the `%dist` macro.
+
+        Returns:
+            Hex digest of the inputs or `None` if any of the sources or patches
+            is missing, in that case the build is left to report it.
+        """
+        specfile = self.upstream.specfile
+        digest = hashlib.sha256()
+        spec_path = Path(self.upstream.absolute_specfile_path)
+        digest.update(f"spec {spec_path.name} {hash_file(spec_path)}\n".encode())
+        with specfile.sources() as sources, specfile.patches() as patches:
+            filenames = sorted(
+                {s.expanded_filename for s in sources + patches if s.valid},
+            )
+        for filename in filenames:
+            path = self.upstream.absolute_source_dir / filename
+            if not path.is_file():
+                logger.debug(f"{filename} not found, not using the SRPM cache.")
+                return None
+            digest.update(f"source {filename} {hash_file(path)}\n".encode())
+        digest.update(f"dist {rpm.expandMacro('%{?dist}')}\n".encode())
+        return digest.hexdigest()
+
+    def _get_srpm_target(self, srpm_name: str) -> Path:
+        """
+        Get path where the SRPM of the given name would be placed by the build.
+        """
+        if self.srpm_path:
+            return Path(self.srpm_path)
+        if self.upstream.running_in_service():
+            return self.upstream.local_project.working_dir / srpm_name
+        return self.srpm_dir / srpm_name
+
+    def _get_cached_srpm(self, key: str) -> Optional[Path]:
+        """
+        Provides the SRPM built from the inputs of the given digest from
+        the SRPM cache.
+
+        Args:
+            key: Digest of the inputs.
+
+        Returns:
+            Path to the SRPM or `None` if it's not cached.
+        """
+        srpm_cache = self.upstream.srpm_cache
+        if not (srpm_name := srpm_cache.get_text(f"{key}.name")):
+            # the SRPM is of no use without its name
+            srpm_cache.misses += 1
+            return None
+        target = self._get_srpm_target(srpm_name.strip())
+        target.unlink(missing_ok=True)
+        if not srpm_cache.get(key, target):
+            return None
+        return target
+
+    def _cache_srpm(self, key: str, srpm_path: Path) -> None:
+        """
+        Stores the SRPM in the SRPM cache under the digest of its inputs.
+
+        Args:
+            key: Digest of the inputs.
+            srpm_path: Path to the built SRPM.
+        """
+        srpm_cache = self.upstream.srpm_cache
+        if srpm_cache.put(key, srpm_path):
+            srpm_cache.put_text(f"{key}.name", f"{srpm_path.name}\n")
+
     def build(self) -> Path:
+        """
+        Builds the SRPM using `rpmbuild -bs`.
+
+        If the SRPM cache is configured and an SRPM of the same inputs
+        has already been built, it's taken from the cache instead.
+
+        Returns:
+            Path to the SRPM.
+        """
+        srpm_cache = self.upstream.srpm_cache
+        key = self.get_inputs_digest() if srpm_cache else None
+        if not key:
+            return self._build()
+
+        # make concurrent builds of the same SRPM wait for the first one
+        with srpm_cache.lock(key):
+            if srpm_path := self._get_cached_srpm(key):
+                logger.info(f"Using cached SRPM {srpm_path.name}.")
+            else:
+                srpm_path = self._build()
+                self._cache_srpm(key, srpm_path)
+        logger.debug(
+            f"SRPM cache hits: {srpm_cache.hits}, misses: {srpm_cache.misses}",
+        )
+        return srpm_path
+
+    def _build(self) -> Path:
         cmd, escaped_command = self.get_build_command()
 
         present_srpms = set(self.srpm_dir.glob("*.src.rpm"))
@@ -1779,6 +1878,10 @@ class Archive:
         Create an archive using `git archive`.
         Archive will be placed in the `specfile_directory`.
 
+        If the archive cache is configured, archives are cached by the tree
+        of HEAD and the prefix, so an archive of the same content is created
+        only once.
+
         Args:
             dir_name: Name of the directory from which the archive is created.
             env: Environment variables passed to the action.
@@ -1787,11 +1890,113 @@ class Archive:
             Name of the archive as a string.
         """
         archive_name = f"{dir_name}{DEFAULT_ARCHIVE_EXT}"
-        relative_archive_path = (
-            self.upstream.absolute_specfile_dir / archive_name
-        ).relative_to(self.upstream.local_project.working_dir)
-        archive_cmd = [
-            "git",
+        archive_path = self.upstream.absolute_specfile_dir / archive_name
+        archive_cache = self.upstream.archive_cache
+        key = self._get_archive_cache_key(dir_name) if archive_cache else None
+        if not key:
+            self._run_git_archive(archive_path, dir_name, env)
+            return archive_name
+
+        # make concurrent builds of the same tree wait for the first one
+        with archive_cache.lock(key):
+            # the previous archive may be a hardlink of a cached one
+            archive_path.unlink(missing_ok=True)
+            if archive_cache.get(key, archive_path):
+                logger.info(f"Using cached archive {archive_name}.")
+            else:
+                self._run_git_archive(archive_path, dir_name, env)
+                archive_cache.put(key, archive_path)
+        logger.debug(
+            f"Archive cache hits: {archive_cache.hits}, misses: {archive_cache.misses}",
+        )
+        return archive_name
+
+    def _get_archive_cache_key(self, dir_name: str) -> Optional[str]:
+        """
+        Get key of the archive of HEAD in the archive cache.
+
+        The archive depends only on the tree of HEAD and the attributes
+        of the repository (e.g. `export-ignore` in `.git/info/attributes`),
+        unless `export-subst` attribute is used, in that case the placeholders
+        are expanded using the commit and the commit is used instead.
+
+        Args:
+            dir_name: Name of the top-level directory of the archive.
+
+        Returns:
+            Key of the archive or `None` if HEAD can't be resolved.
+        """
+        local_project = self.upstream.local_project
+        git_objects = local_project.git_objects
+        if not git_objects or not (tree := git_objects.resolve("HEAD^{tree}")):
+            return None
+        revision = tree[0]
+        info_attributes_path = Path(local_project.git_repo.git_dir) / "info/attributes"
+        info_attributes = (
+            info_attributes_path.read_text() if info_attributes_path.is_file() else ""
+        )
+        if self._uses_export_subst(info_attributes):
+            revision = git_objects.resolve("HEAD^{commit}")[0]
+        return hashlib.sha256(
+            f"{revision}\n{dir_name}/\n{DEFAULT_ARCHIVE_EXT}\n{info_attributes}".encode(),
+        ).hexdigest()
+
+    def _uses_export_subst(self, info_attributes: str) -> bool:
+        """
+        Check whether any `.gitattributes` file in HEAD (or the attributes
+        of the repository) mention the `export-subst` attribute.
+
+        Args:
+            info_attributes: Content of `.git/info/attributes`.
+        """
+        if "export-subst" in info_attributes:
+            return True
+        git_repo = self.upstream.local_project.git_repo
+        try:
+            git_repo.git.grep(
+                "--quiet",
+                "--fixed-strings",
+                "export-subst",
+                "HEAD",
+                "--",
+                ":(glob)**/.gitattributes",
+            )
+        except git.GitCommandError:
+            # no match
+            return False
+        return True
+
+    def _run_git_archive(
+        self,
+        archive_path: Path,
+        dir_name: str,
+        env: dict[str, str],
+    ) -> None:
+        """
+        Run `git archive` of HEAD, compressing the archive by pigz
+        if `archive_compression_threads` is configured and pigz is available.
+
+        Args:
+            archive_path: Absolute path of the archive.
+            dir_name: Name of the top-level directory of the archive.
+            env: Environment variables passed to the command.
+        """
+        # never write into an existing file, it may be a hardlink of a cached one
+        archive_path.unlink(missing_ok=True)
+        relative_archive_path = archive_path.relative_to(
+            self.upstream.local_project.working_dir,
+        )
+        archive_cmd = ["git"]
+        threads = self.upstream.config.archive_compression_threads
+        if threads:
+            if shutil.which("pigz"):
+                archive_cmd += [
+                    "-c",
+                    f"tar.tar.gz.command=pigz --stdout --no-name --processes {threads}",
+                ]
+            else:
+                logger.debug("pigz is not available, compressing the archive by git.")
+        archive_cmd += [
             "archive",
             "--output",
             str(relative_archive_path),
@@ -1804,7 +2009,6 @@ class Archive:
             return_output=True,
             env=env,
         )
-        return archive_name
 
     def get_archive_root_dir(self, archive: str) -> Optional[str]:
         """
@@ -1815,7 +2019,8 @@ class Archive:
         2. will generate name based on `archive_root_dir_template`
 
         Currently supported archives:
-        * tar including compression (for details check python tarfile module doc)
+        * tar, uncompressed or compressed by gzip, bzip2, xz or zstd
+        * zip
 
         Args:
             archive: Name of the archive.
@@ -1828,14 +2033,8 @@ class Archive:
                 `None`.
         """
 
-        archive_root_dir = None
-
         logger.debug("Trying to extract archive_root_dir from known archives")
-        if tarfile.is_tarfile(f"{self.upstream.absolute_specfile_dir}/{archive}"):
-            logger.debug(f"Archive {archive} is tar.")
-            archive_root_dir = self.get_archive_root_dir_from_tar(archive)
-        else:
-            logger.debug(f"Archive {archive} is not tar.")
+        archive_root_dir = self.get_archive_root_dir_from_tar(archive)
 
         if archive_root_dir is None:
             logger.debug(
@@ -1850,28 +2049,27 @@ class Archive:
 
     def get_archive_root_dir_from_tar(self, archive: str) -> Optional[str]:
         """
-        Returns tar archive's top-level directory, if there is exactly one.
+        Returns archive's top-level directory, if there is exactly one.
+
+        The archive is read lazily, only until a second top-level directory
+        appears, besides tar archives zip archives are supported as well.
 
         Args:
-            archive: Name of the tar archive.
+            archive: Name of the archive.
 
         Returns:
             Archive's top level directory if there is exactly one, `None` otherwise.
         """
-        root_dirs = set()
-        with tarfile.open(f"{self.upstream.absolute_specfile_dir}/{archive}") as tar:
-            for tar_item in tar.getmembers():
-                if tar_item.isdir() and "/" not in tar_item.name:
-                    root_dirs.add(tar_item.name)
-                # required for archives where top-level dir was added using tar --transform
-                # option - in that case, tar archive will not contain dir related entry
-                if tar_item.isfile() and "/" in tar_item.name:
-                    root_dirs.add(tar_item.name.split("/")[0])
-
-            root_dirs_count = len(root_dirs)
-            archive_root_items_count = len(
-                {i.name for i in tar.getmembers() if "/" not in i.name},
-            )
+        top_level = get_archive_top_level(
+            f"{self.upstream.absolute_specfile_dir}/{archive}",
+        )
+        if top_level is None:
+            logger.debug(f"Archive {archive} is not a supported archive.")
+            return None
+
+        root_dirs = set(top_level.root_dirs)
+        root_dirs_count = len(root_dirs)
+        archive_root_items_count = len(top_level.root_items)
 
         if root_dirs_count == 1:
             root_dir = root_dirs.pop()
@@ -0,0 +1,156 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+"""
+Inspection of source archives without extracting them.
+"""
+
+import logging
+import os
+import subprocess
+import tarfile
+import threading
+import zipfile
+from collections.abc import Generator, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from cachetools import LRUCache
+
+logger = logging.getLogger(__name__)
+
+ZIP_MAGIC = (b"PK\x03\x04", b"PK\x05\x06")
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# (path, device, inode, size, mtime) -> top level of the archive
+_top_level_cache: LRUCache = LRUCache(maxsize=256)
+_top_level_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ArchiveTopLevel:
+    """
+    Top level of an archive.
+
+    Attributes:
+        root_dirs: Top-level directories, including those only implied by paths
+            of files (e.g. in archives created using `tar --transform`).
+        root_items: Names of entries on the top level of the archive.
+    """
+
+    root_dirs: frozenset[str]
+    root_items: frozenset[str]
+
+
+def iter_archive_members(
+    path: Union[str, Path],
+) -> Generator[tuple[str, bool], None, None]:
+    """
+    Lazily iterates over members of an archive, decompressing only as much
+    of it as is consumed.
+
+    Supported are zip archives and tar archives, uncompressed or compressed
+    by gzip, bzip2, xz or zstd (the latter requires the `zstd` binary).
+
+    Args:
+        path: Path to the archive.
+
+    Yields:
+        Names of the members and whether they are directories.
+
+    Raises:
+        ValueError: If the file is not a supported archive.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(4)
+
+    if magic in ZIP_MAGIC:
+        try:
+            with zipfile.ZipFile(path) as archive:
+                # the central directory is at the end, nothing is decompressed
+                for info in archive.infolist():
+                    yield info.filename.rstrip("/"), info.is_dir()
+        except zipfile.BadZipFile as ex:
+            raise ValueError(f"{path} is not a valid zip archive: {ex}") from ex
+        return
+
+    if magic == ZSTD_MAGIC:
+        process = subprocess.Popen(
+            ["zstd", "--decompress", "--stdout", "--quiet", str(path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            yield from _iter_tar_members(process.stdout, path)
+        finally:
+            # stop decompressing if the caller is done early
+            process.kill()
+            process.stdout.close()
+            process.wait()
+        return
+
+    with open(path, "rb") as f:
+        yield from _iter_tar_members(f, path)
+
+
+def _iter_tar_members(fileobj, path: Union[str, Path]) -> Iterator[tuple[str, bool]]:
+    try:
+        # stream mode, members are read one after another and never seeked back to
+        with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+            for member in tar:
+                yield member.name, member.isdir()
+    except tarfile.TarError as ex:
+        raise ValueError(f"{path} is not a valid tar archive: {ex}") from ex
+
+
+def get_archive_top_level(path: Union[str, Path]) -> Optional[ArchiveTopLevel]:
+    """
+    Gets the top level of an archive.
+
+    Members are inspected only until a second top-level directory appears,
+    which settles that there is no single root directory. The result
+    is memoized for the archive as long as the file doesn't change.
+
+    Args:
+        path: Path to the archive.
+
+    Returns:
+        Top level of the archive or `None` if it's not a supported archive.
+    """
+    stat = os.stat(path)
+    key = (
+        os.path.realpath(path),
+        stat.st_dev,
+        stat.st_ino,
+        stat.st_size,
+        stat.st_mtime_ns,
+    )
+    with _top_level_cache_lock:
+        if key in _top_level_cache:
+            return _top_level_cache[key]
+
+    root_dirs: set[str] = set()
+    root_items: set[str] = set()
+    members = iter_archive_members(path)
+    try:
+        for name, is_dir in members:
+            top, _, rest = name.partition("/")
+            if not rest:
+                root_items.add(top)
+            # files in a subdirectory imply the top-level dir, there is no entry
+            # for it in archives created e.g. using `tar --transform`
+            if (is_dir and not rest) or (not is_dir and rest):
+                root_dirs.add(top)
+            if len(root_dirs) > 1:
+                break
+    except (OSError, ValueError) as ex:
+        logger.debug(f"Failed to inspect archive {path}: {ex}")
+        return None
+    finally:
+        members.close()
+
+    top_level = ArchiveTopLevel(frozenset(root_dirs), frozenset(root_items))
+    with _top_level_cache_lock:
+        _top_level_cache[key] = top_level
+    return top_level
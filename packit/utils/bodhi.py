@@ -7,10 +7,19 @@ Bodhi 6+ prints a URL which you need to open in browser and paste 'code=XXX...'
 terminal which the bodhi-client will save to `~/.config/bodhi/client.json`.
 Bodhi 6 does not use username, password nor keytab.
 """
+import logging
 import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 
 from bodhi.client.bindings import BodhiClient
 
+from packit.constants import BODHI_ROWS_PER_PAGE, BODHI_WORKERS
+
+logger = logging.getLogger(__name__)
+
 
 def get_bodhi_client() -> BodhiClient:
     """
@@ -26,3 +35,95 @@ def get_bodhi_client() -> BodhiClient:
     return BodhiClient(
         oidc_storage_path=os.path.join(os.environ["HOME"], "bodhi-client.json"),
     )
+
+
+class BodhiPaginator:
+    """
+    Pages through results of a Bodhi updates query.
+
+    * Iterating over the paginator fetches pages lazily, one after another,
+      so a consumer that stops early doesn't fetch the rest of the pages.
+    * `all()` learns the page count from the first response and fetches
+      the remaining pages concurrently. `BodhiClient` (and the requests session
+      it wraps) is not thread-safe, so every worker uses its own client.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], BodhiClient] = get_bodhi_client,
+        rows_per_page: int = BODHI_ROWS_PER_PAGE,
+        workers: int = BODHI_WORKERS,
+        **query: Any,
+    ) -> None:
+        """
+        Args:
+            client_factory: Creates a Bodhi client to query.
+            rows_per_page: Number of updates requested per page.
+            workers: Maximum number of pages fetched concurrently by `all()`.
+            **query: Query parameters, see `BodhiClient.query()`.
+        """
+        self.client_factory = client_factory
+        self.rows_per_page = rows_per_page
+        self.workers = workers
+        self.query = query
+        self.pages: Optional[int] = None
+        self._bodhi_client: Optional[BodhiClient] = None
+
+    @property
+    def bodhi_client(self) -> BodhiClient:
+        if self._bodhi_client is None:
+            self._bodhi_client = self.client_factory()
+        return self._bodhi_client
+
+    def _query(self, bodhi_client: BodhiClient, page: int) -> dict:
+        return bodhi_client.query(
+            **self.query,
+            page=page,
+            rows_per_page=self.rows_per_page,
+        )
+
+    def _get_first_page(self) -> list[dict]:
+        results = self._query(self.bodhi_client, 1)
+        self.pages = results["pages"]
+        return results["updates"]
+
+    def get_page(self, page: int) -> list[dict]:
+        """
+        Fetches a single page of updates.
+
+        Args:
+            page: Number of the page, starting from 1.
+
+        Returns:
+            Updates on the page.
+        """
+        return self._query(self.bodhi_client, page)["updates"]
+
+    def __iter__(self) -> Iterator[dict]:
+        yield from self._get_first_page()
+        for page in range(2, self.pages + 1):
+            yield from self.get_page(page)
+
+    def all(self) -> list[dict]:
+        """
+        Fetches all pages, the remaining pages after the first one concurrently.
+
+        Returns:
+            All updates, in the order Bodhi returned them.
+        """
+        updates = self._get_first_page()
+        if self.pages <= 1:
+            return updates
+        local = threading.local()
+
+        def get_page(page: int) -> list[dict]:
+            if (bodhi_client := getattr(local, "bodhi_client", None)) is None:
+                bodhi_client = local.bodhi_client = self.client_factory()
+            return self._query(bodhi_client, page)["updates"]
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.workers, self.pages - 1)),
+        ) as executor:
+            for page_updates in executor.map(get_page, range(2, self.pages + 1)):
+                updates.extend(page_updates)
+        return updates
@@ -3,19 +3,26 @@
 
 import logging
 import os
+import selectors
 import shlex
 import subprocess
 import sys
+import tempfile
+import time
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Union
 
 from packit.exceptions import PackitCommandFailedError
-from packit.utils.logging import StreamLogger
 
 logger = logging.getLogger(__name__)
 
+# how much of the output of a command is kept in memory before it's spilled to disk
+_OUTPUT_MEMORY_LIMIT = 16 * 1024 * 1024
+# how much is read from the pipes at once
+_READ_SIZE = 64 * 1024
+
 
 @dataclass
 class CommandResult:
@@ -26,11 +33,96 @@ class CommandResult:
         success: Boolean value holding a result of the command.
         stdout: Holds standard output of the command, in case it was requsted.
         stderr: Holds standard error output of the command, in case it was requsted.
+        duration: Wall-clock time (in seconds) the command took.
+        max_rss: Maximum resident set size (in KiB) of the command.
     """
 
     success: bool = False
     stdout: Optional[str] = None
     stderr: Optional[str] = None
+    duration: Optional[float] = None
+    max_rss: Optional[int] = None
+
+
+class OutputBuffer:
+    """
+    Collects raw output of a command.
+
+    Up to `max_size` bytes are kept in memory, larger output (e.g. verbose
+    rpmbuild logs) is spilled to a temporary file. If `log_level` is enabled,
+    the output is also logged line by line, otherwise it's not even split
+    into lines. Nothing is decoded until requested.
+    """
+
+    def __init__(
+        self,
+        log_level: int = logging.DEBUG,
+        max_size: int = _OUTPUT_MEMORY_LIMIT,
+    ) -> None:
+        self.log_level = log_level
+        self.size = 0
+        # kept open for the lifetime of the buffer, closed by close()
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_size)  # noqa: SIM115
+        self._log = logger.isEnabledFor(log_level)
+        self._partial_line = b""
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self.size += len(data)
+        if not self._log:
+            return
+        *lines, self._partial_line = (self._partial_line + data).split(b"\n")
+        for line in lines:
+            self._log_line(line)
+
+    def _log_line(self, line: bytes) -> None:
+        logger.log(self.log_level, line.decode(errors="replace"))
+
+    def flush(self) -> None:
+        """Logs the last line if it isn't terminated by a newline."""
+        if self._partial_line:
+            self._log_line(self._partial_line)
+            self._partial_line = b""
+
+    def get_output(self) -> bytes:
+        self._file.seek(0)
+        try:
+            return self._file.read()
+        finally:
+            self._file.seek(0, os.SEEK_END)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _communicate(
+    process: subprocess.Popen,
+    stdout: OutputBuffer,
+    stderr: OutputBuffer,
+) -> tuple[int, int]:
+    """
+    Reads both outputs of a process in a single thread and reaps the process.
+
+    Returns:
+        Return code and maximum resident set size (in KiB) of the process.
+    """
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stdout, selectors.EVENT_READ, stdout)
+        selector.register(process.stderr, selectors.EVENT_READ, stderr)
+        while selector.get_map():
+            for key, _ in selector.select():
+                data = os.read(key.fd, _READ_SIZE)
+                if not data:
+                    selector.unregister(key.fileobj)
+                    key.data.flush()
+                    continue
+                key.data.write(data)
+    process.stdout.close()
+    process.stderr.close()
+    # unlike Popen.wait(), wait4() provides resource usage of the process
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, rusage.ru_maxrss
 
 
 def run_command(
@@ -91,57 +183,51 @@ def run_command(
     # we can't use universal newlines here b/c the output from the command can be encoded
     # in something alien and we would "can't decode this using utf-8" errors
     # https://github.com/packit/systemd-rhel8-flock/pull/9#issuecomment-550184016
-    shell = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        shell=False,
-        cwd=cwd,
-        env=cmd_env,
-    )
-
-    stdout = StreamLogger(
-        shell.stdout,
-        log_level=logging.DEBUG if not print_live else logging.INFO,
-        decode=True,
-    )
-    stderr = StreamLogger(
-        shell.stderr,
-        log_level=logging.DEBUG if not print_live else logging.INFO,
-        decode=True,
-    )
-
-    stdout.start()
-    stderr.start()
-    shell.wait()
-    stdout.join()
-    stderr.join()
-
-    success = True  # default is success
-    if shell.returncode != 0:
-        logger.error(f"{error_message}")
-        if fail:
-            stderr_output = stderr.get_output().decode()
-            stdout_output = stdout.get_output().decode()
-            if output:
-                logger.debug(f"Command stderr: {stderr_output}")
-                logger.debug(f"Command stdout: {stdout_output}")
-            raise PackitCommandFailedError(
-                f"{error_message}",
-                stdout_output=stdout_output,
-                stderr_output=stderr_output,
-            )
-        success = False
-
-    if not output:
-        return CommandResult(success=success)
-
-    command_output = (
-        out.get_output().decode(sys.getdefaultencoding()) for out in (stdout, stderr)
-    )
-
-    out, err = command_output
-    return CommandResult(success, out, err)
+    log_level = logging.DEBUG if not print_live else logging.INFO
+    stdout = OutputBuffer(log_level)
+    stderr = OutputBuffer(log_level)
+    try:
+        start = time.monotonic()
+        shell = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            shell=False,
+            cwd=cwd,
+            env=cmd_env,
+        )
+        returncode, max_rss = _communicate(shell, stdout, stderr)
+        duration = time.monotonic() - start
+        logger.debug(
+            f"Command finished in {duration:.3f}s with maximum RSS {max_rss} KiB.",
+        )
+
+        success = True  # default is success
+        if returncode != 0:
+            logger.error(f"{error_message}")
+            if fail:
+                stderr_output = stderr.get_output().decode()
+                stdout_output = stdout.get_output().decode()
+                if output:
+                    logger.debug(f"Command stderr: {stderr_output}")
+                    logger.debug(f"Command stdout: {stdout_output}")
+                raise PackitCommandFailedError(
+                    f"{error_message}",
+                    stdout_output=stdout_output,
+                    stderr_output=stderr_output,
+                )
+            success = False
+
+        if not output:
+            return CommandResult(success=success, duration=duration, max_rss=max_rss)
+
+        out, err = (
+            o.get_output().decode(sys.getdefaultencoding()) for o in (stdout, stderr)
+        )
+        return CommandResult(success, out, err, duration, max_rss)
+    finally:
+        stdout.close()
+        stderr.close()
 
 
 def run_command_remote(
@@ -0,0 +1,307 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# ioctl request cloning a file on copy-on-write filesystems (btrfs, XFS)
+FICLONE = 0x40049409
+
+DIGEST_SUFFIX = ".digest"
+
+
+def hash_file(path: Union[str, Path], hashtype: str = "sha256") -> str:
+    """
+    Computes hex digest of a file.
+
+    Args:
+        path: Path to the file.
+        hashtype: Name of the hash algorithm, as understood by `hashlib`.
+
+    Returns:
+        Hex digest of the file content.
+    """
+    digest = hashlib.new(hashtype)
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def clone_file(source: Union[str, Path], target: Union[str, Path]) -> None:
+    """
+    Makes `target` have the same content as `source` as cheaply as possible.
+
+    Hardlinks the file if possible, then tries a reflink (copy-on-write clone)
+    and falls back to a regular copy.
+
+    Args:
+        source: Existing file.
+        target: Path of the new file, must not exist.
+    """
+    try:
+        os.link(source, target)
+        return
+    except OSError:
+        pass
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(source, target)
+
+
+class FileCache:
+    """
+    Local on-disk cache of files that can be shared by multiple processes.
+
+    * Every entry is a file stored under its key, accompanied by a `.digest` file
+      holding the digest of the content in the form `<hashtype>:<hexdigest>`.
+    * Entries are served by hardlinking (or reflinking, or copying) them
+      to the requested location and their content is verified against the stored
+      digest, corrupted entries are dropped.
+    * Entries and digests are written atomically, a concurrent writer of the same
+      key simply replaces an identical entry and a missing entry is just a miss.
+    * Mtime of the digest file records the last use of an entry, the least
+      recently used entries are evicted once the cache exceeds its size limit.
+    """
+
+    def __init__(
+        self,
+        cache_path: Union[str, Path],
+        size_limit: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            cache_path: Directory of the cache, created if it doesn't exist.
+            size_limit: Maximum total size of the cached files in bytes,
+                unlimited if not set.
+        """
+        self.cache_path = Path(cache_path)
+        self.size_limit = size_limit
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"FileCache(cache_path='{self.cache_path}', size_limit={self.size_limit})"
+        )
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_path / key[:2] / key
+
+    def _digest_path(self, key: str) -> Path:
+        return self.cache_path / key[:2] / f"{key}{DIGEST_SUFFIX}"
+
+    def _write_atomically(self, path: Path, source: Optional[Path], text: str = ""):
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        try:
+            if source:
+                os.close(fd)
+                os.unlink(tmp)
+                clone_file(source, tmp)
+            else:
+                with os.fdopen(fd, "w") as f:
+                    f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def lock(self, key: str) -> Generator[None, None, None]:
+        """
+        Locks a key in the cache, so that only one of the processes
+        sharing the cache produces the entry and the others can then get it
+        from the cache. If the lock can't be created, nothing is locked.
+
+        Args:
+            key: Key of the entry.
+        """
+        lock_path = self.cache_path / key[:2] / f".{key}.lock"
+        try:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o664)
+        except OSError as ex:
+            logger.debug(f"Not locking {key}: {ex!r}")
+            yield
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            # closing the file releases the lock
+            os.close(fd)
+
+    def remove(self, key: str) -> None:
+        """Removes an entry from the cache, if it's there."""
+        self._digest_path(key).unlink(missing_ok=True)
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def get(self, key: str, target: Union[str, Path], verify: bool = True) -> bool:
+        """
+        Provides the cached file as `target`.
+
+        Args:
+            key: Key of the entry.
+            target: Where to place the file, must not exist.
+            verify: Whether to check the content against the stored digest.
+
+        Returns:
+            Whether the entry was found in the cache and provided.
+        """
+        entry = self._entry_path(key)
+        digest_path = self._digest_path(key)
+        try:
+            hashtype, _, expected = digest_path.read_text().strip().partition(":")
+            if verify and hash_file(entry, hashtype) != expected:
+                logger.warning(f"Cached file {entry} is corrupted, dropping it.")
+                self.remove(key)
+                self.misses += 1
+                return False
+            target = Path(target)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            clone_file(entry, target)
+            os.utime(digest_path)
+        except (OSError, ValueError) as ex:
+            # missing (possibly just evicted) entry or an unknown hash type
+            logger.debug(f"Cache miss for {key}: {ex!r}")
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def put(
+        self,
+        key: str,
+        source: Union[str, Path],
+        digest: Optional[tuple[str, str]] = None,
+    ) -> bool:
+        """
+        Stores a file in the cache.
+
+        Args:
+            key: Key of the entry.
+            source: File to be stored.
+            digest: Expected `(hashtype, hexdigest)` of the file. The file is not
+                stored if it doesn't match. If not set, SHA-256 of the file
+                is computed and stored.
+
+        Returns:
+            Whether the file has been stored.
+        """
+        source = Path(source)
+        try:
+            if digest:
+                hashtype, expected = digest
+                if (actual := hash_file(source, hashtype)) != expected:
+                    logger.warning(
+                        f"{source.name} has {hashtype} digest {actual}, "
+                        f"expected {expected}, not caching it.",
+                    )
+                    return False
+            else:
+                hashtype, expected = "sha256", hash_file(source)
+            entry = self._entry_path(key)
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomically(entry, source)
+            self._write_atomically(
+                self._digest_path(key),
+                None,
+                f"{hashtype}:{expected}\n",
+            )
+        except (OSError, ValueError) as ex:
+            logger.warning(f"Failed to store {source} in the cache: {ex!r}")
+            return False
+        logger.debug(f"Stored {source.name} in the cache as {key}.")
+        self.evict()
+        return True
+
+    def get_text(self, key: str) -> Optional[str]:
+        """
+        Reads a small text entry, e.g. metadata of another entry. Unlike `get()`
+        it doesn't count as a hit or a miss.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            Content of the entry or `None` if it's not in the cache or corrupted.
+        """
+        digest_path = self._digest_path(key)
+        try:
+            text = self._entry_path(key).read_text()
+            hashtype, _, expected = digest_path.read_text().strip().partition(":")
+            if hashlib.new(hashtype, text.encode()).hexdigest() != expected:
+                return None
+            os.utime(digest_path)
+        except (OSError, ValueError):
+            return None
+        return text
+
+    def put_text(self, key: str, text: str) -> bool:
+        """
+        Stores a small text entry, see `get_text()`.
+
+        Args:
+            key: Key of the entry.
+            text: Content of the entry.
+
+        Returns:
+            Whether the entry has been stored.
+        """
+        try:
+            entry = self._entry_path(key)
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomically(entry, None, text)
+            self._write_atomically(
+                self._digest_path(key),
+                None,
+                f"sha256:{hashlib.sha256(text.encode()).hexdigest()}\n",
+            )
+        except OSError as ex:
+            logger.warning(f"Failed to store {key} in the cache: {ex!r}")
+            return False
+        return True
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits
+        into its size limit.
+        """
+        if self.size_limit is None or not self.cache_path.is_dir():
+            return
+        entries = []
+        total_size = 0
+        for path in self.cache_path.glob("*/*"):
+            if path.name.startswith(".") or path.name.endswith(DIGEST_SUFFIX):
+                continue
+            try:
+                size = path.stat().st_size
+                digest_path = path.with_name(f"{path.name}{DIGEST_SUFFIX}")
+                last_used = digest_path.stat().st_mtime
+            except FileNotFoundError:
+                # being written or removed concurrently
+                continue
+            entries.append((last_used, size, path.name))
+            total_size += size
+        if total_size <= self.size_limit:
+            return
+        for _, size, key in sorted(entries):
+            logger.debug(f"Evicting {key} from the cache.")
+            self.remove(key)
+            total_size -= size
+            if total_size <= self.size_limit:
+                break
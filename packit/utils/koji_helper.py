@@ -1,18 +1,196 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import copy
+import json
 import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from datetime import date, datetime
-from typing import Callable, Optional, Union
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
 
 import koji
 from specfile.changelog import ChangelogEntry
 from specfile.utils import NEVR
 
-from packit.constants import KOJI_BASEURL
+from packit.constants import (
+    KOJI_BASEURL,
+    KOJI_METADATA_CACHE_SIZE,
+    KOJI_METADATA_CACHE_TTL,
+)
 
 logger = logging.getLogger(__name__)
 
+# sidetags come and go, their metadata must not be cached
+SIDETAG_REGEX = re.compile(r".+-side-\d+$")
+
+CHANGELOG_HEADERS = ["changelogtime", "changelogname", "changelogtext"]
+
+
+class KojiMetadataCache:
+    """
+    Thread-safe TTL/LRU cache of answers to Koji calls that query static metadata
+    (build targets, tag inheritance and configuration), which change only
+    a few times per release cycle.
+
+    * Entries are keyed by the name and arguments of the call.
+    * Failed calls are not cached.
+    * If `path` is set, the cache is loaded from and saved to a JSON file there,
+      so that it can be shared by subsequent processes.
+    """
+
+    def __init__(
+        self,
+        ttl: float = KOJI_METADATA_CACHE_TTL,
+        maxsize: int = KOJI_METADATA_CACHE_SIZE,
+        path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        Args:
+            ttl: Time (in seconds) after which an entry expires.
+            maxsize: Maximum number of entries, the least recently used ones
+                are dropped first.
+            path: Path to a JSON file the cache is persisted in.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def __repr__(self) -> str:
+        return (
+            f"KojiMetadataCache(ttl={self.ttl}, maxsize={self.maxsize}, "
+            f"path={self.path})"
+        )
+
+    @staticmethod
+    def make_key(method: str, *args, **kwargs) -> str:
+        return f"{method}:{json.dumps([args, kwargs], sort_keys=True)}"
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path:
+            return
+        try:
+            entries = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            logger.debug(f"Failed to load Koji metadata cache {self.path}: {ex!r}")
+            return
+        now = time.time()
+        for key, (expires_at, value) in entries.items():
+            if expires_at > now:
+                self._entries[key] = (expires_at, value)
+        self._trim()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".{self.path.name}.",
+                dir=self.path.parent,
+            )
+        except OSError as ex:
+            logger.debug(f"Failed to save Koji metadata cache {self.path}: {ex!r}")
+            return
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except (OSError, TypeError, ValueError) as ex:
+            logger.debug(f"Failed to save Koji metadata cache {self.path}: {ex!r}")
+            Path(tmp).unlink(missing_ok=True)
+
+    def _trim(self) -> None:
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Gets a cached answer or fetches and caches a fresh one.
+
+        Args:
+            key: Key of the entry, see `make_key()`.
+            fetch: Function fetching the answer from Koji, exceptions
+                it raises are propagated.
+
+        Returns:
+            Copy of the answer.
+        """
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+        value = fetch()
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            self._trim()
+            self._save()
+        return value
+
+    def invalidate(self, method: Optional[str] = None) -> None:
+        """
+        Drops cached answers.
+
+        Args:
+            method: Name of the Koji call whose answers should be dropped.
+                If not set, the whole cache is cleared.
+        """
+        with self._lock:
+            # make sure entries persisted on disk are dropped as well
+            self._load()
+            if method is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k.startswith(f"{method}:")]:
+                    del self._entries[key]
+            self._save()
+
+
+# path -> Koji metadata cache persisted there
+_persisted_metadata_caches: dict[Path, KojiMetadataCache] = {}
+_persisted_metadata_caches_lock = threading.Lock()
+
+
+def get_metadata_cache(path: Optional[Union[str, Path]] = None) -> KojiMetadataCache:
+    """
+    Gets the Koji metadata cache shared by all Koji helpers in the process.
+
+    Args:
+        path: Path to a JSON file the cache is persisted in. If not set,
+            the cache is kept only in memory.
+
+    Returns:
+        The metadata cache.
+    """
+    if not path:
+        return KojiHelper.metadata_cache
+    path = Path(path)
+    with _persisted_metadata_caches_lock:
+        if path not in _persisted_metadata_caches:
+            _persisted_metadata_caches[path] = KojiMetadataCache(path=path)
+        return _persisted_metadata_caches[path]
+
 
 class SessionWrapper:
     def __init__(self) -> None:
@@ -58,10 +236,74 @@ class SessionWrapper:
 
         return wrapper
 
+    def multicall(self, calls: list[tuple[str, tuple, dict]]) -> list[Any]:
+        """
+        Performs multiple calls in a single XML-RPC round trip.
+
+        Args:
+            calls: List of calls in form of (method, args, kwargs) tuples.
+
+        Returns:
+            List of answers in the same order as the calls. Answers of failed
+            calls are the exceptions raised by them.
+        """
+        if not calls:
+            return []
+        reopened = False
+        while True:
+            try:
+                with self.session.multicall(strict=False) as m:
+                    virtual_calls = [
+                        getattr(m, method)(*args, **kwargs)
+                        for method, args, kwargs in calls
+                    ]
+            except koji.AuthError as e:
+                if reopened:
+                    return [e] * len(calls)
+                reopened = True
+                logger.debug(
+                    f"Koji session authentication error during multicall: {e}; "
+                    "opening new session",
+                )
+                self.session = self._open_session()
+                continue
+            except Exception as e:
+                return [e] * len(calls)
+            break
+        results: list[Any] = []
+        for virtual_call in virtual_calls:
+            try:
+                results.append(virtual_call.result)
+            except Exception as e:  # noqa: PERF203
+                results.append(e)
+        return results
+
 
 class KojiHelper:
-    def __init__(self) -> None:
+    # shared by all instances unless overridden
+    metadata_cache = KojiMetadataCache()
+
+    def __init__(self, metadata_cache: Optional[KojiMetadataCache] = None) -> None:
         self.session = SessionWrapper()
+        if metadata_cache is not None:
+            self.metadata_cache = metadata_cache
+
+    def _cached_call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Calls a Koji method querying static metadata through the metadata cache.
+
+        Args:
+            method: Name of the Koji method.
+            *args: Positional arguments of the call.
+            **kwargs: Keyword arguments of the call.
+
+        Returns:
+            Answer of the call.
+        """
+        return self.metadata_cache.get(
+            KojiMetadataCache.make_key(method, *args, **kwargs),
+            lambda: getattr(self.session, method)(*args, **kwargs),
+        )
 
     def get_builds(self, package: str, since: datetime) -> list[dict]:
         """
@@ -134,6 +376,49 @@ class KojiHelper:
             return None
         return builds[0]
 
+    def get_latest_builds_in_tags(
+        self,
+        queries: Iterable[tuple[str, str]],
+    ) -> dict[tuple[str, str], Optional[dict]]:
+        """
+        Gets the latest builds of packages tagged into the specified tags,
+        all in a single Koji round trip.
+
+        Args:
+            queries: Pairs of package name and Koji tag.
+
+        Returns:
+            Mapping of (package, tag) pairs to the latest build or None
+            if there is no such build.
+        """
+        queries = list(dict.fromkeys(queries))
+        answers = self.session.multicall(
+            [
+                (
+                    "listTagged",
+                    (),
+                    {
+                        "package": package,
+                        "tag": tag,
+                        "inherit": True,
+                        "latest": True,
+                        "strict": True,
+                    },
+                )
+                for package, tag in queries
+            ],
+        )
+        result: dict[tuple[str, str], Optional[dict]] = {}
+        for (package, tag), builds in zip(queries, answers):
+            if isinstance(builds, Exception):
+                logger.debug(
+                    f"Failed to get latest build of package {package} in tag {tag} "
+                    f"from Koji: {builds}",
+                )
+                builds = None
+            result[(package, tag)] = builds[0] if builds else None
+        return result
+
     def get_latest_nvr_in_tag(self, package: str, tag: str) -> Optional[str]:
         """
         Gets the latest build of a package tagged into the specified tag.
@@ -188,16 +473,59 @@ class KojiHelper:
         Returns:
             Latest build or None if there is no such build.
         """
-        if not (candidate_tag := self.get_candidate_tag(dist_git_branch)):
-            return None
-        tags = self.get_stable_tags(candidate_tag)
-        if include_candidate:
-            tags.append(candidate_tag)
-        return max(
-            (b for t in tags if (b := self.get_latest_build_in_tag(package, t))),
-            key=lambda b: NEVR.from_string(b["nvr"]),
-            default=None,
+        return self.get_latest_stable_builds(
+            [(package, dist_git_branch)],
+            include_candidate,
+        )[(package, dist_git_branch)]
+
+    def get_latest_stable_builds(
+        self,
+        queries: Iterable[tuple[str, str]],
+        include_candidate: bool = False,
+    ) -> dict[tuple[str, str], Optional[dict]]:
+        """
+        Gets the latest builds of packages tagged into any stable or, if requested,
+        the candidate tag for the given branches. Builds in all the tags are queried
+        in a single Koji round trip.
+
+        Args:
+            queries: Pairs of package name and dist-git branch name.
+            include_candidate: Whether to consider also builds tagged
+              into the corresponding candidate tags.
+
+        Returns:
+            Mapping of (package, dist-git branch) pairs to the latest build
+            or None if there is no such build.
+        """
+        queries = list(dict.fromkeys(queries))
+        branch_tags: dict[str, list[str]] = {}
+        for _, dist_git_branch in queries:
+            if dist_git_branch in branch_tags:
+                continue
+            if not (candidate_tag := self.get_candidate_tag(dist_git_branch)):
+                branch_tags[dist_git_branch] = []
+                continue
+            tags = self.get_stable_tags(candidate_tag)
+            if include_candidate:
+                tags.append(candidate_tag)
+            branch_tags[dist_git_branch] = tags
+        builds = self.get_latest_builds_in_tags(
+            (package, tag)
+            for package, dist_git_branch in queries
+            for tag in branch_tags[dist_git_branch]
         )
+        return {
+            (package, dist_git_branch): max(
+                (
+                    b
+                    for t in branch_tags[dist_git_branch]
+                    if (b := builds[(package, t)])
+                ),
+                key=lambda b: NEVR.from_string(b["nvr"]),
+                default=None,
+            )
+            for package, dist_git_branch in queries
+        }
 
     def get_latest_stable_nvr(
         self,
@@ -227,6 +555,33 @@ class KojiHelper:
             return None
         return build["nvr"]
 
+    def get_latest_stable_nvrs(
+        self,
+        queries: Iterable[tuple[str, str]],
+        include_candidate: bool = False,
+    ) -> dict[tuple[str, str], Optional[str]]:
+        """
+        Gets the NVRs of the latest builds of packages tagged into any stable or,
+        if requested, the candidate tag for the given branches. Builds in all the tags
+        are queried in a single Koji round trip.
+
+        Args:
+            queries: Pairs of package name and dist-git branch name.
+            include_candidate: Whether to consider also builds tagged
+              into the corresponding candidate tags.
+
+        Returns:
+            Mapping of (package, dist-git branch) pairs to the NVR of the latest
+            build or None if there is no such build.
+        """
+        return {
+            query: build["nvr"] if build else None
+            for query, build in self.get_latest_stable_builds(
+                queries,
+                include_candidate,
+            ).items()
+        }
+
     def get_build_tags(self, nvr: str) -> list[str]:
         """
         Gets tags the specified build is tagged into.
@@ -254,20 +609,64 @@ class KojiHelper:
         Returns:
             List of changelog entries in form of (timestamp, author, content) tuples.
         """
-        requested_headers = ["changelogtime", "changelogname", "changelogtext"]
         try:
             headers = self.session.getRPMHeaders(
                 rpmID=f"{nvr}.src",
-                headers=requested_headers,
+                headers=CHANGELOG_HEADERS,
                 strict=True,
             )
         except Exception as e:
             logger.debug(f"Failed to get changelog of build {nvr} from Koji: {e}")
             return []
+        return self._parse_changelog_headers(headers)
+
+    def get_builds_changelogs(
+        self,
+        nvrs: Iterable[str],
+    ) -> dict[str, list[tuple[int, str, str]]]:
+        """
+        Gets changelogs associated with SRPMs of the specified builds,
+        all in a single Koji round trip.
+
+        Args:
+            nvrs: NVRs of the builds.
+
+        Returns:
+            Mapping of NVRs to lists of changelog entries in form of
+            (timestamp, author, content) tuples.
+        """
+        nvrs = list(dict.fromkeys(nvrs))
+        answers = self.session.multicall(
+            [
+                (
+                    "getRPMHeaders",
+                    (),
+                    {
+                        "rpmID": f"{nvr}.src",
+                        "headers": CHANGELOG_HEADERS,
+                        "strict": True,
+                    },
+                )
+                for nvr in nvrs
+            ],
+        )
+        result: dict[str, list[tuple[int, str, str]]] = {}
+        for nvr, headers in zip(nvrs, answers):
+            if isinstance(headers, Exception):
+                logger.debug(
+                    f"Failed to get changelog of build {nvr} from Koji: {headers}",
+                )
+                result[nvr] = []
+            else:
+                result[nvr] = self._parse_changelog_headers(headers)
+        return result
+
+    @staticmethod
+    def _parse_changelog_headers(headers: dict) -> list[tuple[int, str, str]]:
         for k, v in headers.items():
             if not isinstance(v, list):
                 headers[k] = [v]
-        return list(zip(*[headers[h] for h in requested_headers]))
+        return list(zip(*[headers[h] for h in CHANGELOG_HEADERS]))
 
     def get_builds_in_tag(self, tag: str) -> list[dict]:
         """
@@ -319,7 +718,10 @@ class KojiHelper:
             Tag information or None if there is no such tag.
         """
         try:
-            info = self.session.getBuildConfig(tag)
+            if SIDETAG_REGEX.match(tag):
+                info = self.session.getBuildConfig(tag)
+            else:
+                info = self._cached_call("getBuildConfig", tag)
         except Exception as e:
             logger.debug(f"Failed to get tag info of {tag} from Koji: {e}")
             return None
@@ -429,7 +831,7 @@ class KojiHelper:
         """
         target_name = self.get_build_target_name(dist_git_branch)
         try:
-            target = self.session.getBuildTarget(target_name, strict=True)
+            target = self._cached_call("getBuildTarget", target_name, strict=True)
         except Exception as e:
             logger.debug(f"Failed to get build target {target_name} from Koji: {e}")
             return None
@@ -446,7 +848,7 @@ class KojiHelper:
             dist-git branch name or None if not found.
         """
         try:
-            target = self.session.getBuildTarget(target_name, strict=True)
+            target = self._cached_call("getBuildTarget", target_name, strict=True)
         except Exception as e:
             logger.debug(f"Failed to get build target {target_name} from Koji: {e}")
             return None
@@ -501,7 +903,7 @@ class KojiHelper:
             List of stable tags. Can be empty.
         """
         try:
-            ancestors = self.session.getFullInheritance(tag)
+            ancestors = self._cached_call("getFullInheritance", tag)
         except Exception as e:
             logger.debug(f"Failed to get inheritance of {tag} from Koji: {e}")
             return []
@@ -537,10 +939,10 @@ class KojiHelper:
             Formatted changelog as a string.
         """
         lines = []
-        for time, name, text in changelog:
-            if time <= since:
+        for changelog_time, name, text in changelog:
+            if changelog_time <= since:
                 break
-            timestamp = date.fromtimestamp(time)
+            timestamp = date.fromtimestamp(changelog_time)
             lines.append(
                 str(ChangelogEntry.assemble(timestamp, name, text.splitlines())),
             )
@@ -5,6 +5,7 @@ import configparser
 import logging
 import os
 from pathlib import Path
+from threading import Lock
 from typing import Union
 
 import pyrpkg
@@ -47,6 +48,10 @@ class LookasideCache:
                 "Failed to create a CGI for lookaside cache",
             ) from e
 
+        # digests of files keyed by their path, size and mtime
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._digests_lock = Lock()
+
     def _get_package(self, package: str) -> str:
         if self._config.get("lookaside_namespaced", False):
             return f"rpms/{package}"
@@ -56,6 +61,7 @@ class LookasideCache:
         self,
         basepath: Union[Path, str],
         package: str,
+        with_digests: bool = False,
     ) -> list[dict[str, str]]:
         """
         Gets URLs to sources stored in lookaside cache.
@@ -63,9 +69,11 @@ class LookasideCache:
         Args:
             basepath: Path to a dist-git repo containing the "sources" file.
             package: Package name.
+            with_digests: Whether to include hash and hash type of the sources.
 
         Returns:
-            List of dicts with path (filename) and URL.
+            List of dicts with path (filename) and URL and, if requested,
+            hash and hashtype.
 
         Raises:
             PackitLookasideCacheException, if parsing the "sources" file fails.
@@ -82,16 +90,62 @@ class LookasideCache:
                 entry.hash,
                 entry.hashtype,
             )
-            result.append({"path": entry.file, "url": url})
+            source = {"path": entry.file, "url": url}
+            if with_digests:
+                source.update(hash=entry.hash, hashtype=entry.hashtype)
+            result.append(source)
         return result
 
+    def hash_file(self, path: Union[Path, str]) -> str:
+        """
+        Computes hash of a file, using the hash type of the lookaside cache.
+
+        The hash is computed only once for a file unless it changes.
+
+        Args:
+            path: Path to the file.
+
+        Returns:
+            Hex digest of the file.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        with self._digests_lock:
+            if digest := self._digests.get(key):
+                return digest
+        digest = self.cache.hash_file(path)
+        with self._digests_lock:
+            self._digests[key] = digest
+        return digest
+
+    @staticmethod
+    def get_source_names(basepath: Union[Path, str]) -> set[str]:
+        """
+        Gets names of the files listed in the "sources" file.
+
+        Args:
+            basepath: Path to a dist-git repo containing the "sources" file.
+
+        Returns:
+            Set of filenames, empty if there is no "sources" file.
+
+        Raises:
+            PackitLookasideCacheException, if parsing the "sources" file fails.
+        """
+        try:
+            sources = pyrpkg.sources.SourcesFile(Path(basepath) / "sources", "bsd")
+        except (pyrpkg.errors.MalformedLineError, ValueError) as e:
+            raise PackitLookasideCacheException("Failed to parse sources") from e
+        return {entry.file for entry in sources.entries}
+
     def is_archive_uploaded(self, package: str, archive_path: Union[Path, str]) -> bool:
         """
         We are using a name to check the presence in the lookaside cache.
         (This is the same approach fedpkg itself uses.)
         """
         archive_name = os.path.basename(archive_path)
-        archive_hash = self.cache.hash_file(archive_path)
+        archive_hash = self.hash_file(archive_path)
 
         return self.cache.remote_file_exists_head(
             name=self._get_package(package),
@@ -1,25 +1,35 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import fcntl
 import logging
+import os
 import re
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
+import weakref
 from collections.abc import Generator
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Union, cast
 
 import git
 import yaml
-from git.exc import GitCommandError
+from cachetools import LRUCache
+from git.exc import GitCommandError, GitError
 from ogr.parsing import RepoUrl, parse_git_repo
 
-from packit.constants import COMMIT_ACTION_DIVIDER
+from packit.constants import COMMIT_ACTION_DIVIDER, GIT_OBJECT_CACHE_SIZE
 from packit.exceptions import PackitException
 
 logger = logging.getLogger(__name__)
 
+# lines 'git patch-id' considers to be headers of a new commit
+PATCH_ID_HEADER_RE = re.compile(rb"^((?:commit|From) )", flags=re.MULTILINE)
+
 
 class RepositoryCache:
     """
@@ -28,31 +38,217 @@ class RepositoryCache:
     * The cache is located in the specified directory
       and contains separate git repository for each project.
     * Project name is used to match the git project in the cache.
+    * Workers sharing the cache coordinate using file locks next to the cached
+      repositories (`.<project>.lock`). If the cache is read-only, no locking
+      is done.
+    * Cached repositories are fetched on demand once they are older than
+      `refresh_interval`, so that the clones can borrow as much as possible.
+    * If `size_limit` is set, the least recently used repositories
+      are evicted when the cache grows over the limit. The clones are then
+      dissociated from the cached repositories (`--dissociate`), so that
+      they keep working when the repository they were cloned from is evicted.
+    * A repository that can't be used as a reference (e.g. it's corrupted)
+      is dropped and the clone is made without the cache.
     """
 
-    def __init__(self, cache_path: Union[str, Path], add_new=False) -> None:
+    def __init__(
+        self,
+        cache_path: Union[str, Path],
+        add_new=False,
+        refresh_interval: Optional[int] = None,
+        size_limit: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            cache_path: Directory of the cache.
+            add_new: Whether to add repositories that are not in the cache yet.
+            refresh_interval: Fetch cached repositories not fetched for this
+                number of seconds. No fetching is done if not set.
+            size_limit: Maximum size of the cache in bytes, unlimited if not set.
+        """
         self.cache_path = (
             Path(cache_path) if isinstance(cache_path, str) else cache_path
         )
         self.add_new = add_new
+        self.refresh_interval = refresh_interval
+        self.size_limit = size_limit
         logger.debug(
             f"Instantiation of the repository cache at {self.cache_path}. "
             f"New projects will {'not ' if not self.add_new else ''}be added.",
         )
         self.projects_added: list[str] = []
         self.projects_cloned_using_cache: list[str] = []
+        self.projects_refreshed: list[str] = []
+        self.projects_evicted: list[str] = []
+        self.hits = 0
+        self.misses = 0
+        # size of the packs of the reference repos that clones did not need to fetch
+        self.bytes_saved = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Statistics of the cache usage."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "added": len(self.projects_added),
+            "refreshed": len(self.projects_refreshed),
+            "evicted": len(self.projects_evicted),
+        }
 
     @property
     def cached_projects(self) -> list[str]:
         """Project names we have in the cache."""
         if not self.cache_path.is_dir():
             self.cache_path.mkdir(parents=True)
-        return [f.name for f in self.cache_path.iterdir() if f.is_dir()]
+        return [
+            f.name
+            for f in self.cache_path.iterdir()
+            if f.is_dir() and not f.name.startswith(".")
+        ]
 
     def _clone(self, **kwargs) -> git.Repo:
         """Wrapper around git function so we are able to check the call in tests more easily."""
         return git.repo.Repo.clone_from(**kwargs)
 
+    @contextmanager
+    def _lock(
+        self,
+        project_name: str,
+        shared: bool = False,
+        blocking: bool = True,
+    ) -> Generator[bool, None, None]:
+        """
+        Locks a project in the cache. Acquiring the lock marks the project
+        as recently used.
+
+        Args:
+            project_name: Name of the project (or other name of the lock).
+            shared: Whether to acquire a shared lock instead of an exclusive one.
+            blocking: Whether to wait for the lock.
+
+        Yields:
+            Whether the lock has been acquired. If the lock file can't be
+            created (read-only cache), `True` is yielded without locking.
+        """
+        lock_path = self.cache_path.joinpath(f".{project_name}.lock")
+        try:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o664)
+        except OSError as ex:
+            logger.debug(f"Not locking {project_name} in the repository cache: {ex!r}")
+            yield True
+            return
+        try:
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(fd, flags)
+            except BlockingIOError:
+                yield False
+                return
+            os.utime(fd)
+            yield True
+        finally:
+            # closing the file releases the lock
+            os.close(fd)
+
+    def _add(self, url: str, project_name: str, reference_repo: Path) -> None:
+        with self._lock(project_name):
+            # another worker might have added it while we were waiting
+            if Path(reference_repo).is_dir():
+                if self._is_valid(reference_repo):
+                    return
+                shutil.rmtree(reference_repo)
+            logger.debug(f"Creating reference repo: {reference_repo}")
+            self._clone(url=url, to_path=str(reference_repo), tags=True)
+            self.projects_added.append(project_name)
+        self.evict()
+
+    @staticmethod
+    def _is_valid(reference_repo: Path) -> bool:
+        try:
+            return git.Repo(str(reference_repo)).head.is_valid()
+        except (GitError, OSError, ValueError):
+            return False
+
+    @staticmethod
+    def _get_git_dir(reference_repo: Path) -> Path:
+        git_dir = Path(reference_repo, ".git")
+        return git_dir if git_dir.is_dir() else Path(reference_repo)
+
+    def _refresh(self, project_name: str, reference_repo: Path) -> None:
+        """Fetch the cached repository if it hasn't been fetched recently."""
+        if self.refresh_interval is None:
+            return
+        git_dir = self._get_git_dir(reference_repo)
+        try:
+            last_fetch = max(
+                p.stat().st_mtime
+                for p in (git_dir / "FETCH_HEAD", git_dir / "HEAD")
+                if p.exists()
+            )
+        except (OSError, ValueError):
+            return
+        if time.time() - last_fetch < self.refresh_interval:
+            return
+        # clones can borrow objects while the repository is being fetched,
+        # just make sure we don't fetch it multiple times at once
+        with self._lock(f"{project_name}.refresh", blocking=False) as locked:
+            if not locked:
+                return
+            # shared lock prevents eviction of the repository while fetching
+            with self._lock(project_name, shared=True):
+                logger.debug(f"Refreshing reference repo: {reference_repo}")
+                try:
+                    repo = git.Repo(str(reference_repo))
+                    # clones borrow objects, don't let gc prune any of them
+                    repo.git.config("gc.auto", "0")
+                    repo.git.fetch("--tags", "--force", "origin")
+                except (GitError, OSError, ValueError) as ex:
+                    logger.warning(f"Failed to refresh {reference_repo}: {ex!r}")
+                    return
+            self.projects_refreshed.append(project_name)
+
+    @staticmethod
+    def _get_size(path: Path) -> int:
+        size = 0
+        for root, _, files in os.walk(path):
+            for file in files:
+                with suppress(OSError):
+                    size += os.lstat(os.path.join(root, file)).st_size
+        return size
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used projects from the cache
+        until it fits into the size limit.
+        """
+        if self.size_limit is None:
+            return
+        projects = []
+        for project_name in self.cached_projects:
+            lock_path = self.cache_path.joinpath(f".{project_name}.lock")
+            try:
+                last_used = lock_path.stat().st_mtime
+            except OSError:
+                last_used = 0
+            size = self._get_size(self.cache_path.joinpath(project_name))
+            projects.append((last_used, size, project_name))
+        total_size = sum(size for _, size, _ in projects)
+        for _, size, project_name in sorted(projects):
+            if total_size <= self.size_limit:
+                break
+            # skip projects in use
+            with self._lock(project_name, blocking=False) as locked:
+                if not locked:
+                    continue
+                logger.debug(f"Evicting {project_name} from the repository cache.")
+                shutil.rmtree(self.cache_path.joinpath(project_name))
+                total_size -= size
+                self.projects_evicted.append(project_name)
+
     def get_repo(
         self,
         url: str,
@@ -86,23 +282,172 @@ class RepositoryCache:
 
         project_name = RepoUrl.parse(url).repo
         reference_repo = self.cache_path.joinpath(project_name)
-        if project_name not in cached_projects and self.add_new:
-            logger.debug(f"Creating reference repo: {reference_repo}")
-            self._clone(url=url, to_path=str(reference_repo), tags=True)
-            self.projects_added.append(project_name)
+        if project_name in cached_projects:
+            self.hits += 1
+            self._refresh(project_name, reference_repo)
+        else:
+            self.misses += 1
+            if self.add_new:
+                self._add(url, project_name, reference_repo)
 
         if self.add_new or project_name in cached_projects:
             logger.debug(f"Using reference repo: {reference_repo}")
-            self.projects_cloned_using_cache.append(project_name)
-            return self._clone(
-                url=url,
-                to_path=directory,
-                tags=True,
-                reference=str(reference_repo),
-            )
+            # shared lock prevents eviction of the repository while cloning
+            with self._lock(project_name, shared=True):
+                try:
+                    repo = self._clone(
+                        url=url,
+                        to_path=directory,
+                        tags=True,
+                        reference=str(reference_repo),
+                        # don't borrow objects from a repository that can be evicted
+                        **({"dissociate": True} if self.size_limit is not None else {}),
+                    )
+                except GitCommandError as ex:
+                    logger.warning(
+                        f"Cloning using reference repo {reference_repo} failed: {ex!r}",
+                    )
+                    repo = None
+            if repo is not None:
+                self.projects_cloned_using_cache.append(project_name)
+                if project_name in cached_projects:
+                    self.bytes_saved += sum(
+                        p.stat().st_size
+                        for p in self._get_git_dir(reference_repo).glob(
+                            "objects/pack/*.pack",
+                        )
+                    )
+                logger.debug(f"Repository cache stats: {self.stats}")
+                return repo
+            self._drop_if_invalid(project_name, reference_repo)
 
         return self._clone(url=url, to_path=directory, tags=True)
 
+    def _drop_if_invalid(self, project_name: str, reference_repo: Path) -> None:
+        with self._lock(project_name, blocking=False) as locked:
+            if locked and not self._is_valid(reference_repo):
+                logger.warning(f"Removing invalid reference repo {reference_repo}.")
+                shutil.rmtree(reference_repo, ignore_errors=True)
+
+
+class GitObjectReader:
+    """
+    Reads objects of a git repository through the long-lived
+    `git cat-file --batch` and `--batch-check` processes GitPython keeps
+    for the repository, instead of spawning `git` for every read.
+
+    * There is a single reader per repository, see `for_repo()`.
+    * Objects are immutable, so their contents are kept in an LRU cache keyed
+      by SHA. Revisions (e.g. `HEAD:path`) are resolved on every read,
+      because refs move.
+    * The persistent processes can't be shared by multiple threads,
+      calls are serialized.
+    """
+
+    _readers: "weakref.WeakKeyDictionary[git.Repo, GitObjectReader]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _readers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        repo: git.Repo,
+        cache_size: int = GIT_OBJECT_CACHE_SIZE,
+    ) -> None:
+        """
+        Args:
+            repo: Repository to read objects from.
+            cache_size: Total size (in bytes) of cached object contents.
+        """
+        # don't keep a reference to the repo, it's a key of `_readers`
+        self.git = repo.git
+        self._cache: LRUCache = LRUCache(maxsize=cache_size, getsizeof=len)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_repo(cls, repo: git.Repo) -> "GitObjectReader":
+        """Gets the reader of the repository, creates it if needed."""
+        with cls._readers_lock:
+            if (reader := cls._readers.get(repo)) is None:
+                reader = cls._readers[repo] = cls(repo)
+            return reader
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Drops all the readers and the persistent git processes they talk to.
+        Meant to be called in a forked process, which must not share
+        the processes (nor the possibly held locks) with its parent.
+        """
+        for reader in list(cls._readers.values()):
+            reader.git.clear_cache()
+        cls._readers = weakref.WeakKeyDictionary()
+        cls._readers_lock = threading.Lock()
+
+    def resolve(self, rev: str) -> Optional[tuple[str, str, int]]:
+        """
+        Resolves a revision to an object, see `gitrevisions(7)`.
+
+        Args:
+            rev: Revision, e.g. `HEAD`, `origin/main:path/to/file` or `v1.0^{commit}`.
+
+        Returns:
+            SHA, type and size of the object or None if it doesn't exist.
+        """
+        with self._lock:
+            try:
+                # annotated as str by GitPython, but the header is not decoded
+                hexsha, type_, size = cast(
+                    tuple[bytes, bytes, int],
+                    self.git.get_object_header(rev),
+                )
+            except ValueError:
+                return None
+        return hexsha.decode(), type_.decode(), size
+
+    def read(self, rev: str) -> Optional[tuple[str, str, bytes]]:
+        """
+        Reads an object.
+
+        Args:
+            rev: Revision, see `resolve()`.
+
+        Returns:
+            SHA, type and content of the object or None if it doesn't exist.
+        """
+        if not (header := self.resolve(rev)):
+            return None
+        hexsha, type_, _ = header
+        with self._lock:
+            if (data := self._cache.get(hexsha)) is None:
+                try:
+                    _, _, _, data = self.git.get_object_data(hexsha)
+                except ValueError:
+                    return None
+                with suppress(ValueError):
+                    # objects larger than the whole cache are not cached
+                    self._cache[hexsha] = data
+        return hexsha, type_, data
+
+    def read_blob(self, rev: str) -> Optional[bytes]:
+        """
+        Reads content of a file.
+
+        Args:
+            rev: Revision of the file, e.g. `HEAD:path/to/file` or blob SHA.
+
+        Returns:
+            Content of the file or None if there is no such file.
+        """
+        obj = self.read(rev)
+        if not obj or obj[1] != "blob":
+            return None
+        return obj[2]
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
 
 def is_git_repo(directory: Union[Path, str]) -> bool:
     """
@@ -135,11 +480,7 @@ def get_namespace_and_repo_name(url: str) -> tuple[Optional[str], str]:
 
 
 def is_a_git_ref(repo: git.Repo, ref: str) -> bool:
-    try:
-        commit = repo.commit(ref)
-        return bool(commit)
-    except git.BadName:
-        return False
+    return GitObjectReader.for_repo(repo).resolve(f"{ref}^{{commit}}") is not None
 
 
 def get_default_branch(repository: git.Repo) -> str:
@@ -253,6 +594,40 @@ def git_patch_ish(patch: str) -> str:
     return patch
 
 
+def git_patch_ids(repo: git.Repo, patches: list[bytes]) -> list[Optional[str]]:
+    """
+    Calculate stable patch-ids of multiple patches with a single 'git patch-id' call.
+
+    Every patch is preceded by a 'commit <index>' header in the input stream
+    so that the patch-ids can be paired with the patches. Lines in the patches
+    which 'git patch-id' would take for such a header are escaped, they are not
+    a part of the diff and so they don't change the patch-id.
+
+    If a patch (e.g. with squashed commits) contains multiple diffs,
+    the patch-id of the first one is returned.
+
+    :param repo: Git repo to work in.
+    :param patches: Patches to calculate patch-ids of.
+    :return: List of patch-ids in the same order as the patches,
+             None for patches without any diff.
+    """
+    with tempfile.TemporaryFile() as fp:
+        for index, patch in enumerate(patches):
+            fp.write(f"commit {index:040x}\n".encode())
+            fp.write(PATCH_ID_HEADER_RE.sub(rb">\1", patch))
+            fp.write(b"\n")
+        fp.seek(0)
+        output = repo.git.patch_id("--stable", istream=fp)
+
+    patch_ids: list[Optional[str]] = [None] * len(patches)
+    for line in output.splitlines():
+        patch_id, commit = line.split()
+        index = int(commit, 16)
+        if index < len(patch_ids) and patch_ids[index] is None:
+            patch_ids[index] = patch_id
+    return patch_ids
+
+
 def get_message_from_metadata(metadata: dict, header: Optional[str] = None) -> str:
     if not isinstance(metadata, dict):
         raise PackitException(
@@ -369,12 +744,7 @@ def commit_exists(repo: git.Repo, commit: str) -> bool:
     Returns:
         Whether a commit with such hash exists
     """
-    try:
-        list(repo.iter_commits(f"{commit}..{commit}"))
-    except GitCommandError:
-        return False
-    else:
-        return True
+    return GitObjectReader.for_repo(repo).resolve(f"{commit}^{{commit}}") is not None
 
 
 def get_commit_diff(commit: git.Commit) -> list[git.Diff]:
@@ -499,6 +869,46 @@ def commit_message_file(
         yield fp.name
 
 
+@contextmanager
+def git_worktree(
+    repo: git.Repo,
+    ref: str = "HEAD",
+    directory: Union[Path, str, None] = None,
+) -> Generator[git.Repo, None, None]:
+    """Context manager to yield a temporary worktree of a repository
+
+    The worktree shares objects and refs with the repository, so creating it
+    is cheap, but it has its own working tree, index and HEAD, so it can be
+    worked with independently of the repository and of other worktrees.
+
+    Args:
+        repo: Repository to create the worktree for.
+        ref: Git ref to be checked out (detached) in the worktree.
+        directory: Path of the worktree, a temporary directory is used if not set.
+            The directory must not exist.
+
+    Yields:
+        Repository object of the worktree.
+    """
+    tmpdir = None
+    if directory is None:
+        tmpdir = tempfile.mkdtemp(prefix="packit-worktree-")
+        directory = Path(tmpdir) / Path(repo.working_tree_dir).name
+    logger.debug(f"Creating worktree of {repo.working_tree_dir} at {directory}.")
+    repo.git.worktree("add", "--detach", str(directory), ref)
+    try:
+        yield git.Repo(directory)
+    finally:
+        try:
+            repo.git.worktree("remove", "--force", str(directory))
+        except GitCommandError as ex:
+            logger.warning(f"Failed to remove worktree {directory}: {ex!r}")
+            shutil.rmtree(directory, ignore_errors=True)
+            repo.git.worktree("prune")
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
 def get_commit_message_from_action(
     output: Optional[list[str]],
     default_title: str,
@@ -14,6 +14,7 @@ import packit.config.aliases
 from packit.config import JobConfig, PackageConfig
 from packit.config.aliases import Distro
 from packit.utils.commands import cwd
+from packit.utils.koji_helper import KojiHelper
 from packit.utils.repo import create_new_repo
 from tests.spellbook import (
     DG_OGR,
@@ -34,6 +35,12 @@ def bugzilla_mock():
     flexmock(Bugzilla).new_instances(flexmock(query=lambda *_, **__: []))
 
 
+@pytest.fixture(autouse=True)
+def koji_metadata_cache():
+    # don't let answers of mocked Koji sessions leak into other tests
+    KojiHelper.metadata_cache.invalidate()
+
+
 @pytest.fixture()
 def mock_get_aliases():
     flexmock(packit.config.aliases).should_receive("get_aliases").and_return(
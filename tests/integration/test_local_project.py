@@ -1,14 +1,16 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
+import os
 import subprocess
 from pathlib import Path
 
+import git
 import pytest
 from flexmock import flexmock
 from ogr import GithubService, GitlabService
 
 from packit.local_project import LocalProject
-from packit.utils.repo import create_new_repo
+from packit.utils.repo import RepositoryCache, create_new_repo, git_worktree
 from tests.spellbook import initiate_git_repo
 
 
@@ -118,3 +120,66 @@ def test_pr_id_and_ref_gitlab(tmp_path: Path):
         .decode()
         == f"pr/{pr_id}"
     )
+
+
+def test_repository_cache_refresh(tmp_path: Path):
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    initiate_git_repo(upstream)
+    cache_path = tmp_path / "cache"
+    reference_repo = cache_path / "package"
+    subprocess.check_call(["git", "clone", str(upstream), str(reference_repo)])
+    subprocess.check_call(
+        ["git", "commit", "--allow-empty", "-m", "new commit"],
+        cwd=upstream,
+    )
+    new_commit = (
+        subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=upstream)
+        .decode()
+        .strip()
+    )
+    # pretend the reference repo was cloned a long time ago
+    os.utime(reference_repo / ".git" / "HEAD", (0, 0))
+
+    url = "https://example.com/namespace/package"
+    flexmock(RepositoryCache).should_receive("_clone").with_args(
+        url=url,
+        to_path=str(tmp_path / "clone"),
+        tags=True,
+        reference=str(reference_repo),
+    ).and_return(flexmock()).once()
+
+    repo_cache = RepositoryCache(cache_path=cache_path, refresh_interval=3600)
+    assert repo_cache.get_repo(url, directory=tmp_path / "clone")
+
+    assert repo_cache.projects_refreshed == ["package"]
+    assert repo_cache.stats["hits"] == 1
+    subprocess.check_call(
+        ["git", "cat-file", "-e", new_commit],
+        cwd=reference_repo,
+    )
+
+
+def test_git_worktree(tmp_path: Path):
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    initiate_git_repo(upstream)
+    repo = git.Repo(upstream)
+    branch = repo.active_branch.name
+
+    with git_worktree(repo) as worktree:
+        worktree_dir = Path(worktree.working_tree_dir)
+        assert worktree_dir.name == "upstream"
+        assert worktree.head.is_detached
+        assert worktree.head.commit == repo.head.commit
+        (worktree_dir / "new-file").write_text("content")
+        worktree.git.add("new-file")
+        worktree.git.commit("-m", "commit in the worktree")
+        worktree.git.branch("worktree-branch")
+
+    assert not worktree_dir.exists()
+    assert repo.active_branch.name == branch
+    assert not (upstream / "new-file").exists()
+    # refs are shared with the repository
+    assert "worktree-branch" in repo.heads
+    assert len(repo.git.worktree("list").splitlines()) == 1
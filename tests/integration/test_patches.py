@@ -11,6 +11,7 @@ from flexmock import flexmock
 
 from packit.exceptions import PackitException
 from packit.patches import PatchGenerator, PatchMetadata
+from packit.utils.repo import git_patch_ids
 from tests.spellbook import DATA_DIR
 
 TESTS_DIR = str(Path(__file__).parent.parent)
@@ -80,6 +81,23 @@ def test_undo_identical(git_repo):
     ]
 
 
+def test_git_patch_ids(git_repo):
+    paths = [
+        Path(git_repo.working_tree_dir, name)
+        for name in ("missing-diff-line.patch", "git-diff.patch")
+    ]
+    expected = []
+    for path in paths:
+        with open(path, "rb") as fp:
+            expected.append(git_repo.git.patch_id("--stable", istream=fp).split()[0])
+
+    patch_ids = git_patch_ids(
+        git_repo,
+        [path.read_bytes() for path in paths] + [b"no diff here\n"],
+    )
+    assert patch_ids == [*expected, None]
+
+
 @pytest.fixture
 def source_git_repo(tmp_path: Path) -> git.Repo:
     repo_dir = tmp_path.joinpath("src/hello")
@@ -222,3 +240,23 @@ def test_fail_if_not_adjacent(source_git_repo: git.Repo, dist_git_repo: git.Repo
             destination=dist_git_repo.working_dir,
         )
     assert "Non-adjacent patches" in str(ex)
+
+
+def test_get_empty_commits(source_git_repo: git.Repo):
+    readme = Path(source_git_repo.working_dir, "README.md")
+    readme.write_text(f"{readme.read_text()}\nA change.\n")
+    source_git_repo.git.add("README.md")
+    source_git_repo.git.commit("-mA change")
+    source_git_repo.git.commit("--allow-empty", "-mAn empty commit")
+    readme.chmod(0o755)
+    source_git_repo.git.commit("-a", "-mA mode change")
+
+    local_project = flexmock(
+        git_repo=source_git_repo,
+        ref="HEAD",
+        working_dir=source_git_repo.working_dir,
+    )
+    commits = PatchGenerator(local_project).get_commits_in_range("HEAD~3..HEAD")
+    assert PatchGenerator(local_project).get_empty_commits(commits) == {
+        commits[1].hexsha,
+    }
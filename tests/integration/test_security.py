@@ -67,3 +67,31 @@ def test_allowed_gpg_keys_not_existing_key(
     with pytest.raises(PackitException) as ex:
         api_instance_source_git.up.check_last_commit()
     assert "Cannot receive a gpg key" in str(ex)
+
+
+def test_allowed_gpg_keys_keyring_cache(
+    api_instance_source_git: PackitAPI,
+    gnupg_instance: GPG,
+    gnupg_key_fingerprint: str,
+    tmp_path,
+):
+    api_instance_source_git.up.local_project.git_repo.git.commit(
+        message="signed commit",
+        gpg_sign=gnupg_key_fingerprint,
+        allow_empty=True,
+    )
+    # the public key is only in the keyring cache
+    keyring_cache = tmp_path / "keyring-cache"
+    keyring_cache.mkdir(mode=0o700)
+    GPG(gnupghome=str(keyring_cache)).import_keys(
+        gnupg_instance.export_keys(gnupg_key_fingerprint),
+    )
+    remove_gpg_key_pair(
+        gpg_binary=gnupg_instance.gpgbinary,
+        fingerprint=gnupg_key_fingerprint,
+    )
+    flexmock(CommitVerifier).should_receive("receive_key").never()
+
+    api_instance_source_git.up.config.gpg_keyring_cache = str(keyring_cache)
+    api_instance_source_git.up.allowed_gpg_keys = [gnupg_key_fingerprint]
+    api_instance_source_git.up.check_last_commit()
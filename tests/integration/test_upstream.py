@@ -232,6 +232,37 @@ def test_create_archive(upstream_instance, extension):
     assert len(list(u.glob("*.tar.gz"))) == 1
 
 
+def test_create_archive_cached(upstream_instance, tmp_path):
+    u, ups = upstream_instance
+    ups.config.archive_cache = str(tmp_path / "archive-cache")
+
+    archive = ups.create_archive()
+    content = u.joinpath(archive).read_bytes()
+
+    # the tree hasn't changed, the archive is taken from the cache
+    u.joinpath(archive).unlink()
+    subprocess.check_call(
+        ["git", "commit", "--allow-empty", "-m", "Nothing new"],
+        cwd=u,
+    )
+    assert ups.create_archive() == archive
+    assert u.joinpath(archive).read_bytes() == content
+    assert (ups.archive_cache.hits, ups.archive_cache.misses) == (1, 1)
+
+    # the attributes of the repository change the archive, not the tree
+    u.joinpath(".git/info/attributes").write_text("README export-ignore\n")
+    ups.create_archive()
+    assert u.joinpath(archive).read_bytes() != content
+    assert (ups.archive_cache.hits, ups.archive_cache.misses) == (1, 2)
+    u.joinpath(".git/info/attributes").unlink()
+
+    u.joinpath("README").write_text("\nEven better now!\n")
+    subprocess.check_call(["git", "commit", "-am", "More awesome changes"], cwd=u)
+    ups.create_archive()
+    assert u.joinpath(archive).read_bytes() != content
+    assert (ups.archive_cache.hits, ups.archive_cache.misses) == (1, 3)
+
+
 @pytest.mark.parametrize(
     "with_create_archive_action",
     (False, True),
@@ -673,7 +704,7 @@ def test_get_last_tag_matching_config(
 )
 def test_get_archive_root_dir(template, expected_output, upstream_instance):
     u, ups = upstream_instance
-    flexmock(packit.upstream.tarfile).should_receive("is_tarfile").and_return(False)
+    flexmock(Archive).should_receive("get_archive_root_dir_from_tar").and_return(None)
     ups.package_config.archive_root_dir_template = template
 
     archive = ups.create_archive()
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import pathlib
+from contextlib import nullcontext
 from contextlib import suppress as does_not_raise
 
 import pytest
@@ -789,3 +790,143 @@ def test_get_local_archives_to_upload_skips_git_tracked(
     result = api_mock.get_local_archives_to_upload()
 
     assert result == [tmp_path / name for name in expected_to_upload]
+
+
+@pytest.mark.parametrize(
+    "sources_file, in_lookaside, expected",
+    [
+        pytest.param(
+            None,
+            None,
+            True,
+            id="no-sources-file",
+        ),
+        pytest.param(
+            "SHA512 (pkg-1.0.tar.gz) = 1234\n",
+            None,
+            True,
+            id="archive-missing-in-sources-file",
+        ),
+        pytest.param(
+            "SHA512 (pkg-1.0.tar.gz) = 1234\nSHA512 (pkg-extra.tar.gz) = 5678\n",
+            {"pkg-1.0.tar.gz": True, "pkg-extra.tar.gz": False},
+            True,
+            id="archive-missing-in-lookaside",
+        ),
+        pytest.param(
+            "SHA512 (pkg-1.0.tar.gz) = 1234\nSHA512 (pkg-extra.tar.gz) = 5678\n",
+            {"pkg-1.0.tar.gz": True, "pkg-extra.tar.gz": True},
+            False,
+            id="all-uploaded",
+        ),
+    ],
+)
+def test_should_archives_be_uploaded_to_lookaside(
+    api_mock,
+    tmp_path,
+    sources_file,
+    in_lookaside,
+    expected,
+):
+    if sources_file:
+        # ``local_project_mock`` in conftest stubs ``Path.write_text`` to a no-op
+        with open(tmp_path / "sources", "w") as f:
+            f.write(sources_file)
+    archives = [tmp_path / "pkg-1.0.tar.gz", tmp_path / "pkg-extra.tar.gz"]
+    api_mock.dg.should_receive("local_project").and_return(
+        flexmock(working_dir=tmp_path),
+    )
+    if in_lookaside is None:
+        api_mock.dg.should_receive("is_archive_in_lookaside_cache").never()
+    else:
+        api_mock.dg.should_receive("is_archive_in_lookaside_cache").replace_with(
+            lambda archive: in_lookaside[archive.name],
+        ).times(len(archives))
+
+    assert api_mock.should_archives_be_uploaded_to_lookaside(archives) is expected
+
+
+@pytest.mark.parametrize(
+    "dist_git_branches, groups",
+    [
+        pytest.param(
+            {"rawhide": None, "f40": None, "f39": None},
+            [["rawhide"], ["f40"], ["f39"]],
+            id="independent",
+        ),
+        pytest.param(
+            {"rawhide": {"f41"}, "f41": None, "f40": {"f39"}, "f39": None},
+            [["rawhide", "f41"], ["f40", "f39"]],
+            id="shared-targets",
+        ),
+        pytest.param(
+            {"a": {"x"}, "b": {"y"}, "c": {"x", "y"}},
+            [["a", "b", "c"]],
+            id="transitive",
+        ),
+    ],
+)
+def test_group_branches_sharing_targets(dist_git_branches, groups):
+    assert [
+        [branch for branch, _ in group]
+        for group in api._group_branches_sharing_targets(dist_git_branches)
+    ] == groups
+
+
+def test_sync_release_parallel_local_content(api_mock):
+    with pytest.raises(PackitException):
+        api_mock.sync_release_parallel(
+            dist_git_branches={"rawhide": None, "f40": None},
+            jobs=2,
+            use_local_content=True,
+        )
+
+
+def test_sync_release_in_worktree():
+    def sync_release(dist_git_branch, fast_forward_merge_branches, **_):
+        if dist_git_branch == "f39":
+            raise ReleaseSkippedPackitException("already synced")
+        if dist_git_branch == "f38":
+            raise PackitException("boom")
+        return flexmock(url="pr-rawhide"), {"f41": flexmock(url="pr-f41")}
+
+    worktree_api = flexmock(sync_release=sync_release)
+    parent_api = flexmock()
+    parent_api.should_receive("worktree_api").and_return(
+        nullcontext(worktree_api),
+    ).once()
+    api._parallel_sync_api = parent_api
+    try:
+        results = api._sync_release_in_worktree(
+            [("rawhide", {"f41"}), ("f39", None), ("f38", None)],
+            flexmock(),
+            {"create_pr": True},
+        )
+    finally:
+        api._parallel_sync_api = None
+
+    assert results == [
+        api.SyncReleaseResult(
+            "rawhide",
+            "synced",
+            pr_url="pr-rawhide",
+            ff_pr_urls={"f41": "pr-f41"},
+        ),
+        api.SyncReleaseResult("f39", "skipped", message="already synced"),
+        api.SyncReleaseResult("f38", "failed", message="boom"),
+    ]
+
+
+def test_init_sync_release_worker():
+    dg_git = flexmock()
+    dg_git.should_receive("clear_cache").once()
+    parent_api = flexmock(
+        dg=flexmock(local_project=flexmock(git_repo=flexmock(git=dg_git))),
+        up=flexmock(local_project=None),
+    )
+    flexmock(api.GitObjectReader).should_receive("reset").once()
+    api._parallel_sync_api = parent_api
+    try:
+        api._init_sync_release_worker()
+    finally:
+        api._parallel_sync_api = None
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional, Union
 
 import pytest
+import urllib3
 from distro import linux_distribution
 from flexmock import flexmock
 from specfile import Specfile
@@ -429,24 +430,32 @@ def test_download_remote_sources(
         autosave=True,
         macros=[("extra_source", "1")] if extra_source else None,
     )
-    base_git = PackitRepositoryBase(config=flexmock(), package_config=package_config)
+    base_git = PackitRepositoryBase(
+        config=flexmock(source_cache=None),
+        package_config=package_config,
+    )
     flexmock(base_git).should_receive("specfile").and_return(specfile)
 
-    expected_urls = iter(expected_urls)
+    requested_urls = []
     expected_path = tmp_path / "rsync-3.1.3.tar.gz"
 
     def mocked_get(url, **_):
-        assert url == next(expected_urls)
+        # sources are downloaded concurrently, in no particular order
+        requested_urls.append(url)
         return flexmock(
             raise_for_status=lambda: None,
             raw=flexmock(stream=lambda *_, **__: iter([b"1"])),
+            headers={},
         )
 
-    flexmock(requests).should_receive("get").replace_with(mocked_get)
+    flexmock(requests).should_receive("Session").and_return(
+        flexmock(headers={}, mount=lambda *_: None, get=mocked_get),
+    )
 
     base_git.download_remote_sources()
+    assert sorted(requested_urls) == sorted(expected_urls)
 
-    flexmock(requests).should_receive("get").and_raise(
+    flexmock(requests).should_receive("Session").and_raise(
         Exception(
             "This should not be called second time since the source is present already.",
         ),
@@ -456,6 +465,115 @@ def test_download_remote_sources(
     assert expected_path.exists()
 
 
+def test_download_remote_sources_cached(tmp_path: Path):
+    spec_path = tmp_path / "rsync.spec"
+    spec_path.write_text(
+        "Name: rsync\n"
+        "Version: 3.1.3\n"
+        "Release: 1\n"
+        "Source0: https://download.samba.org/pub/rsync/src/rsync-%{version}.tar.gz\n"
+        "License: GPLv3+\n"
+        "Summary: rsync\n"
+        "%description\nrsync\n",
+    )
+    specfile = Specfile(spec_path, sourcedir=tmp_path, autosave=True)
+    base_git = PackitRepositoryBase(
+        config=flexmock(
+            source_cache=str(tmp_path / "cache"),
+            source_cache_size_limit=None,
+        ),
+        package_config=flexmock(sources=[]),
+    )
+    flexmock(base_git).should_receive("specfile").and_return(specfile)
+    session = flexmock(headers={}, mount=lambda *_: None)
+    session.should_receive("head").and_return(
+        flexmock(ok=True, headers={"ETag": '"1234"'}),
+    )
+    session.should_receive("get").and_return(
+        flexmock(
+            raise_for_status=lambda: None,
+            raw=flexmock(stream=lambda *_, **__: iter([b"1"])),
+            headers={"ETag": '"1234"'},
+        ),
+    ).once()
+    flexmock(requests).should_receive("Session").and_return(session)
+
+    source_path = tmp_path / "rsync-3.1.3.tar.gz"
+    base_git.download_remote_sources()
+    source_path.unlink()
+    # the second download is served from the cache
+    base_git.download_remote_sources()
+
+    assert source_path.read_text() == "1"
+
+
+def test_download_remote_sources_resume(tmp_path: Path):
+    spec_path = tmp_path / "rsync.spec"
+    spec_path.write_text(
+        "Name: rsync\n"
+        "Version: 3.1.3\n"
+        "Release: 1\n"
+        "Source0: https://download.samba.org/pub/rsync/src/rsync-%{version}.tar.gz\n"
+        "Source1: https://download.samba.org/pub/rsync/src/rsync-patches-%{version}.tar.gz\n"
+        "License: GPLv3+\n"
+        "Summary: rsync\n"
+        "%description\nrsync\n",
+    )
+    specfile = Specfile(spec_path, sourcedir=tmp_path, autosave=True)
+    base_git = PackitRepositoryBase(
+        config=flexmock(source_cache=None),
+        package_config=flexmock(sources=[]),
+    )
+    flexmock(base_git).should_receive("specfile").and_return(specfile)
+    # leftover of a download interrupted in a previous run
+    (tmp_path / ".rsync-3.1.3.tar.gz.part").write_bytes(b"xx")
+    requests_made = []
+
+    def interrupted(*chunks):
+        yield from chunks
+        raise urllib3.exceptions.ProtocolError("Connection broken")
+
+    def mocked_get(url, headers=None, **_):
+        name = Path(url).name
+        requests_made.append((name, headers))
+        if [n for n, _ in requests_made].count(name) > 1:
+            # retry, the patches start over because the server sends no validator
+            return flexmock(
+                status_code=206 if headers else 200,
+                raise_for_status=lambda: None,
+                raw=flexmock(
+                    stream=lambda *_, **__: iter([b"34" if headers else b"patches"]),
+                ),
+                headers={},
+            )
+        return flexmock(
+            status_code=200,
+            raise_for_status=lambda: None,
+            raw=flexmock(
+                stream=lambda *_, **__: interrupted(
+                    b"12" if "patches" not in url else b"pat",
+                ),
+            ),
+            headers={} if "patches" in url else {"ETag": '"1234"'},
+        )
+
+    flexmock(requests).should_receive("Session").and_return(
+        flexmock(headers={}, mount=lambda *_: None, get=mocked_get),
+    )
+
+    base_git.download_remote_sources()
+
+    assert (tmp_path / "rsync-3.1.3.tar.gz").read_bytes() == b"1234"
+    assert (tmp_path / "rsync-patches-3.1.3.tar.gz").read_bytes() == b"patches"
+    assert not (tmp_path / ".rsync-3.1.3.tar.gz.part").exists()
+    assert sorted(requests_made, key=lambda r: r[0]) == [
+        ("rsync-3.1.3.tar.gz", None),
+        ("rsync-3.1.3.tar.gz", {"Range": "bytes=2-", "If-Range": '"1234"'}),
+        ("rsync-patches-3.1.3.tar.gz", None),
+        ("rsync-patches-3.1.3.tar.gz", None),
+    ]
+
+
 def test_set_spec_content(tmp_path):
     distgit_spec_contents = (
         "Name: bring-me-to-the-life\n"
@@ -1162,3 +1280,40 @@ def test_default_macro_definitions(
     )
     dist_git._specfile_path = distgit_spec_path
     assert dist_git.specfile.macros == result
+
+
+def test_specfile_is_reused(tmp_path):
+    spec_template = (
+        "Name: package\n"
+        "Version: {version}\n"
+        "Release: 1\n"
+        "Summary: package\n"
+        "License: MIT\n"
+        "%description\n-\n"
+    )
+    spec = tmp_path / "package.spec"
+    spec.write_text(spec_template.format(version="1.0"))
+    repo = PackitRepositoryBase(
+        config=flexmock(default_parse_time_macros={}),
+        package_config=flexmock(parse_time_macros={}),
+    )
+    repo._specfile_path = spec
+
+    specfile = repo.specfile
+    repo.refresh_specfile()
+    assert repo.specfile is specfile
+
+    spec.write_text(spec_template.format(version="2.0"))
+    repo.refresh_specfile()
+    assert repo.specfile is not specfile
+    assert repo.get_specfile_version() == "2.0"
+
+    # e.g. switching back to the original branch
+    spec.write_text(spec_template.format(version="1.0"))
+    repo.refresh_specfile()
+    assert repo.specfile is specfile
+    assert repo.get_specfile_version() == "1.0"
+
+    repo.package_config.parse_time_macros = {"foo": "bar"}
+    repo.refresh_specfile()
+    assert repo.specfile is not specfile
@@ -62,6 +62,7 @@ def test_propose_downstream_command():
         package_config=PackageConfig,
         resolve_bug=None,
         sync_acls=False,
+        branch_jobs=1,
     ).and_return()
     result = call_packit(packit_base, parameters=["propose-downstream", "."])
     assert result.exit_code == 0
@@ -86,6 +87,7 @@ def test_pull_from_upstream_command():
         package_config=PackageConfig,
         resolve_bug=None,
         sync_acls=False,
+        branch_jobs=1,
     ).and_return()
     result = call_packit(packit_base, parameters=["pull-from-upstream", "."])
     assert result.exit_code == 0
@@ -1,11 +1,14 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import io
 import sys
 
+import pytest
 from flexmock import flexmock
 
-from packit.cli.utils import cover_packit_exception
+from packit.cli import utils
+from packit.cli.utils import PrefixedStream, cover_packit_exception
 from packit.exceptions import PackitException
 
 
@@ -130,3 +133,56 @@ def test_cover_packit_exception_decorator_other_exception_config_debug():
         raise CustomException("Other test exception")
 
     covered_func(config=flexmock(debug=True))
+
+
+def test_prefixed_stream():
+    output = io.StringIO()
+    stream = PrefixedStream(output, "[pkg] ")
+    stream.write("first line\nsecond ")
+    assert output.getvalue() == "[pkg] first line\n"
+    stream.write("line\nthird line")
+    stream.flush()
+    assert output.getvalue() == (
+        "[pkg] first line\n[pkg] second line\n[pkg] third line"
+    )
+
+
+def test_run_packages_in_parallel():
+    flexmock(utils).should_receive("get_aliases").and_return({})
+
+    def func(package_config):
+        if package_config == "broken":
+            raise PackitException("It's broken")
+        print(f"Working on {package_config}")
+
+    results = utils._run_packages_in_parallel(
+        func,
+        (),
+        {
+            package: {"package_config": package}
+            for package in ("first", "broken", "second")
+        },
+        jobs=2,
+    )
+
+    assert results == {
+        "first": (0, ""),
+        "broken": (2, "It's broken"),
+        "second": (0, ""),
+    }
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_run_package_debug(debug):
+    def func():
+        raise PackitException("It's broken")
+
+    flexmock(utils.logger).should_receive("exception").times(1 if debug else 0)
+    flexmock(utils.logger).should_receive("error").times(0 if debug else 1)
+    utils._parallel_func = func
+    utils._init_package_worker(debug)
+    try:
+        assert utils._run_package("broken", (), {}) == (2, "It's broken")
+    finally:
+        utils._parallel_func = None
+        utils._init_package_worker(False)
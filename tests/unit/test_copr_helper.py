@@ -286,3 +286,195 @@ class TestCoprProjectEditRetry:
                 chroots=["fedora-rawhide-x86_64", "fedora-44-x86_64"],
                 owner="packit",
             )
+
+
+def test_watch_copr_builds():
+    states = {
+        1: iter(["pending", "running", "running", "running", "succeeded"]),
+        2: iter(["running", "failed"]),
+    }
+    copr_client_mock = flexmock(
+        config={"copr_url": "https://copr.fedorainfracloud.org"},
+        build_proxy=flexmock(),
+    )
+    copr_client_mock.build_proxy.should_receive("get").replace_with(
+        lambda build_id: flexmock(id=build_id, state=next(states[build_id])),
+    )
+    flexmock(packit.copr_helper.CoprClient).should_receive(
+        "create_from_config_file",
+    ).and_return(copr_client_mock).once()
+    sleeps = []
+    flexmock(packit.copr_helper.time).should_receive("sleep").replace_with(
+        sleeps.append,
+    )
+    reported = []
+
+    copr_helper = CoprHelper("_upstream_local_project")
+    assert copr_helper.watch_copr_builds(
+        [1, 2],
+        timeout=3600,
+        report_func=lambda state, _, build_id, url: reported.append(
+            (build_id, state),
+        ),
+    ) == {1: "succeeded", 2: "failed"}
+
+    # only transitions are reported
+    assert reported == [
+        (1, "pending"),
+        (2, "pending"),
+        (1, "pending"),
+        (2, "failure"),
+        (1, "success"),
+    ]
+    # the delay grows while nothing changes and is reset on a transition
+    assert len(sleeps) == 4
+    assert 5 <= sleeps[0] <= 10
+    assert 10 <= sleeps[2] <= 20
+    assert 20 <= sleeps[3] <= 40
+
+
+def test_watch_copr_builds_timeout():
+    copr_client_mock = flexmock(
+        config={"copr_url": "https://copr.fedorainfracloud.org"},
+        build_proxy=flexmock(),
+    )
+    copr_client_mock.build_proxy.should_receive("get").replace_with(
+        lambda build_id: flexmock(id=build_id, state="running"),
+    )
+    flexmock(packit.copr_helper.CoprClient).should_receive(
+        "create_from_config_file",
+    ).and_return(copr_client_mock).once()
+    reported = []
+
+    copr_helper = CoprHelper("_upstream_local_project")
+    assert copr_helper.watch_copr_builds(
+        [1],
+        timeout=0,
+        report_func=lambda state, description, build_id, url: reported.append(
+            (build_id, state, description, url),
+        ),
+    ) == {1: "running"}
+
+    assert reported == [
+        (
+            1,
+            "pending",
+            "The RPM build was triggered.",
+            "https://copr.fedorainfracloud.org/coprs/build/1/",
+        ),
+        (
+            1,
+            "error",
+            "Build watch timeout",
+            "https://copr.fedorainfracloud.org/coprs/build/1/",
+        ),
+    ]
+
+
+def copr_client_with_projects(names):
+    """Copr client mock listing the projects of the given names, the newest first."""
+    copr_client_mock = flexmock(
+        config={"copr_url": "https://copr.fedorainfracloud.org"},
+        project_proxy=flexmock(requests=[]),
+        build_proxy=flexmock(),
+    )
+
+    def get_list(ownername, pagination):
+        copr_client_mock.project_proxy.requests.append(pagination)
+        assert ownername == "packit"
+        assert (pagination["order"], pagination["order_type"]) == ("id", "DESC")
+        offset = pagination["offset"]
+        return [
+            flexmock(name=name) for name in names[offset : offset + pagination["limit"]]
+        ]
+
+    copr_client_mock.project_proxy.should_receive("get_list").replace_with(get_list)
+    flexmock(packit.copr_helper.CoprClient).should_receive(
+        "create_from_config_file",
+    ).and_return(copr_client_mock)
+    packit.copr_helper._copr_projects_cache.clear()
+    return copr_client_mock
+
+
+def test_get_copr_builds():
+    flexmock(packit.copr_helper, _COPR_PROJECTS_PAGE_SIZE=2)
+    copr_client_mock = copr_client_with_projects(
+        ["packit-ogr-3", "packit-specfile-2", "packit-ogr-2", "packit-ogr-1"],
+    )
+    copr_client_mock.build_proxy.should_receive("get_list").replace_with(
+        lambda ownername, projectname, pagination: [
+            flexmock(id=f"{projectname}/{n}", projectname=projectname, state="ok")
+            for n in range(pagination["limit"])
+        ],
+    )
+
+    copr_helper = CoprHelper(flexmock(namespace="packit", repo_name="ogr"))
+    assert copr_helper.get_copr_builds(number_of_builds=3) == [
+        ("packit-ogr-3/0", "packit-ogr-3", "ok"),
+        ("packit-ogr-3/1", "packit-ogr-3", "ok"),
+        ("packit-ogr-3/2", "packit-ogr-3", "ok"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "names, number_of_projects, expected, pages",
+    [
+        pytest.param(
+            ["packit-ogr-3", "packit-specfile-2", "packit-ogr-2", "packit-ogr-1"],
+            2,
+            ["packit-ogr-3", "packit-ogr-2"],
+            2,
+            id="enough_found",
+        ),
+        pytest.param(
+            ["packit-ogr-3", "packit-specfile-2", "packit-ogr-2"],
+            5,
+            ["packit-ogr-3", "packit-ogr-2"],
+            2,
+            id="all_listed",
+        ),
+        pytest.param(
+            [f"packit-specfile-{n}" for n in range(100)] + ["packit-ogr-1"],
+            5,
+            [],
+            3,
+            id="bounded",
+        ),
+    ],
+)
+def test_get_copr_projects(names, number_of_projects, expected, pages):
+    flexmock(
+        packit.copr_helper,
+        _COPR_PROJECTS_PAGE_SIZE=2,
+        _COPR_PROJECTS_MAX_PAGES=3,
+    )
+    copr_client_mock = copr_client_with_projects(names)
+
+    copr_helper = CoprHelper(flexmock(namespace="packit", repo_name="ogr"))
+    assert copr_helper.get_copr_projects(number_of_projects=number_of_projects) == (
+        expected
+    )
+    # cached
+    assert copr_helper.get_copr_projects(number_of_projects=number_of_projects) == (
+        expected
+    )
+    assert len(copr_client_mock.project_proxy.requests) == pages
+
+
+def test_get_copr_projects_persisted(tmp_path):
+    copr_client_mock = copr_client_with_projects(["packit-ogr-2", "packit-ogr-1"])
+    projects_cache = tmp_path / "copr-projects.json"
+
+    upstream = flexmock(namespace="packit", repo_name="ogr")
+    assert CoprHelper(upstream, projects_cache=projects_cache).get_copr_projects() == [
+        "packit-ogr-2",
+        "packit-ogr-1",
+    ]
+    # another invocation of the CLI
+    packit.copr_helper._copr_projects_cache.clear()
+    assert CoprHelper(upstream, projects_cache=projects_cache).get_copr_projects() == [
+        "packit-ogr-2",
+        "packit-ogr-1",
+    ]
+    # the projects are listed only by the first one
+    assert len(copr_client_mock.project_proxy.requests) == 1
@@ -301,3 +301,16 @@ def test_pkg_tool_details():
             flexmock(PkgTool).should_receive("clone").and_return()
 
         api.dg.clone_package("/tmp")
+
+
+@pytest.mark.parametrize(
+    "branch, target",
+    [
+        ("rawhide", "rawhide"),
+        ("main", "rawhide"),
+        ("f40", "f40-candidate"),
+        ("epel9", "epel9-candidate"),
+    ],
+)
+def test_get_koji_target(branch, target):
+    assert DistGit.get_koji_target(branch) == target
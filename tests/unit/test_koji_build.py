@@ -138,3 +138,33 @@ def test_koji_build(package_config_yaml, how_many_builds):
 
     runner = CliRunner()
     runner.invoke(packit_base, ["build", "in-koji"])
+
+
+def test_koji_build_multiple_branches_in_worktrees():
+    flexmock(package_config).should_receive("find_packit_yaml").and_return(
+        flexmock(name=".packit.yaml", parent="/some/dir/teamcity-messages"),
+    )
+    flexmock(package_config).should_receive("load_packit_yaml").and_return(
+        json.loads(DEFAULT_CONFIG_YAML),
+    )
+    flexmock(LocalProject).should_receive("git_repo").and_return(
+        flexmock(
+            remotes=[],
+            active_branch=flexmock(name="an active branch"),
+            head=flexmock(is_detached=False),
+        ),
+    )
+    flexmock(PackitAPI).should_receive("__repr__").and_return("")
+    flexmock(DistGit).should_receive("__repr__").and_return("")
+    flexmock(koji_build).should_receive("get_branches").and_return(["rawhide", "f40"])
+    flexmock(PackitAPI).should_receive("init_kerberos_ticket").and_return()
+    builds = []
+    flexmock(PackitAPI).should_receive("build").replace_with(
+        lambda **kwargs: builds.append(kwargs),
+    )
+
+    runner = CliRunner()
+    runner.invoke(packit_base, ["build", "in-koji"])
+
+    assert sorted(build["dist_git_branch"] for build in builds) == ["f40", "rawhide"]
+    assert all(build["in_worktree"] for build in builds)
@@ -4,7 +4,13 @@
 import pytest
 from flexmock import flexmock
 
-from packit.patches import PatchMetadata, commit_message, remove_prefixes
+from packit.patches import (
+    PatchMetadata,
+    commit_message,
+    get_commit_hexsha_from_patch,
+    get_git_trailers,
+    remove_prefixes,
+)
 
 
 @pytest.fixture
@@ -188,6 +194,56 @@ Signed-off-by: Everyday Programmer <eprog@redhat.com>
     return file
 
 
+def test_get_commit_hexsha_from_patch(patch):
+    assert (
+        get_commit_hexsha_from_patch(patch.read_bytes())
+        == "477fb1b17ee5fa84913102e964239c0d28019b8a"
+    )
+    assert get_commit_hexsha_from_patch(b"diff --git a/a.file b/a.file\n") is None
+
+
+@pytest.mark.parametrize(
+    "message, trailers",
+    [
+        pytest.param(
+            "Title\n\nBody.\n\nPatch-name: a.patch\nSigned-off-by: A <a@b.c>\n",
+            "Patch-name: a.patch\nSigned-off-by: A <a@b.c>\n",
+            id="simple",
+        ),
+        pytest.param("Title\nPatch-name: a.patch\n", "", id="title_only"),
+        pytest.param(
+            "Title\n\nPatch-status: |\n    # The: empty line\n    #\nPatch-id: 200\n",
+            "Patch-status: |\n    # The: empty line\n    #\nPatch-id: 200\n",
+            id="multiline",
+        ),
+        pytest.param(
+            "Title\n\nsome text\nmore text\nSigned-off-by: A <a@b.c>\nKey: v\n",
+            "Signed-off-by: A <a@b.c>\nKey: v\n",
+            id="git_generated_prefix",
+        ),
+        pytest.param("Title\n\nsome text\nKey: v\n", "", id="not_only_trailers"),
+        pytest.param(
+            "Title\n\nKey :  value  \nOther-Key:val\n\n# comment\n",
+            "Key: value\nOther-Key: val\n",
+            id="normalized",
+        ),
+        pytest.param(
+            "Title\n\nKey: v\n---\n a | 1 +\n\nOther: x\n",
+            "Key: v\n",
+            id="divider",
+        ),
+    ],
+)
+def test_get_git_trailers(message, trailers):
+    assert get_git_trailers(message) == trailers
+
+
+def test_get_git_trailers_from_patch(patch_with_meta):
+    assert get_git_trailers(patch_with_meta.read_text()).startswith(
+        "Patch-name: clev:er.patch\n",
+    )
+
+
 def test_remove_prefixes(patch):
     remove_prefixes(patch)
     assert (
@@ -1,9 +1,12 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import json
+import time
+
 import pytest
 from flexmock import flexmock
-from gnupg import GPG
+from gnupg import GPG, ListKeys
 
 from packit.exceptions import PackitException
 from packit.security import (
@@ -86,8 +89,8 @@ def test_check_signature_of_commit(
     gpg_flexmock.should_receive("list_keys").and_return(
         flexmock(fingerprints=local_keys),
     )
-    gpg_flexmock.should_receive("recv_keys").and_return(
-        flexmock(fingerprints=["fingerprint"]),
+    flexmock(CommitVerifier).should_receive("receive_key").and_return(
+        ["fingerprint"],
     ).times(download_times)
 
     repo_mock = flexmock(
@@ -142,8 +145,8 @@ def test_check_signature_of_commit_not_present_key(
         flexmock(fingerprints=local_keys),
     )
 
-    gpg_flexmock.should_receive("recv_keys").and_return(
-        flexmock(fingerprints=["fingerprint"]),
+    flexmock(CommitVerifier).should_receive("receive_key").and_return(
+        ["fingerprint"],
     ).times(download_times)
 
     repo_mock = flexmock(
@@ -170,7 +173,7 @@ def test_check_signature_of_commit_key_not_found():
     gpg_flexmock.should_receive("list_keys").and_return(flexmock(fingerprints=[]))
 
     # No key received
-    gpg_flexmock.should_receive("recv_keys").and_return(flexmock(fingerprints=[]))
+    flexmock(CommitVerifier).should_receive("receive_key").and_return([])
 
     # Signature cannot be checked
     repo_mock = flexmock(git=flexmock().should_receive("show").and_return("E").mock())
@@ -184,6 +187,105 @@ def test_check_signature_of_commit_key_not_found():
     assert "Cannot receive" in str(ex)
 
 
+def test_check_signatures():
+    gpg_flexmock = flexmock(GPG)
+    # the keyring is listed only once
+    gpg_flexmock.should_receive("list_keys").and_return(
+        flexmock(fingerprints=["a"]),
+    ).once()
+    flexmock(CommitVerifier).should_receive("receive_key").and_return(["b"]).once()
+
+    repo_mock = flexmock(git=flexmock())
+    repo_mock.git.should_receive("log").with_args(
+        "v1.0..v1.1",
+        format="%H %G? %GF",
+    ).and_return(
+        "1111 G a\n2222 E \n3333 N \n4444 G c\n5555 B a",
+    ).and_return(
+        "1111 G a\n2222 G b\n3333 N \n4444 G c\n5555 B a",
+    ).twice()
+
+    verifier = CommitVerifier()
+    assert verifier.check_signatures(
+        repo=repo_mock,
+        possible_key_fingerprints=["a", "b"],
+        revision_range="v1.0..v1.1",
+    ) == {
+        "1111": True,
+        "2222": True,
+        "3333": False,
+        "4444": False,
+        "5555": False,
+    }
+
+
+def test_receive_key_first_success():
+    keys = {
+        "a.example.com": Exception,
+        "b.example.com": None,
+        "c.example.com": "OTHER KEY",
+        "d.example.com": "KEY",
+    }
+
+    def fetch_key(keyserver, key_fingerprint):
+        if keys[keyserver] is Exception:
+            raise Exception
+        return keys[keyserver]
+
+    flexmock(CommitVerifier).should_receive("_fetch_key").replace_with(fetch_key)
+    scanned_keys = {"OTHER KEY": ["B"], "KEY": ["A"]}
+
+    def scan_keys_mem(key):
+        keys = ListKeys(None)
+        keys.extend({"fingerprint": fp} for fp in scanned_keys[key])
+        keys.key_map = {fp: {} for fp in scanned_keys[key]}
+        return keys
+
+    flexmock(GPG).should_receive("scan_keys_mem").replace_with(scan_keys_mem)
+    flexmock(GPG).should_receive("import_keys").with_args("KEY").and_return(
+        flexmock(fingerprints=["a"]),
+    ).once()
+
+    verifier = CommitVerifier()
+    verifier.key_servers = list(keys)
+    assert verifier.receive_key("a") == ["a"]
+
+
+@pytest.mark.parametrize(
+    "downloaded_ago, received, downloads, result",
+    [
+        (None, ["a"], 0, "a"),
+        (60, ["a"], 0, "a"),
+        (2 * 24 * 60 * 60, ["a"], 1, "a"),
+        # refresh failed, old key is used
+        (2 * 24 * 60 * 60, [], 1, "a"),
+    ],
+)
+def test_download_gpg_key_keyring_cache(
+    tmp_path,
+    downloaded_ago,
+    received,
+    downloads,
+    result,
+):
+    flexmock(GPG).should_receive("list_keys").and_return(flexmock(fingerprints=["a"]))
+    flexmock(CommitVerifier).should_receive("receive_key").and_return(
+        received,
+    ).times(downloads)
+    if downloaded_ago is not None:
+        (tmp_path / "packit-downloaded-keys.json").write_text(
+            json.dumps({"a": time.time() - downloaded_ago}),
+        )
+
+    verifier = CommitVerifier(keyring_cache=tmp_path)
+    assert verifier.download_gpg_key_if_needed("a") == result
+    if received and downloads:
+        downloaded_keys = json.loads(
+            (tmp_path / "packit-downloaded-keys.json").read_text(),
+        )
+        assert time.time() - downloaded_keys["a"] < 60
+
+
 # This could possibly but unlikely fail if all the default key servers are down.
 @pytest.mark.parametrize(
     "keyid, ok",
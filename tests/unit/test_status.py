@@ -1,15 +1,22 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
+import asyncio
+import threading
+from pathlib import Path
+
 from bodhi.client.bindings import BodhiClient
 from flexmock import flexmock
 
+from packit import status as packit_status
+from packit.api import PackitAPI
+from packit.constants import STATUS_SOURCES
 from packit.status import Status
 
 
 def test_status_updates(config_mock, package_config_mock, upstream_mock, distgit_mock):
     flexmock(
         BodhiClient,
-        query=lambda packages, page: {
+        query=lambda packages, page, rows_per_page: {
             "updates": [
                 {
                     "title": "python-requre-0.8.1-2.fc33",
@@ -35,3 +42,143 @@ def test_status_updates(config_mock, package_config_mock, upstream_mock, distgit
         ["python-requre-0.8.1-2.fc33", 2, "stable"],
         ["python-requre-0.8.1-2.fc34", 3, "stable"],
     ]
+
+
+def test_status_main_concurrent(
+    config_mock,
+    package_config_mock,
+    upstream_mock,
+    distgit_mock,
+):
+    # every source waits for all the others, so they have to run in parallel
+    barrier = threading.Barrier(len(STATUS_SOURCES), timeout=10)
+
+    def parallel(result):
+        def getter():
+            barrier.wait()
+            return result
+
+        return getter
+
+    status = Status(config_mock, package_config_mock, upstream_mock, distgit_mock)
+    flexmock(status).should_receive("get_downstream_prs").replace_with(
+        parallel([(1, "title", "url")]),
+    )
+    flexmock(status).should_receive("get_dg_versions").replace_with(
+        parallel({"rawhide": "1.0"}),
+    )
+    flexmock(status).should_receive("get_up_releases").replace_with(parallel([]))
+    flexmock(status).should_receive("get_koji_builds").replace_with(parallel({}))
+    flexmock(status).should_receive("get_copr_builds").replace_with(parallel([]))
+    flexmock(status).should_receive("get_updates").replace_with(parallel([]))
+
+    arrived = []
+    results = asyncio.run(
+        PackitAPI.status_main(
+            status,
+            timeout=None,
+            on_result=lambda source, _: arrived.append(source),
+        ),
+    )
+
+    assert not barrier.broken
+    assert results[0] == [(1, "title", "url")]
+    assert results[1] == {"rawhide": "1.0"}
+    assert sorted(arrived) == sorted(STATUS_SOURCES)
+
+
+def test_status_main_timeout(
+    config_mock,
+    package_config_mock,
+    upstream_mock,
+    distgit_mock,
+):
+    released = threading.Event()
+    hung_threads = []
+
+    def hang():
+        hung_threads.append(threading.current_thread())
+        return released.wait(10) and {"rawhide": "1.0"}
+
+    status = Status(config_mock, package_config_mock, upstream_mock, distgit_mock)
+    for source in STATUS_SOURCES:
+        flexmock(status).should_receive(f"get_{source}").and_return([])
+    flexmock(status).should_receive("get_dg_versions").replace_with(hang)
+    flexmock(status).should_receive("get_koji_builds").and_raise(Exception)
+
+    try:
+        results = asyncio.run(PackitAPI.status_main(status, timeout=0.1))
+    finally:
+        released.set()
+
+    # timed out and failed sources fall back to empty results
+    assert results[1] == {}
+    assert results[3] == {}
+    # a hung source doesn't keep the process from exiting
+    assert all(thread.daemon for thread in hung_threads)
+
+
+def test_status_main_local_project_created_once(
+    config_mock,
+    package_config_mock,
+    upstream_mock,
+    distgit_mock,
+):
+    accessed_from = []
+
+    class DistGitStub:
+        @property
+        def local_project(self):
+            accessed_from.append(threading.current_thread())
+            return flexmock()
+
+    status = Status(config_mock, package_config_mock, upstream_mock, DistGitStub())
+    for source in STATUS_SOURCES:
+        flexmock(status).should_receive(f"get_{source}").and_return([])
+
+    asyncio.run(PackitAPI.status_main(status))
+
+    # the dist-git repository is cloned before the sources are fanned out
+    assert accessed_from == [threading.main_thread()]
+
+
+def test_get_dg_versions_without_checkout(
+    config_mock,
+    package_config_mock,
+    upstream_mock,
+    distgit_mock,
+):
+    blobs = {
+        "origin/rawhide": "a" * 40,
+        "origin/f40": "a" * 40,
+        "origin/f39": "b" * 40,
+    }
+    contents = {"a" * 40: b"Version: 2.0", "b" * 40: b"Version: 1.0"}
+    distgit_mock.local_project.git_project = flexmock(
+        get_branches=lambda: ["rawhide", "f40", "f39", "epel9"],
+    )
+    distgit_mock.local_project.git_objects = flexmock(
+        resolve=lambda rev: (
+            (blobs[branch], "blob", 12)
+            if (branch := rev.split(":")[0]) in blobs
+            else None
+        ),
+        read_blob=lambda sha: contents[sha],
+    )
+    distgit_mock.should_receive("get_absolute_specfile_path").and_return(
+        Path("/mock_dir/sandcastle/dist-git/test_package_name.spec"),
+    )
+    distgit_mock.should_receive("parse_time_macros").and_return([])
+    distgit_mock.should_receive("switch_branch").never()
+    packit_status._dg_versions_cache.clear()
+    packit_status._dg_versions_cache[("b" * 40, ())] = "1.0"
+    # spec file content shared by multiple branches is parsed only once
+    flexmock(packit_status).should_receive("ProcessPoolExecutor").never()
+    flexmock(packit_status).should_receive("get_expanded_version").replace_with(
+        lambda content, *_: content.split()[-1],
+    ).once()
+
+    status = Status(config_mock, package_config_mock, upstream_mock, distgit_mock)
+    assert status.get_dg_versions() == {"rawhide": "2.0", "f40": "2.0", "f39": "1.0"}
+    # the results are cached by blob SHA
+    assert status.get_dg_versions() == {"rawhide": "2.0", "f40": "2.0", "f39": "1.0"}
@@ -1,7 +1,10 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import io
 import sys
+import tarfile
+from contextlib import nullcontext
 from contextlib import suppress as does_not_raise
 
 import pytest
@@ -20,24 +23,17 @@ def upstream_pr_mock():
 
 
 @pytest.fixture
-def tar_mock():
-    def tar_mock_factory(archive_items=None, is_tarfile=True):
-        if archive_items is None:
-            archive_items = []
-        tarfile_mock = flexmock(packit.upstream.tarfile)
-        tarinfo_mock_list = [
-            flexmock(
-                name=name,
-                isdir=lambda v=isdir: v,
-                isfile=lambda v=isdir: not v,
-            )
-            for name, isdir in archive_items
-        ]
-        tar_mock = flexmock(getmembers=lambda: tarinfo_mock_list)
-        tarfile_mock.should_receive("open").and_return(tar_mock)
-        tarfile_mock.should_receive("is_tarfile").and_return(is_tarfile)
-
-    return tar_mock_factory
+def tar_archive(tmp_path):
+    def tar_archive_factory(archive_items):
+        with tarfile.open(tmp_path / "_archive", "w:gz") as tar:
+            for name, isdir in archive_items:
+                info = tarfile.TarInfo(name)
+                if isdir:
+                    info.type = tarfile.DIRTYPE
+                tar.addfile(info, io.BytesIO() if not isdir else None)
+        return tmp_path
+
+    return tar_archive_factory
 
 
 @pytest.mark.parametrize(
@@ -188,20 +184,22 @@ def test_get_version_from_tag(
         pytest.param("unknown", "dir_from_template", id="unknown_archive"),
     ],
 )
-def test_get_archive_root_dir(archive_type, return_value, upstream_mock, tar_mock):
+def test_get_archive_root_dir(archive_type, return_value, upstream_mock):
     if archive_type == "tar":
-        tar_mock(is_tarfile=True)
         flexmock(Archive).should_receive("get_archive_root_dir_from_tar").and_return(
             return_value,
         ).with_args("_archive").once()
+        flexmock(Archive).should_receive("get_archive_root_dir_from_template").never()
         assert (
             Archive(upstream_mock, "").get_archive_root_dir("_archive") == return_value
         )
     elif archive_type == "unknown":
+        flexmock(Archive).should_receive("get_archive_root_dir_from_tar").and_return(
+            None,
+        )
         flexmock(Archive).should_receive(
             "get_archive_root_dir_from_template",
         ).and_return(return_value)
-        tar_mock(is_tarfile=False)
         assert (
             Archive(upstream_mock, "").get_archive_root_dir("_archive") == return_value
         )
@@ -233,8 +231,15 @@ def test_get_archive_root_dir(archive_type, return_value, upstream_mock, tar_moc
         ),
     ],
 )
-def test_get_tar_archive_dir(archive_items, expected_result, upstream_mock, tar_mock):
-    tar_mock(archive_items=archive_items)
+def test_get_tar_archive_dir(
+    archive_items,
+    expected_result,
+    upstream_mock,
+    tar_archive,
+):
+    upstream_mock.should_receive("absolute_specfile_dir").and_return(
+        tar_archive(archive_items),
+    )
     assert (
         Archive(upstream_mock).get_archive_root_dir_from_tar("_archive")
         == expected_result
@@ -420,6 +425,90 @@ def test_get_srpm_from_rpmbuild_output(upstream_mock, rpmbuild_output):
     )
 
 
+def test_build_srpm_cached(upstream_mock, tmp_path):
+    upstream_mock.config.srpm_cache = str(tmp_path / "srpm-cache")
+    srpm_dir = tmp_path / "srpms"
+    srpm_dir.mkdir()
+    srpm = srpm_dir / "beer-0.1.0-1.fc40.src.rpm"
+
+    def build():
+        srpm.write_bytes(b"srpm")
+        return srpm
+
+    builder = SRPMBuilder(upstream_mock, srpm_dir=srpm_dir)
+    flexmock(builder).should_receive("get_inputs_digest").and_return("0123abcd")
+    flexmock(builder).should_receive("_build").replace_with(build).once()
+
+    assert builder.build() == srpm
+    srpm.unlink()
+    assert builder.build() == srpm
+    assert srpm.read_bytes() == b"srpm"
+    srpm_cache = upstream_mock.srpm_cache
+    assert (srpm_cache.hits, srpm_cache.misses) == (1, 1)
+
+
+@pytest.fixture
+def srpm_inputs(upstream_mock, tmp_path):
+    spec = tmp_path / "beer.spec"
+    spec.write_bytes(b"Name: beer\n")
+    for filename in ("beer-0.1.0.tar.gz", "fix.patch"):
+        (tmp_path / filename).write_bytes(filename.encode())
+    upstream_mock.should_receive("absolute_specfile_path").and_return(spec)
+    upstream_mock.should_receive("absolute_specfile_dir").and_return(tmp_path)
+    upstream_mock.should_receive("specfile").and_return(
+        flexmock(
+            sources=lambda: nullcontext(
+                [flexmock(expanded_filename="beer-0.1.0.tar.gz", valid=True)],
+            ),
+            patches=lambda: nullcontext(
+                [flexmock(expanded_filename="fix.patch", valid=True)],
+            ),
+        ),
+    )
+    flexmock(packit.upstream.rpm).should_receive("expandMacro").with_args(
+        "%{?dist}",
+    ).and_return(".fc40")
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        pytest.param(
+            lambda path: (path / "beer.spec").write_bytes(b"Name: beer\nEpoch: 1\n"),
+            id="spec",
+        ),
+        pytest.param(
+            lambda path: (path / "beer-0.1.0.tar.gz").write_bytes(b"changed"),
+            id="source",
+        ),
+        pytest.param(
+            lambda path: (path / "fix.patch").write_bytes(b"changed"),
+            id="patch",
+        ),
+        pytest.param(
+            lambda path: flexmock(packit.upstream.rpm)
+            .should_receive("expandMacro")
+            .with_args("%{?dist}")
+            .and_return(".fc41"),
+            id="dist",
+        ),
+    ],
+)
+def test_get_inputs_digest(upstream_mock, srpm_inputs, change):
+    builder = SRPMBuilder(upstream_mock, srpm_dir=srpm_inputs)
+    digest = builder.get_inputs_digest()
+    assert digest is not None
+    assert builder.get_inputs_digest() == digest
+    change(srpm_inputs)
+    assert builder.get_inputs_digest() not in (None, digest)
+
+
+def test_get_inputs_digest_missing_source(upstream_mock, srpm_inputs):
+    (srpm_inputs / "fix.patch").unlink()
+    assert SRPMBuilder(upstream_mock, srpm_dir=srpm_inputs).get_inputs_digest() is None
+
+
 @pytest.mark.parametrize(
     "update_release,release_suffix,expected_release",
     (
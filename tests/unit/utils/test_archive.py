@@ -0,0 +1,114 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import io
+import shutil
+import subprocess
+import tarfile
+import zipfile
+
+import pytest
+from flexmock import flexmock
+
+from packit.utils import archive as archive_module
+from packit.utils.archive import (
+    ArchiveTopLevel,
+    get_archive_top_level,
+    iter_archive_members,
+)
+
+ITEMS = [("pkg-1.0", True), ("pkg-1.0/src", True), ("pkg-1.0/src/main.c", False)]
+
+
+def create_tar(path, items, mode="w"):
+    with tarfile.open(path, mode) as tar:
+        for name, isdir in items:
+            info = tarfile.TarInfo(name)
+            if isdir:
+                info.type = tarfile.DIRTYPE
+            tar.addfile(info, None if isdir else io.BytesIO())
+    return path
+
+
+def create_zip(path, items):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, isdir in items:
+            archive.writestr(f"{name}/" if isdir else name, "")
+    return path
+
+
+@pytest.mark.parametrize(
+    "name, mode",
+    [
+        pytest.param("archive.tar", "w", id="tar"),
+        pytest.param("archive.tar.gz", "w:gz", id="gz"),
+        pytest.param("archive.tar.bz2", "w:bz2", id="bz2"),
+        pytest.param("archive.tar.xz", "w:xz", id="xz"),
+    ],
+)
+def test_iter_archive_members_tar(tmp_path, name, mode):
+    path = create_tar(tmp_path / name, ITEMS, mode)
+    assert list(iter_archive_members(path)) == ITEMS
+
+
+def test_iter_archive_members_zip(tmp_path):
+    path = create_zip(tmp_path / "archive.zip", ITEMS)
+    assert list(iter_archive_members(path)) == ITEMS
+
+
+@pytest.mark.skipif(not shutil.which("zstd"), reason="zstd is not installed")
+def test_iter_archive_members_zstd(tmp_path):
+    path = create_tar(tmp_path / "archive.tar", ITEMS)
+    subprocess.run(["zstd", "-q", "--rm", str(path)], check=True)
+    assert list(iter_archive_members(tmp_path / "archive.tar.zst")) == ITEMS
+
+
+def test_iter_archive_members_not_archive(tmp_path):
+    path = tmp_path / "archive.gem"
+    path.write_text("not an archive")
+    with pytest.raises(ValueError):
+        list(iter_archive_members(path))
+
+
+@pytest.mark.parametrize(
+    "items, expected",
+    [
+        pytest.param(
+            ITEMS,
+            ArchiveTopLevel(frozenset({"pkg-1.0"}), frozenset({"pkg-1.0"})),
+            id="single_dir",
+        ),
+        pytest.param(
+            [("pkg-1.0/README", False), ("NOTICE", False)],
+            ArchiveTopLevel(frozenset({"pkg-1.0"}), frozenset({"NOTICE"})),
+            id="implied_dir",
+        ),
+        pytest.param(
+            [("a", True), ("b", True), ("c", True)],
+            ArchiveTopLevel(frozenset({"a", "b"}), frozenset({"a", "b"})),
+            id="stops_at_second_dir",
+        ),
+        pytest.param(
+            [*ITEMS, ("stray", False)],
+            ArchiveTopLevel(frozenset({"pkg-1.0"}), frozenset({"pkg-1.0", "stray"})),
+            id="stray_item_last",
+        ),
+    ],
+)
+def test_get_archive_top_level(tmp_path, items, expected):
+    path = create_tar(tmp_path / "archive.tar.gz", items, "w:gz")
+    assert get_archive_top_level(path) == expected
+
+
+def test_get_archive_top_level_not_archive(tmp_path):
+    path = tmp_path / "archive.gem"
+    path.write_text("not an archive")
+    assert get_archive_top_level(path) is None
+
+
+def test_get_archive_top_level_memoized(tmp_path):
+    path = create_zip(tmp_path / "archive.zip", ITEMS)
+    top_level = get_archive_top_level(path)
+
+    flexmock(archive_module).should_receive("iter_archive_members").never()
+    assert get_archive_top_level(path) == top_level
@@ -0,0 +1,70 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import threading
+from itertools import islice
+
+import pytest
+from flexmock import flexmock
+
+from packit.utils.bodhi import BodhiPaginator
+
+
+@pytest.fixture
+def bodhi_client():
+    updates = [{"alias": f"FEDORA-2024-{n}"} for n in range(10)]
+    pages = []
+
+    def query(packages, page, rows_per_page, **_):
+        assert packages == "test"
+        pages.append(page)
+        return {
+            "updates": updates[(page - 1) * rows_per_page : page * rows_per_page],
+            "page": page,
+            "pages": -(-len(updates) // rows_per_page),
+        }
+
+    return flexmock(query=query, updates=updates, pages=pages)
+
+
+@pytest.mark.parametrize(
+    "count, fetched_pages",
+    [
+        (0, []),
+        (2, [1]),
+        (3, [1]),
+        (4, [1, 2]),
+        (20, [1, 2, 3, 4]),
+    ],
+)
+def test_iter(bodhi_client, count, fetched_pages):
+    paginator = BodhiPaginator(
+        lambda: bodhi_client,
+        rows_per_page=3,
+        packages="test",
+    )
+    assert list(islice(paginator, count)) == bodhi_client.updates[:count]
+    assert bodhi_client.pages == fetched_pages
+
+
+@pytest.mark.parametrize(
+    "rows_per_page",
+    [1, 3, 10, 100],
+)
+def test_all(bodhi_client, rows_per_page):
+    clients = []
+
+    def client_factory():
+        clients.append(threading.current_thread())
+        return bodhi_client
+
+    paginator = BodhiPaginator(
+        client_factory,
+        rows_per_page=rows_per_page,
+        packages="test",
+    )
+    assert paginator.all() == bodhi_client.updates
+    assert sorted(bodhi_client.pages) == list(range(1, paginator.pages + 1))
+    assert bodhi_client.pages[0] == 1
+    # a client per thread, the clients aren't thread-safe
+    assert len(clients) == len(set(clients))
@@ -1,8 +1,53 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-from packit.utils.commands import run_command
+import logging
+
+import pytest
+
+from packit.exceptions import PackitCommandFailedError
+from packit.utils.commands import OutputBuffer, run_command
 
 
 def test_run_command_w_env():
     run_command(["bash", "-c", "env | grep PATH"], env={"X": "Y"})
+
+
+def test_run_command_output(caplog):
+    with caplog.at_level(logging.DEBUG, logger="packit"):
+        result = run_command(
+            ["bash", "-c", "echo out; echo err >&2; printf tail"],
+            output=True,
+        )
+    assert result.success
+    assert result.stdout == "out\ntail"
+    assert result.stderr == "err\n"
+    assert result.duration > 0
+    assert result.max_rss > 0
+    for line in ("out", "err", "tail"):
+        assert line in caplog.messages
+
+
+def test_run_command_large_output():
+    size = 32 * 1024 * 1024
+    result = run_command(["head", "-c", str(size), "/dev/zero"], output=True)
+    assert len(result.stdout) == size
+
+
+def test_run_command_fail():
+    with pytest.raises(PackitCommandFailedError) as ex:
+        run_command(["bash", "-c", "echo out; echo err >&2; exit 1"])
+    assert ex.value.stdout_output == "out\n"
+    assert ex.value.stderr_output == "err\n"
+    assert not run_command(["false"], fail=False).success
+
+
+def test_output_buffer_spill():
+    buffer = OutputBuffer(max_size=10)
+    for _ in range(10):
+        buffer.write(b"0123456789\n")
+    assert buffer.size == 110
+    assert buffer.get_output() == b"0123456789\n" * 10
+    buffer.write(b"end")
+    assert buffer.get_output().endswith(b"\nend")
+    buffer.close()
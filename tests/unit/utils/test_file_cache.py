@@ -0,0 +1,83 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import os
+
+from packit.utils.file_cache import FileCache, hash_file
+
+
+def test_hash_file(tmp_path):
+    path = tmp_path / "archive.tar.gz"
+    path.write_bytes(b"content")
+    assert hash_file(path) == hashlib.sha256(b"content").hexdigest()
+    assert hash_file(path, "sha512") == hashlib.sha512(b"content").hexdigest()
+
+
+def test_file_cache_get_put(tmp_path):
+    cache = FileCache(tmp_path / "cache")
+    source = tmp_path / "archive.tar.gz"
+    source.write_bytes(b"content")
+    target = tmp_path / "sources" / "archive.tar.gz"
+
+    assert not cache.get("0123abcd", target)
+    assert cache.put("0123abcd", source)
+    assert cache.get("0123abcd", target)
+    assert target.read_bytes() == b"content"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_file_cache_get_put_text(tmp_path):
+    cache = FileCache(tmp_path / "cache")
+
+    assert cache.get_text("0123abcd.name") is None
+    assert cache.put_text("0123abcd.name", "beer-0.1.0-1.src.rpm")
+    assert cache.get_text("0123abcd.name") == "beer-0.1.0-1.src.rpm"
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    (tmp_path / "cache" / "01" / "0123abcd.name").write_text("corrupted")
+    assert cache.get_text("0123abcd.name") is None
+
+
+def test_file_cache_put_digest_mismatch(tmp_path):
+    cache = FileCache(tmp_path / "cache")
+    source = tmp_path / "archive.tar.gz"
+    source.write_bytes(b"content")
+
+    assert not cache.put("0123abcd", source, digest=("sha512", "abcd"))
+    assert cache.put(
+        "0123abcd",
+        source,
+        digest=("sha512", hashlib.sha512(b"content").hexdigest()),
+    )
+
+
+def test_file_cache_corrupted(tmp_path):
+    cache = FileCache(tmp_path / "cache")
+    source = tmp_path / "archive.tar.gz"
+    source.write_bytes(b"content")
+    cache.put("0123abcd", source)
+    # the cached file is hardlinked, modify it through the source
+    source.unlink()
+    (tmp_path / "cache" / "01" / "0123abcd").write_bytes(b"corrupted")
+
+    assert not cache.get("0123abcd", tmp_path / "target")
+    assert not (tmp_path / "target").exists()
+    assert not (tmp_path / "cache" / "01" / "0123abcd").exists()
+
+
+def test_file_cache_evict(tmp_path):
+    cache = FileCache(tmp_path / "cache", size_limit=10)
+    for i, key in enumerate(("aa01", "bb02", "cc03")):
+        source = tmp_path / key
+        source.write_bytes(b"12345")
+        cache.put(key, source)
+        # make the order of use deterministic
+        os.utime(tmp_path / "cache" / key[:2] / f"{key}.digest", (i, i))
+        if key == "bb02":
+            # use the first entry, so that the second one is the least recently used
+            assert cache.get("aa01", tmp_path / "aa01-copy")
+
+    assert (tmp_path / "cache" / "aa" / "aa01").exists()
+    assert not (tmp_path / "cache" / "bb" / "bb02").exists()
+    assert (tmp_path / "cache" / "cc" / "cc03").exists()
@@ -7,7 +7,44 @@ import pytest
 from flexmock import flexmock
 from koji import ActionNotAllowed, AuthError, ClientSession
 
-from packit.utils.koji_helper import KojiHelper
+from packit.utils.koji_helper import KojiHelper, KojiMetadataCache, get_metadata_cache
+
+
+class KojiVirtualCall:
+    def __init__(self, func, *args, **kwargs):
+        self._result = self._error = None
+        try:
+            self._result = func(*args, **kwargs)
+        except Exception as e:
+            self._error = e
+
+    @property
+    def result(self):
+        if self._error:
+            raise self._error
+        return self._result
+
+
+class KojiMultiCall:
+    """Mimics koji.MultiCallSession, records calls made in each round trip."""
+
+    def __init__(self, round_trips, **methods):
+        self.round_trips = round_trips
+        self.methods = methods
+
+    def __enter__(self):
+        self.round_trips.append([])
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.round_trips[-1].append((name, kwargs))
+            return KojiVirtualCall(self.methods[name], *args, **kwargs)
+
+        return call
 
 
 def koji_session_virtual_method(requires_authentication=False, invalid_session=False):
@@ -74,7 +111,7 @@ def test_get_latest_stable_build_no_build(include_candidate):
         koji_helper,
         get_candidate_tag=lambda b: candidate_tags[b],
         get_stable_tags=lambda t: stable_tags[t],
-        get_latest_build_in_tag=lambda _, t: builds[t],
+        get_latest_builds_in_tags=lambda q: {(p, t): builds[t] for p, t in q},
     )
     assert koji_helper.get_latest_stable_build("test", "f40", include_candidate) is None
 
@@ -101,7 +138,7 @@ def test_get_latest_stable_nvr(include_candidate, nvr):
         koji_helper,
         get_candidate_tag=lambda b: candidate_tags[b],
         get_stable_tags=lambda t: stable_tags[t],
-        get_latest_build_in_tag=lambda _, t: builds[t],
+        get_latest_builds_in_tags=lambda q: {(p, t): builds[t] for p, t in q},
     )
     assert koji_helper.get_latest_stable_nvr("test", "f40", include_candidate) == nvr
 
@@ -523,6 +560,84 @@ def test_get_build_target_name(branch, target):
     assert KojiHelper.get_build_target_name(branch) == target
 
 
+def test_get_latest_stable_nvrs():
+    candidate_tags = {"f39": "f39-updates-candidate", "f40": "f40-updates-candidate"}
+    stable_tags = {
+        "f39-updates-candidate": ["f39-updates", "f39"],
+        "f40-updates-candidate": ["f40-updates", "f40"],
+    }
+    builds = {
+        ("test", "f39-updates"): {"nvr": "test-1.0-2.fc39"},
+        ("test", "f39"): {"nvr": "test-1.0-1.fc39"},
+        ("test", "f40"): {"nvr": "test-1.0-1.fc40"},
+        ("other", "f39"): {"nvr": "other-2.0-1.fc39"},
+    }
+    round_trips = []
+
+    def listTagged(package, tag, **_):
+        if tag == "f40-updates":
+            raise Exception
+        build = builds.get((package, tag))
+        return [build] if build else []
+
+    flexmock(ClientSession).new_instances(
+        flexmock(
+            multicall=lambda **_: KojiMultiCall(round_trips, listTagged=listTagged),
+        ),
+    )
+    koji_helper = KojiHelper()
+    flexmock(
+        koji_helper,
+        get_candidate_tag=lambda b: candidate_tags.get(b),
+        get_stable_tags=lambda t: list(stable_tags[t]),
+    )
+    assert koji_helper.get_latest_stable_nvrs(
+        [("test", "f39"), ("test", "f40"), ("other", "f39"), ("test", "f99")],
+    ) == {
+        ("test", "f39"): "test-1.0-2.fc39",
+        ("test", "f40"): "test-1.0-1.fc40",
+        ("other", "f39"): "other-2.0-1.fc39",
+        ("test", "f99"): None,
+    }
+    assert len(round_trips) == 1
+    assert len(round_trips[0]) == 6
+
+
+@pytest.mark.parametrize(
+    "error",
+    [False, True],
+)
+def test_get_builds_changelogs(error):
+    changelog = [
+        (1655726400, "Nikola Forró <nforro@redhat.com> - 0.2-1.fc37", "- third entry"),
+    ]
+    round_trips = []
+
+    def getRPMHeaders(rpmID, **_):
+        if error and rpmID == "test-0.1-1.fc37.src":
+            raise Exception
+        return {
+            "changelogtime": changelog[0][0],
+            "changelogname": changelog[0][1],
+            "changelogtext": changelog[0][2],
+        }
+
+    flexmock(ClientSession).new_instances(
+        flexmock(
+            multicall=lambda **_: KojiMultiCall(
+                round_trips,
+                getRPMHeaders=getRPMHeaders,
+            ),
+        ),
+    )
+    result = KojiHelper().get_builds_changelogs(["test-0.2-1.fc37", "test-0.1-1.fc37"])
+    assert result == {
+        "test-0.2-1.fc37": changelog,
+        "test-0.1-1.fc37": [] if error else changelog,
+    }
+    assert len(round_trips) == 1
+
+
 @pytest.mark.parametrize(
     "since, formatted_changelog",
     [
@@ -559,3 +674,95 @@ def test_format_changelog(since, formatted_changelog):
         (1648728000, "Nikola Forró <nforro@redhat.com> - 0.1-1", "- first entry"),
     ]
     assert KojiHelper.format_changelog(changelog, since) == formatted_changelog
+
+
+def test_metadata_cache_shared():
+    target = {"build_tag_name": "f39-build", "dest_tag_name": "f39-updates-candidate"}
+    calls = []
+
+    @koji_session_virtual_method()
+    def getBuildTarget(target_name, *_, **__):
+        calls.append(target_name)
+        return target
+
+    flexmock(ClientSession).new_instances(flexmock(getBuildTarget=getBuildTarget))
+    assert KojiHelper().get_build_target("f39") == target
+    koji_helper = KojiHelper()
+    assert koji_helper.get_candidate_tag("f39") == "f39-updates-candidate"
+    # cached answers can't be modified by the caller
+    koji_helper.get_build_target("f39")["dest_tag_name"] = "f40-updates-candidate"
+    assert koji_helper.get_build_target("f39") == target
+    assert calls == ["f39-candidate"]
+
+
+def test_metadata_cache_errors_and_invalidation():
+    calls = []
+
+    @koji_session_virtual_method()
+    def getFullInheritance(tag, *_, **__):
+        calls.append(tag)
+        if len(calls) == 1:
+            raise Exception
+        return [{"name": "f39-updates"}, {"name": "f39"}]
+
+    flexmock(ClientSession).new_instances(
+        flexmock(getFullInheritance=getFullInheritance),
+    )
+    koji_helper = KojiHelper()
+    assert koji_helper.get_stable_tags("f39-updates-candidate") == []
+    assert koji_helper.get_stable_tags("f39-updates-candidate") == [
+        "f39-updates",
+        "f39",
+    ]
+    koji_helper.get_stable_tags("f39-updates-candidate")
+    assert len(calls) == 2
+    KojiHelper.metadata_cache.invalidate("getFullInheritance")
+    koji_helper.get_stable_tags("f39-updates-candidate")
+    assert len(calls) == 3
+
+
+def test_metadata_cache_sidetags_not_cached():
+    calls = []
+
+    @koji_session_virtual_method()
+    def getBuildConfig(tag, *_, **__):
+        calls.append(tag)
+        return {"name": tag}
+
+    flexmock(ClientSession).new_instances(flexmock(getBuildConfig=getBuildConfig))
+    koji_helper = KojiHelper()
+    for _ in range(2):
+        koji_helper.get_tag_info("f39-build")
+        koji_helper.get_tag_info("f39-build-side-12345")
+    assert calls == ["f39-build", "f39-build-side-12345", "f39-build-side-12345"]
+
+
+def test_metadata_cache_persistence(tmp_path):
+    path = tmp_path / "koji-metadata.json"
+    cache = KojiMetadataCache(path=path)
+    key = KojiMetadataCache.make_key("getBuildTarget", "f39-candidate", strict=True)
+    assert cache.get(key, lambda: {"dest_tag_name": "f39-updates-candidate"}) == {
+        "dest_tag_name": "f39-updates-candidate",
+    }
+    assert path.is_file()
+
+    cache = KojiMetadataCache(path=path)
+    assert cache.get(key, lambda: pytest.fail("Not cached")) == {
+        "dest_tag_name": "f39-updates-candidate",
+    }
+
+    # expired entries are not loaded
+    cache = KojiMetadataCache(ttl=0, path=path)
+    cache.invalidate()
+    cache.get(key, lambda: "expired")
+    assert KojiMetadataCache(path=path).get(key, lambda: "fresh") == "fresh"
+
+
+def test_get_metadata_cache(tmp_path):
+    assert get_metadata_cache() is KojiHelper.metadata_cache
+    path = tmp_path / "koji-metadata.json"
+    cache = get_metadata_cache(str(path))
+    # shared by all helpers using the same file
+    assert get_metadata_cache(path) is cache
+    assert cache is not KojiHelper.metadata_cache
+    assert cache.path == path
@@ -128,3 +128,26 @@ def test_get_lookaside_sources(config, sources, package, result):
             LookasideCache("").get_sources("", package)
     else:
         assert LookasideCache("").get_sources("", package) == result
+
+
+def test_hash_file_is_memoized(tmp_path):
+    flexmock(
+        configparser,
+        ConfigParser=lambda: flexmock(
+            read=lambda _: None,
+            items=lambda _, **__: {
+                "lookaside": "https://src.fedoraproject.org/repo/pkgs",
+                "lookaside_cgi": "https://src.fedoraproject.org/repo/pkgs/upload.cgi",
+                "lookasidehash": "sha512",
+            },
+        ),
+    )
+    archive = tmp_path / "packitos-0.57.0.tar.gz"
+    archive.write_bytes(b"content")
+    lookaside_cache = LookasideCache("")
+    flexmock(lookaside_cache.cache).should_receive("hash_file").and_return(
+        "1234",
+    ).once()
+
+    assert lookaside_cache.hash_file(archive) == "1234"
+    assert lookaside_cache.hash_file(str(archive)) == "1234"
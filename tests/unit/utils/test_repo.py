@@ -1,14 +1,20 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import os
+import subprocess
 import textwrap
 
+import git
 import pytest
 from flexmock import flexmock
 
 from packit.constants import COMMIT_ACTION_DIVIDER
 from packit.exceptions import PackitException
 from packit.utils.repo import (
+    GitObjectReader,
+    RepositoryCache,
+    commit_exists,
     get_commit_hunks,
     get_commit_link,
     get_commit_message_from_action,
@@ -18,6 +24,7 @@ from packit.utils.repo import (
     get_tag_link,
     git_patch_ish,
     git_remote_url_to_https_url,
+    is_a_git_ref,
 )
 
 
@@ -517,3 +524,102 @@ def test_get_commit_link(git_url, commit, result):
 )
 def test_get_tag_link(git_url, tag, result):
     assert get_tag_link(git_url, tag) == result
+
+
+def test_repository_cache_evict(tmp_path):
+    cache_path = tmp_path / "cache"
+    for i, project in enumerate(("a", "b", "c")):
+        (cache_path / project).mkdir(parents=True)
+        (cache_path / project / "pack").write_bytes(b"12345")
+        (cache_path / f".{project}.lock").touch()
+        os.utime(cache_path / f".{project}.lock", (i + 1, i + 1))
+    repo_cache = RepositoryCache(cache_path=cache_path, size_limit=10)
+
+    # "a" is the least recently used one, but it's in use
+    with repo_cache._lock("a", shared=True):
+        os.utime(cache_path / ".a.lock", (0, 0))
+        repo_cache.evict()
+
+    assert repo_cache.projects_evicted == ["b"]
+    assert sorted(repo_cache.cached_projects) == ["a", "c"]
+
+
+def test_repository_cache_dissociate(tmp_path):
+    cache_path = tmp_path / "cache"
+    (cache_path / "package").mkdir(parents=True)
+    repo_cache = RepositoryCache(cache_path=cache_path, size_limit=10)
+    flexmock(repo_cache).should_receive("_clone").with_args(
+        url="https://example.com/package",
+        to_path=str(tmp_path / "clone"),
+        tags=True,
+        reference=str(cache_path / "package"),
+        dissociate=True,
+    ).and_return(flexmock()).once()
+
+    repo_cache.get_repo("https://example.com/package", tmp_path / "clone")
+
+    assert repo_cache.projects_cloned_using_cache == ["package"]
+
+
+def test_git_object_reader(tmp_path):
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Packit",
+        "GIT_AUTHOR_EMAIL": "packit@example.com",
+        "GIT_COMMITTER_NAME": "Packit",
+        "GIT_COMMITTER_EMAIL": "packit@example.com",
+    }
+    (tmp_path / "file").write_text("content\n")
+    for cmd in (
+        ["git", "init", "-q"],
+        ["git", "add", "file"],
+        ["git", "commit", "-q", "-m", "Subject\n\nBody"],
+        ["git", "tag", "-a", "-m", "Tag", "v1"],
+    ):
+        subprocess.run(cmd, cwd=tmp_path, env=env, check=True)
+    repo = git.Repo(tmp_path)
+    reader = GitObjectReader.for_repo(repo)
+    assert GitObjectReader.for_repo(repo) is reader
+
+    assert reader.read_blob("HEAD:file") == b"content\n"
+    GitObjectReader.reset()
+    assert GitObjectReader.for_repo(repo) is not reader
+    reader = GitObjectReader.for_repo(repo)
+
+    assert reader.read_blob("HEAD:file") == b"content\n"
+    assert reader.read_blob("HEAD:missing") is None
+    assert reader.read_blob("HEAD") is None
+    hexsha, type_, size = reader.resolve("HEAD:file")
+    assert (type_, size) == ("blob", 8)
+    assert reader.read_blob(hexsha) == b"content\n"
+
+    assert is_a_git_ref(repo, "v1")
+    assert not is_a_git_ref(repo, "v2")
+    assert commit_exists(repo, repo.head.commit.hexsha)
+    assert not commit_exists(repo, "0" * 40)
+
+
+def test_repository_cache_refresh_not_evicted(tmp_path):
+    cache_path = tmp_path / "cache"
+    reference_repo = cache_path / "package"
+    reference_repo.mkdir(parents=True)
+    (reference_repo / "HEAD").write_text("ref: refs/heads/main\n")
+    (reference_repo / "pack").write_bytes(b"12345")
+    os.utime(reference_repo / "HEAD", (0, 0))
+    repo_cache = RepositoryCache(cache_path=cache_path, refresh_interval=60)
+    # another worker tries to evict the repository while it's being fetched
+    other_repo_cache = RepositoryCache(cache_path=cache_path, size_limit=1)
+    flexmock(git).should_receive("Repo").and_return(
+        flexmock(
+            git=flexmock(
+                config=lambda *_: None,
+                fetch=lambda *_: other_repo_cache.evict(),
+            ),
+        ),
+    )
+
+    repo_cache._refresh("package", reference_repo)
+
+    assert repo_cache.projects_refreshed == ["package"]
+    assert other_repo_cache.projects_evicted == []
+    assert reference_repo.is_dir()